@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+from mysql.connector import Error
+from mysql.connector.aio import MySQLConnectionPool
+
+from db import PoolTimeout
+
+
+class AsyncConnectionPool:
+    """asyncio counterpart of db.ConnectionPool, on mysql.connector.aio
+
+    ASYNC_MYSQL_POOL_SIZE connections are opened on the first checkout (in the
+    serving event loop; aio connections cannot move between loops). When all
+    of them are in use, coroutines wait for a release for up to
+    MYSQL_POOL_TIMEOUT seconds instead of blocking a thread, so one process
+    can keep many requests in flight while the database is slow.
+    """
+
+    def __init__(self, config):
+        self.size = int(config['ASYNC_MYSQL_POOL_SIZE'])
+        self.timeout = float(config['MYSQL_POOL_TIMEOUT'])
+        self.name = config['MYSQL_POOL_NAME'] + '_aio'
+        self._connect_args = {
+            'host': config['MYSQL_HOST'],
+            'user': config['MYSQL_USER'],
+            'password': config['MYSQL_PASSWORD'],
+            'database': config['MYSQL_DB'],
+            'charset': config['MYSQL_CHARSET'],
+            'auth_plugin': config['MYSQL_AUTH_PLUGIN'],
+        }
+        self._pool = None
+        self._pool_lock = None
+        self._slots = None
+
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._timeouts = 0
+
+    async def _get_pool(self):
+        if self._pool is None:
+            if self._pool_lock is None:
+                self._pool_lock = asyncio.Lock()
+                self._slots = asyncio.Semaphore(self.size)
+            async with self._pool_lock:
+                if self._pool is None:
+                    pool = MySQLConnectionPool(pool_name=self.name, pool_size=self.size,
+                                               pool_reset_session=False, **self._connect_args)
+                    await pool.initialize_pool()
+                    self._pool = pool
+        return self._pool
+
+    async def acquire(self):
+        """Check out a connection, waiting (without blocking the loop) for a free one"""
+        pool = await self._get_pool()
+        started = time.perf_counter()
+        if self._slots.locked():
+            self._waits += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            self._wait_time += time.perf_counter() - started
+            raise PoolTimeout(f"No MySQL connection available within {self.timeout}s") from None
+        waited = time.perf_counter() - started
+
+        try:
+            # get_connection() reconnects a pooled connection the server dropped
+            connection = await pool.get_connection()
+        except Exception:
+            self._slots.release()
+            raise
+
+        self._checkouts += 1
+        self._in_use += 1
+        self._wait_time += waited
+        self._max_wait_time = max(self._max_wait_time, waited)
+        return connection
+
+    async def release(self, connection, rollback=True):
+        """Return a connection to the pool"""
+        try:
+            # Sessions are not reset between checkouts, so never hand on an
+            # open transaction
+            if rollback:
+                await connection.rollback()
+            await connection.close()
+        except Error as e:
+            print(f"Error releasing MySQL connection: {e}")
+        finally:
+            self._in_use -= 1
+            self._slots.release()
+
+    async def close(self):
+        """Close every pooled connection (at server shutdown)"""
+        if self._pool is not None:
+            await self._pool.close_pool()
+            self._pool = None
+
+    def stats(self):
+        return {
+            'pool_name': self.name,
+            'pool_size': self.size,
+            'timeout': self.timeout,
+            'initialized': self._pool is not None,
+            'in_use': self._in_use,
+            'checkouts': self._checkouts,
+            'waits': self._waits,
+            'wait_time': round(self._wait_time, 6),
+            'max_wait_time': round(self._max_wait_time, 6),
+            'timeouts': self._timeouts,
+        }
@@ -0,0 +1,351 @@
+"""ASGI entry point: the read-heavy pages as coroutines on an async MySQL pool
+
+    uvicorn asgi:application --workers 2        # or hypercorn / daphne
+
+WSGI servers load wsgi:application; a deployment picks its serving mode by the
+entry point it starts the server with.
+
+In ASGI mode the routes in ASYNC_VIEWS (the homepage, content details, a
+guide's content list and both dashboards) run on the event loop and read
+through aio_db.AsyncConnectionPool, so a slow database holds coroutines rather
+than worker threads. They run inside an ordinary Flask request context (Flask
+keeps its contexts in contextvars, which are per task), so sessions, flashing,
+url_for, templates and the before/after request hooks behave exactly as in
+WSGI mode. Behind a trusted proxy (PROXY_COUNT), their environ gets the same
+X-Forwarded-* handling as the ProxyFix create_app() puts in front of the WSGI
+app, so remote_addr and the URL scheme are the client's in both modes. Every
+other route goes to the unchanged Flask WSGI app on a pool of
+ASGI_WSGI_THREADS threads, with streamed responses (exports) relayed chunk by
+chunk.
+"""
+import asyncio
+import inspect
+import io
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from flask import jsonify, render_template, session
+from mysql.connector import Error
+from werkzeug.exceptions import HTTPException
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+import booking_stats
+from aio_db import AsyncConnectionPool
+from app import create_app
+from extensions import (content_cache, metrics_registry, pool_acquire_time, record_query, require_user_type,
+                        parse_image_variants, bookings_page_position, split_bookings_page, BOOKINGS_PAGE_SIZE,
+                        CONTENT_CACHE_NAMESPACE)
+from repository import AsyncRepository
+from views.content import prepare_content_details
+
+WSGI_RELAY_CHUNKS = 8  # response chunks buffered between a WSGI thread and the event loop
+
+app = create_app()
+async_pool = AsyncConnectionPool(app.config)
+metrics_registry.gauges('async_db_pool', 'Async connection pool state', async_pool.stats)
+repo = AsyncRepository(record_query)
+wsgi_threads = ThreadPoolExecutor(app.config['ASGI_WSGI_THREADS'], thread_name_prefix='wsgi')
+
+
+@asynccontextmanager
+async def db_connection():
+    """An async pooled connection for the duration of a block"""
+    started = time.perf_counter()
+    try:
+        connection = await async_pool.acquire()
+    finally:
+        pool_acquire_time.observe(time.perf_counter() - started)
+    try:
+        yield connection
+    finally:
+        await async_pool.release(connection)
+
+
+# -- async views -----------------------------------------------------------
+# Each mirrors the synchronous view of the same endpoint in views/
+
+async def fetch_homepage_feed():
+    async with db_connection() as connection:
+        return parse_image_variants(await repo.all(connection, 'homepage_feed'))
+
+
+async def index():
+    """Homepage - Jharkhand Tourism Platform"""
+    published_content = []
+    try:
+        published_content = await content_cache.get_or_load_async(
+            CONTENT_CACHE_NAMESPACE, 'homepage_feed', fetch_homepage_feed)
+    except Exception as e:
+        print(f"Error fetching content: {e}")
+
+    return render_template('index.html', published_content=published_content)
+
+
+async def get_content_details(content_id):
+    """Get detailed information about Jharkhand tourism content"""
+    async def fetch_content_details():
+        async with db_connection() as connection:
+            return prepare_content_details(await repo.one(connection, 'content_details', content_id))
+
+    try:
+        content = await content_cache.get_or_load_async(
+            CONTENT_CACHE_NAMESPACE, ('content', content_id), fetch_content_details)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)})
+
+    if content:
+        return jsonify({'success': True, 'content': content})
+    return jsonify({'success': False, 'message': 'Content not found'})
+
+
+@require_user_type('guide')
+async def guide_my_content():
+    """Get guide's own Jharkhand content for editing"""
+    my_content = []
+    try:
+        async with db_connection() as connection:
+            my_content = parse_image_variants(await repo.all(connection, 'guide_uploads', session['user_id']))
+    except Exception as e:
+        print(f"Error fetching content: {e}")
+
+    return jsonify({'success': True, 'content': my_content})
+
+
+@require_user_type('guide')
+async def guide_dashboard():
+    """Guide dashboard - Manage Jharkhand tourism bookings and content"""
+    guide_id = session['user_id']
+    bookings, next_cursor = [], None
+    earnings = None
+    try:
+        async with db_connection() as connection:
+            after_date, after_id = bookings_page_position()
+            bookings, next_cursor = split_bookings_page(
+                await repo.all(connection, 'guide_bookings', guide_id, after_date, after_date, after_id,
+                               BOOKINGS_PAGE_SIZE + 1), BOOKINGS_PAGE_SIZE)
+            earnings = booking_stats.summarize(
+                await repo.query(connection, booking_stats.GUIDE_SUMMARY_QUERY, (guide_id,)))
+    except Error as e:
+        print(f"Error loading guide dashboard: {e}")
+
+    return render_template('guide_dashboard.html', bookings=bookings, earnings=earnings,
+                           next_bookings_cursor=next_cursor)
+
+
+@require_user_type('tourist')
+async def tourist_dashboard():
+    """Tourist dashboard - Browse Jharkhand guides and manage bookings"""
+    available_guides = 0
+    booking_count = 0
+    bookings, next_cursor = [], None
+    try:
+        async with db_connection() as connection:
+            available_guides = (await repo.one(connection, 'available_guide_count'))['total']
+            booking_count = (await repo.one(connection, 'tourist_booking_count', session['user_id']))['total']
+            after_date, after_id = bookings_page_position()
+            bookings, next_cursor = split_bookings_page(
+                await repo.all(connection, 'tourist_bookings', session['user_id'], after_date, after_date, after_id,
+                               BOOKINGS_PAGE_SIZE + 1), BOOKINGS_PAGE_SIZE)
+    except Error as e:
+        print(f"Error loading tourist dashboard: {e}")
+
+    return render_template('tourist_dashboard.html', available_guides=available_guides, bookings=bookings,
+                           booking_count=booking_count, next_bookings_cursor=next_cursor)
+
+
+ASYNC_VIEWS = {
+    'content.index': index,
+    'content.get_content_details': get_content_details,
+    'guide.guide_my_content': guide_my_content,
+    'guide.guide_dashboard': guide_dashboard,
+    'tourist.tourist_dashboard': tourist_dashboard,
+}
+
+
+# -- ASGI plumbing ---------------------------------------------------------
+
+def wsgi_environ(scope, body):
+    """The WSGI environ for an ASGI HTTP scope"""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = scope['client'][0], str(scope['client'][1])
+    for name, value in scope['headers']:
+        name = name.decode('latin-1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+async def read_body(receive):
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return bytes(body)
+
+
+def async_view_for(environ):
+    """(view, view_args) if the request is served by an async view, else (None, None)"""
+    if environ['REQUEST_METHOD'] not in ('GET', 'HEAD'):
+        return None, None
+    try:
+        endpoint, view_args = app.url_map.bind_to_environ(environ).match()
+    except HTTPException:
+        # 404s, 405s and slash redirects are left to Flask
+        return None, None
+    view = ASYNC_VIEWS.get(endpoint)
+    return (view, view_args) if view else (None, None)
+
+
+def proxy_fix_for(flask_app):
+    """A function applying flask_app's ProxyFix, if it has one, to an environ in place"""
+    wsgi_fix = flask_app.wsgi_app
+    if not isinstance(wsgi_fix, ProxyFix):
+        return lambda environ: None
+    # Same trusted hop counts, around an app that does nothing: only the
+    # environ rewriting is wanted, the async view is dispatched separately
+    headers_fix = ProxyFix(lambda environ, start_response: None, x_for=wsgi_fix.x_for,
+                           x_proto=wsgi_fix.x_proto, x_host=wsgi_fix.x_host, x_port=wsgi_fix.x_port,
+                           x_prefix=wsgi_fix.x_prefix)
+    return lambda environ: headers_fix(environ, None)
+
+
+fix_proxy_headers = proxy_fix_for(app)
+
+
+async def run_async_view(view, view_args, environ, send):
+    """Dispatch to an async view the way Flask's wsgi_app() dispatches a sync one"""
+    with app.request_context(environ):
+        try:
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    # Access checks answer straight away with a redirect
+                    rv = view(**view_args)
+                    if inspect.isawaitable(rv):
+                        rv = await rv
+            except Exception as e:
+                rv = app.handle_user_exception(e)
+            response = app.finalize_request(rv)
+        except Exception as e:
+            response = app.handle_exception(e)
+
+        headers = response.get_wsgi_headers(environ)
+        await send({'type': 'http.response.start', 'status': response.status_code,
+                    'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                for name, value in headers.items()]})
+        await send({'type': 'http.response.body', 'body': b''.join(response.get_app_iter(environ))})
+
+
+async def run_wsgi(environ, send):
+    """Serve a request with the Flask WSGI app on a worker thread"""
+    loop = asyncio.get_running_loop()
+    relay = asyncio.Queue(WSGI_RELAY_CHUNKS)
+    abandoned = threading.Event()
+
+    def put(*item):
+        # Blocks the worker thread while the relay is full, so a slow client
+        # holds back a streamed export instead of buffering it
+        asyncio.run_coroutine_threadsafe(relay.put(item), loop).result()
+
+    def call_app():
+        try:
+            started = []
+            result = app.wsgi_app(environ, lambda status, headers, exc_info=None: started.extend((status, headers)))
+            try:
+                put('start', *started)
+                for chunk in result:
+                    if abandoned.is_set():
+                        break
+                    if chunk:
+                        put('body', chunk)
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+            put('end')
+        except BaseException as e:
+            put('error', e)
+
+    worker = loop.run_in_executor(wsgi_threads, call_app)
+    try:
+        while True:
+            kind, *payload = await relay.get()
+            if kind == 'start':
+                status, headers = payload
+                await send({'type': 'http.response.start', 'status': int(status.split(' ', 1)[0]),
+                            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                        for name, value in headers]})
+            elif kind == 'body':
+                await send({'type': 'http.response.body', 'body': payload[0], 'more_body': True})
+            elif kind == 'error':
+                raise payload[0]
+            else:
+                await send({'type': 'http.response.body', 'body': b''})
+                break
+    finally:
+        # Let a worker still producing chunks run to its end
+        abandoned.set()
+        while not worker.done():
+            getter = asyncio.ensure_future(relay.get())
+            await asyncio.wait((getter, worker), return_when=asyncio.FIRST_COMPLETED)
+            getter.cancel()
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await async_pool.close()
+            wsgi_threads.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    body = await read_body(receive)
+    if body is None:
+        return  # client went away before sending the whole request
+    environ = wsgi_environ(scope, body)
+    view, view_args = async_view_for(environ)
+    if view is not None:
+        # app.wsgi_app does this itself for the routes run_wsgi() serves
+        fix_proxy_headers(environ)
+        await run_async_view(view, view_args, environ, send)
+    else:
+        await run_wsgi(environ, send)
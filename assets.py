@@ -0,0 +1,135 @@
+"""Fingerprinted, precompressed static assets
+
+    python assets.py     # rebuild static/dist after changing any CSS/JS
+
+The build copies every file under static/css and static/js to
+static/dist/<dir>/<name>.<hash>.<ext>, writes .gz (and .br when the brotli
+package is installed) next to each copy, and records the mapping in
+static/dist/manifest.json. Because a file's URL changes whenever its content
+does, /assets/ responses can be cached by browsers forever.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+from flask import request, send_from_directory, url_for
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip variants are always built
+    brotli = None
+
+SOURCE_DIRS = ('css', 'js')
+DIST_DIR = 'dist'
+MANIFEST_FILE = 'manifest.json'
+HASH_LENGTH = 10
+
+# Content-Encoding -> suffix of the precompressed file, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def build(static_folder):
+    """Fingerprint and precompress every asset; returns the new manifest"""
+    dist = os.path.join(static_folder, DIST_DIR)
+    if os.path.isdir(dist):
+        shutil.rmtree(dist)
+
+    manifest = {}
+    for source_dir in SOURCE_DIRS:
+        source_root = os.path.join(static_folder, source_dir)
+        if not os.path.isdir(source_root):
+            continue
+        for dirpath, _, filenames in os.walk(source_root):
+            for filename in sorted(filenames):
+                source = os.path.join(dirpath, filename)
+                logical = os.path.relpath(source, static_folder).replace(os.sep, '/')
+                with open(source, 'rb') as f:
+                    content = f.read()
+
+                digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+                stem, ext = os.path.splitext(logical)
+                hashed = f'{stem}.{digest}{ext}'
+                target = os.path.join(dist, hashed)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+
+                with open(target, 'wb') as f:
+                    f.write(content)
+                # mtime=0 keeps the gzip output byte-for-byte reproducible
+                with open(target + '.gz', 'wb') as f:
+                    f.write(gzip.compress(content, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    with open(target + '.br', 'wb') as f:
+                        f.write(brotli.compress(content, quality=11))
+                manifest[logical] = hashed
+
+    os.makedirs(dist, exist_ok=True)
+    with open(os.path.join(dist, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+class AssetManifest:
+    """Maps logical asset names (css/style.css) to their fingerprinted copies
+
+    Without a built manifest (e.g. in development), asset_url() falls back to
+    the plain /static/ URL so pages still work.
+    """
+
+    def __init__(self, static_folder, reload=False):
+        self.static_folder = static_folder
+        self.dist_folder = os.path.join(static_folder, DIST_DIR)
+        self.reload = reload
+        self._manifest = None
+        self._mtime = None
+
+    def _load(self):
+        path = os.path.join(self.dist_folder, MANIFEST_FILE)
+        if self._manifest is not None and not self.reload:
+            return self._manifest
+        try:
+            mtime = os.path.getmtime(path)
+            if self._manifest is None or mtime != self._mtime:
+                with open(path) as f:
+                    self._manifest = json.load(f)
+                self._mtime = mtime
+        except (OSError, ValueError):
+            self._manifest = {}
+        return self._manifest
+
+    def asset_url(self, filename):
+        """Drop-in for url_for('static', filename=...) that emits fingerprinted URLs"""
+        hashed = self._load().get(filename)
+        if hashed is None:
+            return url_for('static', filename=filename)
+        return url_for('assets', filename=hashed)
+
+    def send(self, filename):
+        """Serve a fingerprinted asset, precompressed when the client accepts it"""
+        accepted = request.accept_encodings
+        response = None
+        for encoding, suffix in ENCODINGS:
+            compressed = safe_join(self.dist_folder, filename + suffix)
+            if accepted[encoding] and compressed and os.path.isfile(compressed):
+                response = send_from_directory(self.dist_folder, filename + suffix, max_age=31536000)
+                # Report the type of the original file, not of the .gz/.br
+                response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                response.headers['Content-Encoding'] = encoding
+                break
+        if response is None:
+            response = send_from_directory(self.dist_folder, filename, max_age=31536000)
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        response.vary.add('Accept-Encoding')
+        return response
+
+
+if __name__ == '__main__':
+    static = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    built = build(static)
+    print(f"Built {len(built)} asset(s) into {os.path.join(static, DIST_DIR)}"
+          f"{'' if brotli else ' (brotli not installed: gzip only)'}")
@@ -0,0 +1,218 @@
+import threading
+import time
+from datetime import date, timedelta
+
+# Booking statuses that occupy a guide's days; pending requests are tracked
+# separately so calendars can show them as tentative
+BOOKED_STATUSES = ('confirmed', 'completed')
+PENDING_STATUSES = ('pending',)
+
+HISTORY_DAYS = 366  # days before "today" the index still covers
+
+
+class AvailabilityIndex:
+    """Per-guide day bitmaps of booked and pending days
+
+    Bit n of a guide's bitmap is the day `epoch + n`; a booking occupies
+    [arrival_date, departure_date). Whether a guide is free over a date range
+    is then a single AND against a precomputed mask, independent of how many
+    bookings the guide has.
+
+    Writes in this process are applied immediately through apply(). Changes
+    made by other worker processes are picked up by a delta query on
+    bookings.updated_at at most every sync_interval seconds, and by a full
+    reload every full_reload_interval seconds (which also catches deletes).
+
+    updated_at is stamped when a row is written, not when its transaction
+    commits, so a booking committed late can carry a timestamp older than the
+    previous sync. Each delta query therefore starts sync_overlap seconds
+    before the last database clock reading; rows re-read in that window that
+    the index already holds unchanged are skipped.
+
+    fetch_bookings(since) must return rows with id, guide_id, arrival_date,
+    departure_date and booking_status, changed at or after `since` (a
+    datetime from the database clock), or every booking when since is None.
+    It must also return that clock reading, as (rows, now).
+    """
+
+    def __init__(self, fetch_bookings, sync_interval=5, full_reload_interval=300, sync_overlap=30):
+        self.fetch_bookings = fetch_bookings
+        self.sync_interval = sync_interval
+        self.full_reload_interval = full_reload_interval
+        self.sync_overlap = timedelta(seconds=sync_overlap)
+        self.epoch = date.today() - timedelta(days=HISTORY_DAYS)
+        self._lock = threading.RLock()
+        self._bookings = {}   # booking id -> (guide_id, first_day, end_day, status)
+        self._by_guide = {}   # guide id -> set of booking ids
+        self._booked = {}     # guide id -> bitmap of booked days
+        self._pending = {}    # guide id -> bitmap of pending days
+        self._loaded_at = None
+        self._synced_at = None
+        self._db_clock = None
+
+    # -- day arithmetic --------------------------------------------------
+
+    def _day(self, value):
+        return max((value - self.epoch).days, 0)
+
+    def _mask(self, start, end):
+        """Bitmap covering [start, end)"""
+        first, last = self._day(start), self._day(end)
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+    # -- maintenance -----------------------------------------------------
+
+    def _rebuild_guide(self, guide_id):
+        booked = pending = 0
+        for booking_id in self._by_guide.get(guide_id, ()):
+            _, first, end, status = self._bookings[booking_id]
+            bits = ((1 << (end - first)) - 1) << first if end > first else 0
+            if status in BOOKED_STATUSES:
+                booked |= bits
+            elif status in PENDING_STATUSES:
+                pending |= bits
+        self._booked[guide_id] = booked
+        self._pending[guide_id] = pending
+
+    def _entry(self, guide_id, arrival, departure, status):
+        """(guide_id, first day, end day, status) of a booking the index tracks, else None"""
+        tracked = (status in BOOKED_STATUSES or status in PENDING_STATUSES) \
+            and arrival and departure and departure > self.epoch
+        if not tracked:
+            return None
+        return guide_id, self._day(arrival), self._day(departure), status
+
+    def _apply(self, booking_id, guide_id, arrival, departure, status):
+        entry = self._entry(guide_id, arrival, departure, status)
+        if entry == self._bookings.get(booking_id):
+            # Already known (a row re-read in the sync overlap window): nothing to redo
+            return
+
+        previous = self._bookings.pop(booking_id, None)
+        if previous is not None:
+            self._by_guide.get(previous[0], set()).discard(booking_id)
+
+        tracked = entry is not None
+        if tracked:
+            _, first, end, _ = entry
+            self._bookings[booking_id] = entry
+            self._by_guide.setdefault(guide_id, set()).add(booking_id)
+
+        if previous is None:
+            if tracked and end > first:
+                # A new booking only ever sets bits
+                bits = ((1 << (end - first)) - 1) << first
+                target = self._booked if status in BOOKED_STATUSES else self._pending
+                target[guide_id] = target.get(guide_id, 0) | bits
+            return
+
+        # Status changes and removals may clear bits that another booking
+        # still covers, so recompute the affected guides from their bookings
+        self._rebuild_guide(guide_id)
+        if previous[0] != guide_id:
+            self._rebuild_guide(previous[0])
+
+    def apply(self, booking_id, guide_id, arrival, departure, status):
+        """Record a created or changed booking made by this process"""
+        with self._lock:
+            self._apply(booking_id, int(guide_id), arrival, departure, status)
+
+    def invalidate(self):
+        """Force a full reload on next use (e.g. after cascading deletes)"""
+        with self._lock:
+            self._loaded_at = None
+
+    def _reload(self):
+        rows, db_clock = self.fetch_bookings(None)
+        self._bookings, self._by_guide, self._booked, self._pending = {}, {}, {}, {}
+        self.epoch = date.today() - timedelta(days=HISTORY_DAYS)
+        for row in rows:
+            self._apply(row['id'], row['guide_id'], row['arrival_date'],
+                        row['departure_date'], row['booking_status'])
+        self._loaded_at = self._synced_at = time.monotonic()
+        self._db_clock = db_clock
+
+    def refresh(self, force=False):
+        """Bring the index up to date with the database if it may be stale"""
+        now = time.monotonic()
+        with self._lock:
+            if self._loaded_at is None or now - self._loaded_at >= self.full_reload_interval:
+                self._reload()
+            elif force or now - self._synced_at >= self.sync_interval:
+                # Re-read the overlap window for late commits (and updated_at's
+                # one-second resolution); unchanged rows are skipped in _apply
+                rows, db_clock = self.fetch_bookings(self._db_clock - self.sync_overlap)
+                for row in rows:
+                    self._apply(row['id'], row['guide_id'], row['arrival_date'],
+                                row['departure_date'], row['booking_status'])
+                self._synced_at = now
+                self._db_clock = db_clock
+
+    # -- queries ---------------------------------------------------------
+
+    def is_free(self, guide_id, start, end, include_pending=False):
+        """True if the guide has no booked (or pending) day in [start, end)"""
+        self.refresh()
+        mask = self._mask(start, end)
+        occupied = self._booked.get(guide_id, 0)
+        if include_pending:
+            occupied |= self._pending.get(guide_id, 0)
+        return not occupied & mask
+
+    def busy_guides(self, start, end, include_pending=False):
+        """IDs of guides with at least one booked (or pending) day in [start, end)"""
+        self.refresh()
+        mask = self._mask(start, end)
+        with self._lock:
+            busy = {guide_id for guide_id, bits in self._booked.items() if bits & mask}
+            if include_pending:
+                busy.update(guide_id for guide_id, bits in self._pending.items() if bits & mask)
+        return busy
+
+    def conflicts(self, guide_id, start, end, exclude_booking=None, sync=True):
+        """Booked bookings of a guide that overlap [start, end)
+
+        Syncs with the database first unless sync=False, for callers checking
+        many ranges right after one refresh(force=True).
+        """
+        if sync:
+            self.refresh(force=True)
+        first, last = self._day(start), self._day(end)
+        with self._lock:
+            return sorted(
+                booking_id for booking_id in self._by_guide.get(guide_id, ())
+                if booking_id != exclude_booking
+                and self._bookings[booking_id][3] in BOOKED_STATUSES
+                and self._bookings[booking_id][1] < last and first < self._bookings[booking_id][2]
+            )
+
+    def calendar(self, guide_id, start, end):
+        """[(date, 'booked' | 'pending' | 'free')] for every day in [start, end)"""
+        self.refresh()
+        booked = self._booked.get(guide_id, 0)
+        pending = self._pending.get(guide_id, 0)
+        days = []
+        current = start
+        while current < end:
+            bit = 1 << self._day(current)
+            if current < self.epoch:
+                state = 'free'
+            elif booked & bit:
+                state = 'booked'
+            elif pending & bit:
+                state = 'pending'
+            else:
+                state = 'free'
+            days.append((current, state))
+            current += timedelta(days=1)
+        return days
+
+    def stats(self):
+        with self._lock:
+            return {
+                'guides': len(self._by_guide),
+                'bookings': len(self._bookings),
+                'epoch': self.epoch.isoformat(),
+            }
@@ -0,0 +1,308 @@
+"""Concurrent load generator reporting per-route latency percentiles
+
+    python benchmarks/load.py                              # in-process, 8 workers, 30s
+    python benchmarks/load.py --url http://127.0.0.1:5000 --concurrency 32 --duration 120
+    python benchmarks/load.py --baseline benchmarks/results/<earlier run>.json
+
+Run benchmarks/seed.py first; the users, guides and uploads to exercise come
+from benchmarks/fixture.json. Every worker thread keeps one logged-in session
+per role and picks routes by weight until the time is up.
+
+By default the app is driven in-process through Flask's test client, which
+measures the app and the database without a web server in the way and lets
+the admin routes be covered (admins have no login form). With --url, a
+running server is driven over HTTP instead and admin routes are skipped.
+
+Results (requests, errors, throughput and mean/p50/p95/p99/max latency in
+milliseconds per route) are printed and written as JSON to --output. With
+--baseline, p95 latencies are compared against an earlier result file and
+the exit status is 1 when any route regressed by more than --max-regression.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURE_PATH = os.path.join(ROOT, 'benchmarks', 'fixture.json')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+GUIDE_SORTS = ('rating', 'experience', 'price_low', 'price_high')
+
+
+def book_guide_form(rng, fixture):
+    arrival = date.today() + timedelta(days=rng.randint(7, 180))
+    return {
+        'guide_id': rng.choice(fixture['bookable_guides']),
+        'tourist_name': 'Bench Tourist', 'phone': '9000000000', 'email': 'bench@example.com',
+        'native_place': rng.choice(fixture['districts']), 'arrival_date': arrival.isoformat(),
+        'days_to_stay': rng.randint(1, 7), 'group_size': rng.randint(1, 6),
+        'tour_type': 'Waterfall Tours',
+    }
+
+
+def own_upload(rng, user):
+    return rng.choice(user['uploads']) if user.get('uploads') else None
+
+
+# name -> (role, weight, writes, build(rng, fixture, user) -> (method, path, form) or None)
+ROUTES = {
+    'index': ('anonymous', 10, False, lambda rng, fx, user: ('GET', '/', None)),
+    'content_details': ('anonymous', 8, False, lambda rng, fx, user: (
+        'GET', f"/content/{rng.choice(fx['upload_ids'])}", None)),
+    'content_search': ('anonymous', 6, False, lambda rng, fx, user: (
+        'GET', '/api/content/search?' + urllib.parse.urlencode(
+            {'q': ' '.join(rng.sample(fx['search_terms'], 2)), 'page': rng.randint(1, 3)}), None)),
+    'tourist_dashboard': ('tourist', 6, False, lambda rng, fx, user: ('GET', '/tourist_dashboard', None)),
+    'api_guides': ('tourist', 8, False, lambda rng, fx, user: (
+        'GET', '/api/guides?' + urllib.parse.urlencode(
+            {'location': rng.choice(fx['districts']), 'sort': rng.choice(GUIDE_SORTS)}), None)),
+    'book_guide_form': ('tourist', 3, False, lambda rng, fx, user: (
+        'GET', f"/book_guide/{rng.choice(fx['bookable_guides'])}", None)),
+    'book_guide': ('tourist', 2, True, lambda rng, fx, user: ('POST', '/book_guide', book_guide_form(rng, fx))),
+    'guide_dashboard': ('guide', 5, False, lambda rng, fx, user: ('GET', '/guide_dashboard', None)),
+    'guide_earnings': ('guide', 3, False, lambda rng, fx, user: ('GET', '/api/guide/earnings', None)),
+    'guide_my_content': ('guide', 4, False, lambda rng, fx, user: ('GET', '/guide/my_content', None)),
+    'edit_content_form': ('guide', 2, False, lambda rng, fx, user: (
+        ('GET', f"/guide/edit_content/{own_upload(rng, user)}", None) if own_upload(rng, user) else None)),
+    'admin_dashboard': ('admin', 1, False, lambda rng, fx, user: ('GET', '/admin_dashboard', None)),
+}
+
+
+class InProcessClient:
+    """One Flask test client; logging in writes the session directly"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def login(self, role, user):
+        with self.client.session_transaction() as session:
+            session.update({'user_id': user['id'], 'username': user['username'],
+                            'user_type': role, 'full_name': user['username']})
+
+    def request(self, method, path, form):
+        response = self.client.open(path, method=method, data=form)
+        response.close()
+        return response.status_code
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpClient:
+    """A cookie-keeping urllib session against a running server"""
+
+    def __init__(self, base_url, password):
+        self.base_url = base_url.rstrip('/')
+        self.password = password
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect())
+
+    def login(self, role, user):
+        status = self.request('POST', f'/login/{role}', {'username': user['username'], 'password': self.password})
+        if status not in (302, 303):
+            raise RuntimeError(f"Could not log in as {user['username']} (HTTP {status})")
+
+    def request(self, method, path, form):
+        data = urllib.parse.urlencode(form).encode() if form is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                     headers={'Accept-Encoding': 'gzip'})
+        try:
+            with self.opener.open(req, timeout=30) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, seconds, ok):
+        with self._lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies, errors, elapsed):
+    values = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)  # noqa: E731
+    return {
+        'requests': len(values),
+        'errors': errors,
+        'throughput': round(len(values) / elapsed, 2) if elapsed else 0.0,
+        'mean_ms': ms(sum(values) / len(values)) if values else 0.0,
+        'p50_ms': ms(percentile(values, 0.50)),
+        'p95_ms': ms(percentile(values, 0.95)),
+        'p99_ms': ms(percentile(values, 0.99)),
+        'max_ms': ms(values[-1]) if values else 0.0,
+    }
+
+
+def worker(make_client, routes, fixture, recorder, warmup_until, stop_at, seed):
+    rng = random.Random(seed)
+    clients = {}
+    names = list(routes)
+    weights = [routes[name][1] for name in names]
+    while time.perf_counter() < stop_at:
+        name = rng.choices(names, weights)[0]
+        role, _, _, build = routes[name]
+        if role not in clients:
+            client = make_client()
+            user = None
+            if role in ('tourist', 'guide'):
+                user = rng.choice(fixture[f'{role}s'])
+                client.login(role, user)
+            elif role == 'admin':
+                client.login(role, {'id': fixture.get('admin_id', 1), 'username': 'admin'})
+            clients[role] = (client, user)
+        client, user = clients[role]
+
+        request = build(rng, fixture, user)
+        if request is None:
+            continue
+        started = time.perf_counter()
+        try:
+            status = client.request(*request)
+            ok = status < 400
+        except Exception as e:
+            print(f"Request {name} failed: {e}")
+            ok = False
+        finished = time.perf_counter()
+        if started >= warmup_until:
+            recorder.record(name, finished - started, ok)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, max_regression):
+    """Print p95 changes against a baseline; returns the names of regressed routes"""
+    regressed = []
+    print(f"\nAgainst baseline {baseline['meta'].get('git_commit')} ({baseline['meta'].get('started_at')}):")
+    for name, current in sorted(results['routes'].items()):
+        before = baseline['routes'].get(name)
+        if not before or not before['p95_ms']:
+            continue
+        change = (current['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+        flag = ''
+        if change > max_regression:
+            regressed.append(name)
+            flag = '  <-- regression'
+        print(f"  {name:<20} p95 {before['p95_ms']:>9.2f} -> {current['p95_ms']:>9.2f} ms ({change:+.1f}%){flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='drive a running server instead of the app in-process')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='seconds before measuring starts')
+    parser.add_argument('--routes', help='comma-separated subset of: ' + ', '.join(ROUTES))
+    parser.add_argument('--read-only', action='store_true', help='skip routes that write (book_guide)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--fixture', default=FIXTURE_PATH)
+    parser.add_argument('--output', help='result file (default benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', help='earlier result file to compare p95 latencies against')
+    parser.add_argument('--max-regression', type=float, default=10.0, help='allowed p95 increase in percent')
+    args = parser.parse_args(argv)
+
+    with open(args.fixture) as f:
+        fixture = json.load(f)
+
+    routes = {name: route for name, route in ROUTES.items()
+              if (not args.routes or name in args.routes.split(','))
+              and not (args.read_only and route[2])
+              and not (args.url and route[0] == 'admin')}
+    if not routes:
+        raise SystemExit("No routes selected")
+
+    if args.url:
+        make_client = lambda: HttpClient(args.url, fixture['password'])  # noqa: E731
+        mode = 'http'
+    else:
+        from wsgi import app
+        make_client = lambda: InProcessClient(app)  # noqa: E731
+        mode = 'in-process'
+
+    recorder = Recorder()
+    started_at = datetime.now().isoformat(timespec='seconds')
+    start = time.perf_counter()
+    warmup_until = start + args.warmup
+    stop_at = warmup_until + args.duration
+    threads = [threading.Thread(target=worker, daemon=True,
+                                args=(make_client, routes, fixture, recorder, warmup_until, stop_at, args.seed + n))
+               for n in range(args.concurrency)]
+    print(f"Running {len(routes)} route(s) {mode} with {args.concurrency} worker(s) "
+          f"for {args.warmup:g}s warm-up + {args.duration:g}s...")
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - warmup_until
+
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    results = {
+        'meta': {
+            'started_at': started_at, 'git_commit': git_commit(), 'mode': mode, 'url': args.url,
+            'concurrency': args.concurrency, 'duration': args.duration, 'warmup': args.warmup,
+            'seed': args.seed, 'fixture_counts': fixture.get('counts'),
+        },
+        'routes': {name: summarize(recorder.latencies.get(name, []), recorder.errors.get(name, 0), elapsed)
+                   for name in routes},
+        'total': summarize(all_latencies, sum(recorder.errors.values()), elapsed),
+    }
+
+    print(f"\n{'route':<20} {'req':>7} {'err':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in sorted(results['routes'].items()) + [('TOTAL', results['total'])]:
+        print(f"{name:<20} {row['requests']:>7} {row['errors']:>5} {row['throughput']:>8.1f} "
+              f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressed = compare(results, json.load(f), args.max_regression)
+        if regressed:
+            print(f"p95 regressed by more than {args.max_regression:g}% on: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""Seed the database with synthetic data for benchmarks/load.py
+
+    python benchmarks/seed.py                                # defaults below
+    python benchmarks/seed.py --guides 10000 --tourists 50000 --bookings 1000000 --uploads 100000
+    python benchmarks/seed.py --reset                        # only remove synthetic data
+
+Point Config.MYSQL_* (or a local MySQL) at a scratch database first: the data
+is large and writes go straight to it. Synthetic users are named
+bench_<role>_<n> and share BENCH_PASSWORD, so a re-run (or --reset) deletes
+exactly them; ON DELETE CASCADE takes their bookings and uploads along.
+
+The same --seed always produces the same data. The IDs and usernames the
+load generator needs are written to benchmarks/fixture.json.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import booking_stats  # noqa: E402
+from migrate import connect  # noqa: E402
+
+BENCH_PASSWORD = 'bench-password'
+FIXTURE_PATH = os.path.join(ROOT, 'benchmarks', 'fixture.json')
+BATCH_SIZE = 2000
+FIXTURE_SAMPLE = 500  # logins, guides and uploads recorded per role for the load generator
+
+TOUR_TYPES = ['Wildlife & Nature Tours', 'Cultural Heritage Tours', 'Adventure & Trekking',
+              'Photography Tours', 'Spiritual & Temple Tours', 'Industrial Heritage Tours',
+              'Tribal Culture Tours', 'Waterfall Tours']
+LANGUAGES = ['Hindi', 'English', 'Santhali', 'Nagpuri', 'Bengali', 'Ho', 'Mundari', 'Kurukh']
+UPLOAD_TYPES = ['event', 'photo', 'location']
+WORDS = ['waterfall', 'hundru', 'dassam', 'jonha', 'betla', 'national', 'park', 'tiger', 'elephant',
+         'temple', 'baidyanath', 'deoghar', 'parasnath', 'hill', 'trek', 'sunrise', 'netarhat',
+         'forest', 'tribal', 'sarhul', 'karma', 'festival', 'dance', 'chhau', 'handicraft', 'dokra',
+         'lake', 'dam', 'patratu', 'valley', 'monsoon', 'river', 'subarnarekha', 'steel', 'city',
+         'jamshedpur', 'jubilee', 'garden', 'museum', 'heritage', 'village', 'market', 'food',
+         'litti', 'rugra', 'birds', 'sanctuary', 'dalma', 'caves', 'rock', 'painting', 'mining']
+
+
+def insert_many(connection, sql, rows, label, total):
+    """Insert rows from an iterator in multi-row batches, one commit per batch"""
+    cursor = connection.cursor()
+    started = time.perf_counter()
+    inserted = 0
+    while True:
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        if not batch:
+            break
+        cursor.executemany(sql, batch)
+        connection.commit()
+        inserted += len(batch)
+        if inserted % (BATCH_SIZE * 50) == 0:
+            print(f"  {label}: {inserted}/{total}")
+    cursor.close()
+    print(f"  {label}: {inserted} rows in {time.perf_counter() - started:.1f}s")
+
+
+def fetch_ids(connection, role):
+    """[(id, username)] of the synthetic users of one role, in creation order"""
+    cursor = connection.cursor()
+    cursor.execute("SELECT id, username FROM users WHERE username LIKE %s ORDER BY id",
+                   (f'bench\\_{role}\\_%',))
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def reset(connection):
+    cursor = connection.cursor()
+    cursor.execute("DELETE FROM users WHERE username LIKE 'bench\\_%'")
+    deleted = cursor.rowcount
+    connection.commit()
+    cursor.close()
+    print(f"Removed {deleted} synthetic user(s) and their bookings and uploads")
+
+
+def seed_users(connection, role, count):
+    rows = ((f'bench_{role}_{n}', BENCH_PASSWORD, role, f'Bench {role.title()} {n}',
+             f'9{n:09d}', f'bench_{role}_{n}@example.com') for n in range(count))
+    insert_many(connection, """INSERT INTO users (username, password, user_type, full_name, phone, email)
+                               VALUES (%s, %s, %s, %s, %s, %s)""", rows, f'{role}s', count)
+    return fetch_ids(connection, role)
+
+
+def fetch_districts(connection):
+    """District names from the districts table (migration 0010 seeds it)"""
+    cursor = connection.cursor()
+    cursor.execute("SELECT name FROM districts ORDER BY id")
+    districts = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    if not districts:
+        raise SystemExit("The districts table is empty; run `python migrate.py` first")
+    return districts
+
+
+def seed_guide_profiles(connection, rng, guides, districts):
+    profiles = []
+    prices = {}
+    for guide_id, _ in guides:
+        price = rng.randrange(500, 15001, 100)
+        prices[guide_id] = price
+        profiles.append((guide_id, rng.choice(TOUR_TYPES), rng.randint(1, 30),
+                         ', '.join(rng.sample(LANGUAGES, rng.randint(1, 3))), rng.choice(districts),
+                         price, 'available' if rng.random() < 0.9 else 'busy',
+                         round(rng.uniform(3.0, 5.0), 2)))
+    insert_many(connection, """INSERT INTO guides (user_id, specialization, experience_years, languages_spoken,
+                                                   location, price_per_day, availability_status, rating)
+                               VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""", iter(profiles), 'guide profiles', len(profiles))
+    return prices
+
+
+def skewed_choice(rng, items):
+    """Favour the start of the list, so some guides are much busier than others"""
+    return items[int(len(items) * rng.random() ** 2)]
+
+
+def booking_status(rng, arrival, today):
+    roll = rng.random()
+    if arrival < today:
+        return 'completed' if roll < 0.6 else 'confirmed' if roll < 0.85 else 'cancelled'
+    return 'pending' if roll < 0.5 else 'confirmed' if roll < 0.9 else 'cancelled'
+
+
+def generate_bookings(rng, count, tourists, guides, prices, districts):
+    today = date.today()
+    for _ in range(count):
+        tourist_id, tourist_name = rng.choice(tourists)
+        guide_id = skewed_choice(rng, guides)[0]
+        arrival = today + timedelta(days=rng.randint(-365, 180))
+        days = rng.randint(1, 10)
+        created = datetime.combine(arrival, datetime.min.time()) - timedelta(days=rng.randint(1, 60),
+                                                                             seconds=rng.randint(0, 86399))
+        yield (tourist_id, guide_id, tourist_name, rng.choice(districts), '9000000000',
+               f'{tourist_name}@example.com', days, arrival, arrival + timedelta(days=days),
+               rng.randint(1, 8), prices[guide_id], rng.choice(TOUR_TYPES),
+               booking_status(rng, arrival, today), created, created)
+
+
+def seed_bookings(connection, rng, count, tourists, guides, prices, districts):
+    insert_many(connection, """INSERT INTO bookings (tourist_id, guide_id, tourist_name, native_place, phone, email,
+                                                     days_to_stay, arrival_date, departure_date, group_size,
+                                                     price_per_day, tour_type, booking_status, created_at, updated_at)
+                               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                generate_bookings(rng, count, tourists, guides, prices, districts), 'bookings', count)
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def generate_uploads(rng, count, guides, districts):
+    now = datetime.now()
+    for _ in range(count):
+        yield (skewed_choice(rng, guides)[0], rng.choice(UPLOAD_TYPES), sentence(rng, rng.randint(3, 7))[:200],
+               ' '.join(sentence(rng, rng.randint(8, 16)) for _ in range(rng.randint(2, 5))),
+               '', rng.choice(districts), now - timedelta(seconds=rng.randint(0, 2 * 365 * 86400)))
+
+
+def seed_uploads(connection, rng, count, guides, districts):
+    insert_many(connection, """INSERT INTO guide_uploads (guide_id, upload_type, title, description, image_path,
+                                                          location, upload_date)
+                               VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+                generate_uploads(rng, count, guides, districts), 'uploads', count)
+
+
+def write_fixture(connection, rng, tourists, guides, districts, counts):
+    cursor = connection.cursor()
+    sampled_guides = guides[:FIXTURE_SAMPLE]
+    placeholders = ', '.join(['%s'] * len(sampled_guides))
+    cursor.execute(f"SELECT guide_id, id FROM guide_uploads WHERE guide_id IN ({placeholders})",
+                   [guide_id for guide_id, _ in sampled_guides])
+    own_uploads = {}
+    for guide_id, upload_id in cursor.fetchall():
+        own_uploads.setdefault(str(guide_id), []).append(upload_id)
+    cursor.execute("SELECT gu.id FROM guide_uploads gu JOIN users u ON u.id = gu.guide_id "
+                   "WHERE u.username LIKE %s ORDER BY RAND(%s) LIMIT %s",
+                   ('bench\\_%', counts['seed'], FIXTURE_SAMPLE * 10))
+    upload_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT id FROM users WHERE user_type = 'admin' ORDER BY id LIMIT 1")
+    admin = cursor.fetchone()
+    cursor.close()
+
+    fixture = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'counts': counts,
+        'password': BENCH_PASSWORD,
+        'admin_id': admin[0] if admin else None,
+        'tourists': [{'id': user_id, 'username': username}
+                     for user_id, username in rng.sample(tourists, min(FIXTURE_SAMPLE, len(tourists)))],
+        'guides': [{'id': user_id, 'username': username, 'uploads': own_uploads.get(str(user_id), [])}
+                   for user_id, username in sampled_guides],
+        'bookable_guides': [user_id for user_id, _ in rng.sample(guides, min(FIXTURE_SAMPLE * 4, len(guides)))],
+        'upload_ids': upload_ids,
+        'districts': districts,
+        'search_terms': WORDS,
+    }
+    with open(FIXTURE_PATH, 'w') as f:
+        json.dump(fixture, f)
+    print(f"Wrote {FIXTURE_PATH}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--guides', type=int, default=10000)
+    parser.add_argument('--tourists', type=int, default=50000)
+    parser.add_argument('--bookings', type=int, default=1000000)
+    parser.add_argument('--uploads', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reset', action='store_true', help='remove synthetic data and stop')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    connection = connect()
+    try:
+        reset(connection)
+        if args.reset:
+            return
+        started = time.perf_counter()
+        districts = fetch_districts(connection)
+        guides = seed_users(connection, 'guide', args.guides)
+        tourists = seed_users(connection, 'tourist', args.tourists)
+        prices = seed_guide_profiles(connection, rng, guides, districts)
+        seed_bookings(connection, rng, args.bookings, tourists, guides, prices, districts)
+        seed_uploads(connection, rng, args.uploads, guides, districts)
+
+        print("Rebuilding booking summary and table statistics...")
+        booking_stats.rebuild(connection)
+        cursor = connection.cursor()
+        cursor.execute("ANALYZE TABLE users, guides, bookings, guide_uploads, guide_booking_stats")
+        cursor.fetchall()
+        cursor.close()
+
+        write_fixture(connection, rng, tourists, guides, districts, {
+            'guides': args.guides, 'tourists': args.tourists, 'bookings': args.bookings,
+            'uploads': args.uploads, 'seed': args.seed})
+        print(f"Seeded in {time.perf_counter() - started:.1f}s")
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
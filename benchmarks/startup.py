@@ -0,0 +1,153 @@
+"""Cold-start benchmark: how long a fresh worker takes to serve its first request
+
+    python benchmarks/startup.py                           # 15 fresh interpreters
+    python benchmarks/startup.py --runs 40 --path /login/guide
+    python benchmarks/startup.py --baseline benchmarks/results/<earlier run>.json
+    python benchmarks/startup.py --importtime               # slowest imports of one start
+
+Each run starts a new Python interpreter, as a gunicorn worker recycle or a
+serverless cold start does, and times three phases: importing the app module,
+create_app(), and the first request through Flask's test client (--path,
+a page that needs no database by default). The run fails if create_app()
+opened a database connection or started any background thread, since the
+factory is meant to be side-effect free.
+
+Results (median and max per phase, in milliseconds) are printed and written
+as JSON to --output. With --baseline, median phase times are compared
+against an earlier result file and the exit status is 1 when any phase
+regressed by more than --max-regression.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+from load import RESULTS_DIR, ROOT, git_commit
+
+PHASES = ('import', 'create_app', 'first_request', 'total')
+
+PROBE = """
+import json, sys, threading, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+threads = threading.active_count()
+application = app.create_app()
+created = time.perf_counter()
+services = application.extensions['jharkhand']
+side_effects = []
+if services.db_pool.stats()['initialized']:
+    side_effects.append('database pool initialised')
+if threading.active_count() > threads:
+    side_effects.append('background thread started')
+response = application.test_client().get(sys.argv[1])
+served = time.perf_counter()
+print(json.dumps({
+    'status': response.status_code, 'side_effects': side_effects,
+    'import': imported - started, 'create_app': created - imported,
+    'first_request': served - created, 'total': served - started,
+}))
+"""
+
+
+def probe(path):
+    output = subprocess.check_output([sys.executable, '-c', PROBE, path], cwd=ROOT, text=True)
+    return json.loads(output.splitlines()[-1])
+
+
+def slowest_imports(limit):
+    """The modules with the largest cumulative import time in a fresh `import app`"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=ROOT,
+                               capture_output=True, text=True, check=True)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative) / 1000, name.rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def summarize(values):
+    ms = lambda seconds: round(seconds * 1000, 3)  # noqa: E731
+    return {'median_ms': ms(statistics.median(values)), 'max_ms': ms(max(values))}
+
+
+def compare(results, baseline, max_regression):
+    """Print median changes against a baseline; returns the names of regressed phases"""
+    regressed = []
+    print(f"\nAgainst baseline {baseline['meta'].get('git_commit')} ({baseline['meta'].get('started_at')}):")
+    for name in PHASES:
+        before, current = baseline['phases'].get(name), results['phases'][name]
+        if not before or not before['median_ms']:
+            continue
+        change = (current['median_ms'] - before['median_ms']) / before['median_ms'] * 100
+        flag = ''
+        if change > max_regression:
+            regressed.append(name)
+            flag = '  <-- regression'
+        print(f"  {name:<14} median {before['median_ms']:>8.2f} -> {current['median_ms']:>8.2f} ms "
+              f"({change:+.1f}%){flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15, help='fresh interpreters to start')
+    parser.add_argument('--path', default='/login/tourist', help='first request to serve')
+    parser.add_argument('--importtime', action='store_true', help='list the slowest imports and exit')
+    parser.add_argument('--output', help='result file (default benchmarks/results/startup-<timestamp>.json)')
+    parser.add_argument('--baseline', help='earlier result file to compare median phase times against')
+    parser.add_argument('--max-regression', type=float, default=20.0, help='allowed median increase in percent')
+    args = parser.parse_args(argv)
+
+    if args.importtime:
+        for cumulative, name in slowest_imports(25):
+            print(f"{cumulative:>9.1f} ms  {name}")
+        return 0
+
+    started_at = datetime.now().isoformat(timespec='seconds')
+    print(f"Starting {args.runs} fresh interpreter(s), first request GET {args.path}...")
+    probe(args.path)  # warm the filesystem cache and write any missing .pyc files
+    runs = [probe(args.path) for _ in range(args.runs)]
+
+    problems = sorted({effect for run in runs for effect in run['side_effects']})
+    problems += sorted({f"GET {args.path} answered {run['status']}" for run in runs if run['status'] >= 500})
+    results = {
+        'meta': {
+            'started_at': started_at, 'git_commit': git_commit(), 'runs': args.runs, 'path': args.path,
+            'python': sys.version.split()[0],
+        },
+        'phases': {name: summarize([run[name] for run in runs]) for name in PHASES},
+        'problems': problems,
+    }
+
+    print(f"\n{'phase':<14} {'median ms':>10} {'max ms':>10}")
+    for name in PHASES:
+        row = results['phases'][name]
+        print(f"{name:<14} {row['median_ms']:>10.2f} {row['max_ms']:>10.2f}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"startup-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {output}")
+
+    status = 0
+    if problems:
+        print(f"Startup is not side-effect free: {'; '.join(problems)}")
+        status = 1
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressed = compare(results, json.load(f), args.max_regression)
+        if regressed:
+            print(f"Median startup regressed by more than {args.max_regression:g}% on: {', '.join(regressed)}")
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
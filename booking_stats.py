@@ -0,0 +1,174 @@
+"""Per-guide, per-month booking and earnings summary (guide_booking_stats)
+
+Rows are keyed by guide and the month of the tour's arrival date. Each row
+counts bookings by status. Guest-days and revenue cover only bookings that
+earn money (confirmed or completed), priced at the guide's rate when the
+booking was made:
+
+    revenue = price_per_day * days_to_stay * group_size
+
+book_guide() and update_booking_status() keep the table current with
+record_booking_change(), inside the same transaction as the booking write;
+delete_user() removes a tourist's bookings with forget_tourist_bookings().
+rebuild() reconstructs the table from bookings (`flask rebuild-booking-stats`).
+"""
+
+BOOKING_STATUSES = ('pending', 'confirmed', 'completed', 'cancelled')
+EARNING_STATUSES = ('confirmed', 'completed')
+
+# First day of the arrival month; bookings without dates fall back to when they were made
+MONTH_SQL = ("COALESCE(arrival_date, DATE(created_at)) - "
+             "INTERVAL (DAYOFMONTH(COALESCE(arrival_date, DATE(created_at))) - 1) DAY")
+
+
+def booking_month(arrival_date, created_at=None):
+    """The summary month (a date on the 1st) that a booking counts towards"""
+    day = arrival_date or created_at
+    if hasattr(day, 'date'):
+        day = day.date()
+    return day.replace(day=1)
+
+
+def booking_value(days_to_stay, group_size, price_per_day):
+    """(guest_days, revenue) of a booking, treating missing values as zero/one"""
+    guest_days = int(days_to_stay or 0) * int(group_size or 1)
+    return guest_days, (price_per_day or 0) * guest_days
+
+
+def record_booking_change(cursor, guide_id, month, old_status, new_status, guest_days, revenue):
+    """Move one booking from old_status to new_status (None for a new booking)"""
+    record_booking_changes(cursor, guide_id, [(month, old_status, new_status, guest_days, revenue)])
+
+
+def record_booking_changes(cursor, guide_id, changes):
+    """Apply many (month, old_status, new_status, guest_days, revenue) moves,
+    with one upsert per affected month"""
+    by_month = {}
+    for month, old_status, new_status, guest_days, revenue in changes:
+        if old_status == new_status:
+            continue
+        delta = by_month.setdefault(month, {**{status: 0 for status in BOOKING_STATUSES},
+                                            'guest_days': 0, 'revenue': 0})
+        earning = 0
+        if old_status in BOOKING_STATUSES:
+            delta[old_status] -= 1
+            earning -= old_status in EARNING_STATUSES
+        if new_status in BOOKING_STATUSES:
+            delta[new_status] += 1
+            earning += new_status in EARNING_STATUSES
+        delta['guest_days'] += earning * guest_days
+        delta['revenue'] += earning * revenue
+
+    if not by_month:
+        return
+    cursor.executemany("""
+        INSERT INTO guide_booking_stats (guide_id, month, pending_count, confirmed_count,
+                                         completed_count, cancelled_count, guest_days, revenue)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            pending_count = pending_count + VALUES(pending_count),
+            confirmed_count = confirmed_count + VALUES(confirmed_count),
+            completed_count = completed_count + VALUES(completed_count),
+            cancelled_count = cancelled_count + VALUES(cancelled_count),
+            guest_days = guest_days + VALUES(guest_days),
+            revenue = revenue + VALUES(revenue)
+    """, [(guide_id, month, *(delta[status] for status in BOOKING_STATUSES),
+           delta['guest_days'], delta['revenue'])
+          for month, delta in sorted(by_month.items())])
+
+
+REBUILD_SQL = f"""
+    INSERT INTO guide_booking_stats (guide_id, month, pending_count, confirmed_count,
+                                     completed_count, cancelled_count, guest_days, revenue)
+    SELECT guide_id, {MONTH_SQL} as month,
+           SUM(booking_status = 'pending'), SUM(booking_status = 'confirmed'),
+           SUM(booking_status = 'completed'), SUM(booking_status = 'cancelled'),
+           SUM(IF(booking_status IN ('confirmed', 'completed'),
+                  COALESCE(days_to_stay, 0) * COALESCE(group_size, 1), 0)),
+           SUM(IF(booking_status IN ('confirmed', 'completed'),
+                  COALESCE(price_per_day, 0) * COALESCE(days_to_stay, 0) * COALESCE(group_size, 1), 0))
+    FROM bookings
+    WHERE guide_id IS NOT NULL
+    GROUP BY guide_id, month
+"""
+
+
+def forget_tourist_bookings(cursor, tourist_id):
+    """Take a tourist's bookings out of the summary before they are deleted"""
+    cursor.execute(f"""
+        UPDATE guide_booking_stats s JOIN (
+            SELECT guide_id, {MONTH_SQL} as month,
+                   SUM(booking_status = 'pending') as pending_count,
+                   SUM(booking_status = 'confirmed') as confirmed_count,
+                   SUM(booking_status = 'completed') as completed_count,
+                   SUM(booking_status = 'cancelled') as cancelled_count,
+                   SUM(IF(booking_status IN ('confirmed', 'completed'),
+                          COALESCE(days_to_stay, 0) * COALESCE(group_size, 1), 0)) as guest_days,
+                   SUM(IF(booking_status IN ('confirmed', 'completed'),
+                          COALESCE(price_per_day, 0) * COALESCE(days_to_stay, 0) * COALESCE(group_size, 1), 0)) as revenue
+            FROM bookings WHERE tourist_id = %s AND guide_id IS NOT NULL
+            GROUP BY guide_id, month
+        ) d ON s.guide_id = d.guide_id AND s.month = d.month
+        SET s.pending_count = s.pending_count - d.pending_count,
+            s.confirmed_count = s.confirmed_count - d.confirmed_count,
+            s.completed_count = s.completed_count - d.completed_count,
+            s.cancelled_count = s.cancelled_count - d.cancelled_count,
+            s.guest_days = s.guest_days - d.guest_days,
+            s.revenue = s.revenue - d.revenue
+    """, (tourist_id,))
+
+
+def rebuild(connection):
+    """Recompute every summary row from bookings in one transaction"""
+    cursor = connection.cursor()
+    try:
+        # Lock bookings so no status change lands between the delete and the insert
+        cursor.execute("SELECT COUNT(*) FROM bookings FOR UPDATE")
+        cursor.fetchall()
+        cursor.execute("DELETE FROM guide_booking_stats")
+        cursor.execute(REBUILD_SQL)
+        rows = cursor.rowcount
+        connection.commit()
+        return rows
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+# Only rows of an account that is (still) a guide
+GUIDE_SUMMARY_QUERY = """
+    SELECT s.month, s.pending_count, s.confirmed_count, s.completed_count, s.cancelled_count,
+           s.guest_days, s.revenue
+    FROM guide_booking_stats s JOIN users u ON u.id = s.guide_id AND u.user_type = 'guide'
+    WHERE s.guide_id = %s ORDER BY s.month DESC
+"""
+
+
+def guide_summary(cursor, guide_id, months=12):
+    """Totals over all time plus the most recent months, newest first"""
+    cursor.execute(GUIDE_SUMMARY_QUERY, (guide_id,))
+    return summarize(cursor.fetchall(), months)
+
+
+def summarize(rows, months=12):
+    """guide_summary() of GUIDE_SUMMARY_QUERY rows already fetched"""
+    totals = {'bookings': 0, 'guest_days': 0, 'revenue': 0}
+    totals.update({status: 0 for status in BOOKING_STATUSES})
+    monthly = []
+    for row in rows:
+        month = {'month': row['month'].strftime('%Y-%m'),
+                 'guest_days': int(row['guest_days']), 'revenue': row['revenue']}
+        for status in BOOKING_STATUSES:
+            month[status] = int(row[f'{status}_count'])
+            totals[status] += month[status]
+        month['bookings'] = sum(month[status] for status in BOOKING_STATUSES)
+        totals['bookings'] += month['bookings']
+        totals['guest_days'] += month['guest_days']
+        totals['revenue'] += month['revenue']
+        if len(monthly) < months:
+            monthly.append(month)
+    # "Tours" on the dashboard are the bookings the guide actually took on
+    totals['tours'] = sum(totals[status] for status in EARNING_STATUSES)
+    return {'totals': totals, 'months': monthly}
@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """In-process LRU cache for query results, invalidated by namespace versions
+
+    Every cached entry is keyed on its namespace's current version, so a write
+    path only has to call bump(namespace) after committing: later reads miss,
+    reload and the superseded entries age out through LRU eviction. The TTL is
+    a safety net for writes made by other worker processes, which cannot bump
+    this process's versions.
+    """
+
+    def __init__(self, max_entries=256, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def version(self, namespace):
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def bump(self, namespace):
+        """Invalidate everything cached under namespace"""
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            self._invalidations += 1
+
+    def _lookup(self, namespace, key):
+        """(True, value) on a hit, else (False, the key to store the loaded value under)"""
+        now = time.monotonic()
+        with self._lock:
+            version = self._versions.get(namespace, 0)
+            cache_key = (namespace, version, key)
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(cache_key)
+                self._hits += 1
+                return True, entry[1]
+            self._misses += 1
+            return False, cache_key
+
+    def _store(self, cache_key, value):
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_load(self, namespace, key, loader):
+        """Return the cached result for key, calling loader() on a miss
+
+        Exceptions from loader propagate and nothing is cached, so a database
+        outage never gets stored as an empty result.
+        """
+        hit, found = self._lookup(namespace, key)
+        if hit:
+            return found
+        # Load outside the lock; the version captured by _lookup means a write
+        # that lands while we are loading leaves this result under a stale key
+        value = loader()
+        self._store(found, value)
+        return value
+
+    async def get_or_load_async(self, namespace, key, loader):
+        """get_or_load() for a coroutine function loader, used by the ASGI views"""
+        hit, found = self._lookup(namespace, key)
+        if hit:
+            return found
+        value = await loader()
+        self._store(found, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+                'versions': dict(self._versions),
+            }
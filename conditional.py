@@ -0,0 +1,94 @@
+"""ETags, 304s and on-the-fly compression for dynamic responses
+
+Every buffered 200 response to a GET gets a strong ETag computed from its
+body. A request whose If-None-Match matches is answered with an empty 304.
+Text and JSON bodies of at least min_size bytes are then gzip- or
+brotli-compressed, depending on what the client accepts.
+
+The ETag includes the chosen encoding, because a compressed body is a
+different representation. Pages that read the session already carry
+`Vary: Cookie` from Flask, and are marked private so shared caches never
+store one user's page for another.
+
+Streamed responses, file downloads (direct passthrough) and responses that
+are already encoded, such as /assets/, pass through untouched. A streamed
+body can be gzipped chunk by chunk with compress_stream() instead.
+"""
+import gzip
+import hashlib
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/html', 'text/plain', 'text/css', 'text/csv', 'text/javascript',
+    'application/json', 'application/javascript', 'image/svg+xml',
+)
+
+
+class ResponseOptimizer:
+    def __init__(self, min_size=1024, gzip_level=6, brotli_quality=5):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _encoding_for(self, request, response, size):
+        if size < self.min_size or response.mimetype not in COMPRESSIBLE_TYPES:
+            return None
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def _compress(self, body, encoding):
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    def compress_stream(self, request, chunks):
+        """(chunks, encoding) for a streamed body: gzipped on the fly if the client accepts it"""
+        if not request.accept_encodings['gzip']:
+            return chunks, None
+        return self._gzip_chunks(chunks), 'gzip'
+
+    def _gzip_chunks(self, chunks):
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)  # 31: gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def process(self, request, response, session_accessed=False):
+        """after_request hook: add an ETag, answer 304s and compress"""
+        if (request.method not in ('GET', 'HEAD') or response.status_code != 200
+                or response.is_streamed or response.direct_passthrough
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        body = response.get_data()
+        encoding = self._encoding_for(request, response, len(body))
+        if encoding is not None or response.mimetype in COMPRESSIBLE_TYPES:
+            response.vary.add('Accept-Encoding')
+
+        if session_accessed and 'Cache-Control' not in response.headers:
+            # Browsers may keep the page but must check back before reusing it
+            response.headers['Cache-Control'] = 'private, no-cache'
+
+        if not response.get_etag()[0]:
+            digest = hashlib.sha256(body).hexdigest()[:32]
+            response.set_etag(f'{digest}-{encoding}' if encoding else digest)
+
+        # Turns the response into an empty 304 when If-None-Match matches
+        response.make_conditional(request)
+        if response.status_code != 200 or encoding is None:
+            return response
+
+        response.set_data(self._compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
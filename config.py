@@ -10,3 +10,107 @@ class Config:
     MYSQL_DB = 'sakthi16$jharkhand_tourism'  # Your database name (prefixed; update if different)
     MYSQL_CHARSET = 'utf8mb4'
     MYSQL_AUTH_PLUGIN = 'caching_sha2_password'  # Kept as is for compatibility
+
+    # Connection pool (see db.ConnectionPool); size it to roughly the number of
+    # threads per worker, keeping workers * (size + overflow) under max_connections
+    MYSQL_POOL_NAME = 'jharkhand_pool'
+    MYSQL_POOL_SIZE = int(os.environ.get('MYSQL_POOL_SIZE', 5))  # mysql.connector caps this at 32
+    MYSQL_POOL_MAX_OVERFLOW = int(os.environ.get('MYSQL_POOL_MAX_OVERFLOW', 5))
+    MYSQL_POOL_TIMEOUT = float(os.environ.get('MYSQL_POOL_TIMEOUT', 10))  # seconds to wait for a free connection
+    MYSQL_POOL_RECONNECT_ATTEMPTS = 3
+    # Resetting the session on release also throws away the connection's
+    # prepared statements (repository.py), so pooled connections are only
+    # rolled back; they keep up to PREPARED_STATEMENT_CACHE_SIZE statements each
+    MYSQL_POOL_RESET_SESSION = False
+    PREPARED_STATEMENT_CACHE_SIZE = 64
+
+    # ASGI mode (asgi.py): connections of the asyncio pool the async views share,
+    # and threads serving every other route through the WSGI app
+    ASYNC_MYSQL_POOL_SIZE = int(os.environ.get('ASYNC_MYSQL_POOL_SIZE', 10))  # also capped at 32
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 8))
+
+    # Admission control (ratelimit.py): requests per worker allowed to hold a
+    # database connection at once; more are answered 503 at once rather than
+    # queueing on the pool. Defaults to what the pool can serve without waiting
+    MAX_CONCURRENT_DB_REQUESTS = int(os.environ.get('MAX_CONCURRENT_DB_REQUESTS',
+                                                    MYSQL_POOL_SIZE + MYSQL_POOL_MAX_OVERFLOW))
+    ADMISSION_RETRY_AFTER = 1  # seconds, sent in Retry-After with a shed request's 503
+
+    # Per-client rate limits: rule -> {'ip' | 'username': (requests, per seconds)}.
+    # Requests over a limit get a 429 with Retry-After
+    RATE_LIMITS = {
+        'login': {'ip': (20, 60), 'username': (5, 60)},
+        'register': {'ip': (5, 300)},
+        'booking': {'ip': (10, 60), 'username': (10, 600)},
+    }
+    RATE_LIMIT_SHARDS = 16
+    # Trusted reverse proxies in front of the app that set X-Forwarded-For
+    # (PythonAnywhere has one, so set PROXY_COUNT=1 there). Off by default: with
+    # no proxy, clients could forge the header to dodge the rate limits
+    PROXY_COUNT = int(os.environ.get('PROXY_COUNT', 0))
+
+    # Published content cache (homepage feed and /content/<id>); entries are
+    # invalidated by content writes, the TTL only covers writes from other workers
+    CONTENT_CACHE_TTL = int(os.environ.get('CONTENT_CACHE_TTL', 60))  # seconds
+    CONTENT_CACHE_MAX_ENTRIES = int(os.environ.get('CONTENT_CACHE_MAX_ENTRIES', 512))
+
+    # Jinja bytecode cache (shared by all workers; used once `flask
+    # compile-templates` has created it) and the rendered fragment cache for
+    # {% cache %} blocks; fragment keys carry versions, so the TTL only bounds
+    # how long an unchanged fragment is kept
+    JINJA_BYTECODE_CACHE_DIR = 'instance/jinja_cache'
+    FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', 2048))
+    FRAGMENT_CACHE_TTL = 3600
+
+    # Guide uploads, relative to the working directory; created on the first upload
+    UPLOAD_FOLDER = 'static/uploads'
+
+    # Background threads per worker process that resize uploaded images (images.py)
+    IMAGE_PIPELINE_WORKERS = int(os.environ.get('IMAGE_PIPELINE_WORKERS', 2))
+
+    # Guide availability index (availability.py): seconds between incremental
+    # syncs of other workers' booking changes, and between full rebuilds. Each
+    # sync re-reads AVAILABILITY_SYNC_OVERLAP seconds before the last one, to
+    # catch bookings committed after the timestamp they were stamped with
+    AVAILABILITY_SYNC_INTERVAL = 5
+    AVAILABILITY_FULL_RELOAD_INTERVAL = 300
+    AVAILABILITY_SYNC_OVERLAP = 30
+
+    # Guide recommendations (recommend.py): the same, for the guide feature matrix
+    RECOMMENDER_SYNC_INTERVAL = 10
+    RECOMMENDER_FULL_RELOAD_INTERVAL = 600
+    RECOMMENDER_SYNC_OVERLAP = 30
+
+    # District and place coordinates (geo.py) change only by hand; seconds between reloads
+    PROXIMITY_RELOAD_INTERVAL = 3600
+
+    # Dynamic response compression (conditional.py); bodies smaller than
+    # COMPRESS_MIN_SIZE bytes are not worth the CPU
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_GZIP_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 5  # 11 is for prebuilt assets; too slow per request
+
+    # Instrumentation (metrics.py): statements slower than this are logged, without
+    # their parameter values. /metrics is for logged-in admins; set METRICS_TOKEN
+    # to let a Prometheus scraper in with that bearer token
+    SLOW_QUERY_THRESHOLD_MS = int(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200))
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # Booking notifications (outbox.py): routes queue them in notification_outbox
+    # and `python outbox.py` delivers them. OUTBOX_SENDER is 'file' (writes .eml
+    # files to OUTBOX_FILE_DIR) or 'smtp'
+    OUTBOX_SENDER = os.environ.get('OUTBOX_SENDER', 'file')
+    OUTBOX_FILE_DIR = os.environ.get('OUTBOX_FILE_DIR', 'instance/outbox')
+    OUTBOX_BATCH_SIZE = 50
+    OUTBOX_POLL_INTERVAL = 5  # seconds between polls when the outbox is empty
+    OUTBOX_MAX_ATTEMPTS = 8
+    OUTBOX_RETRY_BASE = 30  # seconds before the first retry, doubling each time
+    OUTBOX_RETRY_MAX = 3600
+    OUTBOX_LEASE = 300  # seconds a claimed batch is held before another worker may retry it
+    OUTBOX_RECONNECT_MAX = 300  # longest wait, in seconds, between reconnects after a database error
+    MAIL_FROM = os.environ.get('MAIL_FROM', 'Jharkhand Tourism <no-reply@jharkhandtourism.com>')
+    SMTP_HOST = os.environ.get('SMTP_HOST', 'localhost')
+    SMTP_PORT = int(os.environ.get('SMTP_PORT', 1025))
+    SMTP_USERNAME = os.environ.get('SMTP_USERNAME')
+    SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD')
+    SMTP_USE_TLS = os.environ.get('SMTP_USE_TLS') == '1'
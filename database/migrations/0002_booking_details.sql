@@ -0,0 +1,11 @@
+-- Columns that book_guide() inserts but the original schema never had
+
+ALTER TABLE bookings ADD COLUMN email VARCHAR(100) AFTER phone;
+ALTER TABLE bookings ADD COLUMN group_size INT DEFAULT 1 AFTER departure_date;
+ALTER TABLE bookings ADD COLUMN tour_type VARCHAR(100) AFTER group_size;
+ALTER TABLE bookings ADD COLUMN specific_places TEXT AFTER tour_type;
+ALTER TABLE bookings ADD COLUMN accommodation VARCHAR(50) AFTER specific_places;
+ALTER TABLE bookings ADD COLUMN transport VARCHAR(50) AFTER accommodation;
+ALTER TABLE bookings ADD COLUMN dietary_preference VARCHAR(50) AFTER transport;
+ALTER TABLE bookings ADD COLUMN fitness_level VARCHAR(20) AFTER dietary_preference;
+ALTER TABLE bookings ADD COLUMN additional_requirements TEXT AFTER fitness_level;
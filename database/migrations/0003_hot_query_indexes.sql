@@ -0,0 +1,28 @@
+-- Composite indexes for the dashboard, homepage and guide search access paths.
+-- InnoDB appends the primary key to every secondary index, so these also serve
+-- the "ORDER BY ..., id" tie-breakers.
+
+-- guide_dashboard(): WHERE guide_id = ? ORDER BY created_at DESC
+-- (also satisfies the guide_id foreign key)
+CREATE INDEX idx_bookings_guide_created ON bookings (guide_id, created_at);
+
+-- tourist_dashboard(): WHERE tourist_id = ? ORDER BY created_at DESC
+CREATE INDEX idx_bookings_tourist_created ON bookings (tourist_id, created_at);
+
+-- index() feed and admin uploads table: ORDER BY upload_date DESC LIMIT n
+CREATE INDEX idx_uploads_date ON guide_uploads (upload_date);
+
+-- guide_my_content(): WHERE guide_id = ? ORDER BY upload_date DESC
+CREATE INDEX idx_uploads_guide_date ON guide_uploads (guide_id, upload_date);
+
+-- /api/guides: WHERE availability_status = 'available' AND location LIKE 'x%'
+CREATE INDEX idx_guides_status_location ON guides (availability_status, location);
+
+-- admin bookings table: ORDER BY created_at
+CREATE INDEX idx_bookings_created ON bookings (created_at);
+
+-- The single-column indexes MySQL created implicitly for these foreign keys
+-- are now prefixes of the composite indexes above; drop them to save writes
+DROP INDEX guide_id ON bookings;
+DROP INDEX tourist_id ON bookings;
+DROP INDEX guide_id ON guide_uploads;
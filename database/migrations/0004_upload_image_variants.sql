@@ -0,0 +1,7 @@
+-- Dimensions and resized variants produced by the image pipeline (images.py).
+-- image_variants holds JSON: {"width", "height", "variants": {name: {...}}};
+-- NULL until the background worker has processed the upload.
+
+ALTER TABLE guide_uploads ADD COLUMN image_width INT AFTER image_path;
+ALTER TABLE guide_uploads ADD COLUMN image_height INT AFTER image_width;
+ALTER TABLE guide_uploads ADD COLUMN image_variants TEXT AFTER image_height;
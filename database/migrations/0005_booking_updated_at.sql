@@ -0,0 +1,5 @@
+-- Lets other worker processes pick up booking changes incrementally
+-- (availability.AvailabilityIndex syncs on updated_at)
+
+ALTER TABLE bookings ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER created_at;
+CREATE INDEX idx_bookings_updated ON bookings (updated_at);
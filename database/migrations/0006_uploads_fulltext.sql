@@ -0,0 +1,4 @@
+-- Relevance-ranked search over published guide content (/api/content/search).
+-- InnoDB ignores words shorter than innodb_ft_min_token_size (3 by default).
+
+CREATE FULLTEXT INDEX ft_uploads_text ON guide_uploads (title, description, location);
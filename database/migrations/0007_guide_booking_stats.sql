@@ -0,0 +1,33 @@
+-- Per-guide, per-month booking summary (booking_stats.py). Bookings now keep
+-- the guide's daily rate at booking time so revenue survives price changes.
+
+ALTER TABLE bookings ADD COLUMN price_per_day DECIMAL(10,2) AFTER group_size;
+UPDATE bookings b JOIN guides g ON g.user_id = b.guide_id 
+SET b.price_per_day = g.price_per_day WHERE b.price_per_day IS NULL;
+
+CREATE TABLE guide_booking_stats (
+    guide_id INT NOT NULL,
+    month DATE NOT NULL,
+    pending_count INT NOT NULL DEFAULT 0,
+    confirmed_count INT NOT NULL DEFAULT 0,
+    completed_count INT NOT NULL DEFAULT 0,
+    cancelled_count INT NOT NULL DEFAULT 0,
+    guest_days INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (guide_id, month),
+    FOREIGN KEY (guide_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Initial fill; same query as booking_stats.rebuild(), REPLACE keeps it re-runnable
+REPLACE INTO guide_booking_stats (guide_id, month, pending_count, confirmed_count, 
+                                  completed_count, cancelled_count, guest_days, revenue)
+SELECT guide_id, COALESCE(arrival_date, DATE(created_at)) - INTERVAL (DAYOFMONTH(COALESCE(arrival_date, DATE(created_at))) - 1) DAY as month,
+       SUM(booking_status = 'pending'), SUM(booking_status = 'confirmed'),
+       SUM(booking_status = 'completed'), SUM(booking_status = 'cancelled'),
+       SUM(IF(booking_status IN ('confirmed', 'completed'), 
+              COALESCE(days_to_stay, 0) * COALESCE(group_size, 1), 0)),
+       SUM(IF(booking_status IN ('confirmed', 'completed'), 
+              COALESCE(price_per_day, 0) * COALESCE(days_to_stay, 0) * COALESCE(group_size, 1), 0))
+FROM bookings
+WHERE guide_id IS NOT NULL
+GROUP BY guide_id, month;
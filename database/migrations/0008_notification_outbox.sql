@@ -0,0 +1,22 @@
+-- Booking notifications queued by the booking routes in the same transaction
+-- as the booking change, and delivered by the outbox worker (outbox.py)
+
+CREATE TABLE notification_outbox (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(50) NOT NULL,
+    booking_id INT,
+    recipient_name VARCHAR(100),
+    recipient_email VARCHAR(100),
+    recipient_phone VARCHAR(20),
+    subject VARCHAR(200) NOT NULL,
+    body TEXT NOT NULL,
+    status ENUM('pending', 'sent', 'failed') NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    claim_token CHAR(32),
+    last_error VARCHAR(500),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at DATETIME,
+    INDEX idx_outbox_due (status, next_attempt_at),
+    INDEX idx_outbox_claim (claim_token)
+);
@@ -0,0 +1,6 @@
+-- Last-change timestamps used as versions by the template fragment cache
+-- (fragments.py): guide cards key on guides.updated_at, content cards on
+-- guide_uploads.updated_at
+
+ALTER TABLE guides ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP;
+ALTER TABLE guide_uploads ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP;
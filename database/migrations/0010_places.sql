@@ -0,0 +1,85 @@
+-- Jharkhand districts and well-known places with coordinates, for the
+-- "guides near this place" index (geo.py). Guides are matched to a district
+-- through their free-text location.
+
+CREATE TABLE districts (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    headquarters VARCHAR(100),
+    latitude DECIMAL(8,5) NOT NULL,
+    longitude DECIMAL(8,5) NOT NULL
+);
+
+CREATE TABLE places (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(150) NOT NULL UNIQUE,
+    district_id INT NOT NULL,
+    latitude DECIMAL(8,5) NOT NULL,
+    longitude DECIMAL(8,5) NOT NULL,
+    FOREIGN KEY (district_id) REFERENCES districts(id)
+);
+
+-- INSERT IGNORE keeps the seed re-runnable
+INSERT IGNORE INTO districts (name, headquarters, latitude, longitude) VALUES
+    ('Ranchi', 'Ranchi', 23.34410, 85.30960),
+    ('East Singhbhum', 'Jamshedpur', 22.80460, 86.20290),
+    ('Deoghar', 'Deoghar', 24.48200, 86.69500),
+    ('Dhanbad', 'Dhanbad', 23.79570, 86.43040),
+    ('Hazaribagh', 'Hazaribagh', 23.99250, 85.36370),
+    ('Bokaro', 'Bokaro Steel City', 23.66930, 86.15110),
+    ('West Singhbhum', 'Chaibasa', 22.55200, 85.80660),
+    ('Palamu', 'Medininagar', 24.03070, 84.06700),
+    ('Giridih', 'Giridih', 24.19130, 86.30870),
+    ('Dumka', 'Dumka', 24.26760, 87.24970),
+    ('Godda', 'Godda', 24.82700, 87.21250),
+    ('Chatra', 'Chatra', 24.20700, 84.87070),
+    ('Garhwa', 'Garhwa', 24.15490, 83.79960),
+    ('Gumla', 'Gumla', 23.04410, 84.53790),
+    ('Jamtara', 'Jamtara', 23.96280, 86.80280),
+    ('Khunti', 'Khunti', 23.07170, 85.27890),
+    ('Koderma', 'Koderma', 24.46770, 85.59380),
+    ('Latehar', 'Latehar', 23.74430, 84.49870),
+    ('Lohardaga', 'Lohardaga', 23.43430, 84.68340),
+    ('Pakur', 'Pakur', 24.63370, 87.84970),
+    ('Ramgarh', 'Ramgarh', 23.63020, 85.52140),
+    ('Sahebganj', 'Sahebganj', 25.24450, 87.63190),
+    ('Saraikela Kharsawan', 'Seraikela', 22.69960, 85.93060),
+    ('Simdega', 'Simdega', 22.61600, 84.50290);
+
+INSERT IGNORE INTO places (name, district_id, latitude, longitude) VALUES
+    ('Hundru Falls', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.45000, 85.65000),
+    ('Dassam Falls', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.14360, 85.46570),
+    ('Jonha Falls', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.34170, 85.60810),
+    ('Pahari Mandir', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.37140, 85.32060),
+    ('Rock Garden', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.38420, 85.31000),
+    ('Jagannath Temple', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.31700, 85.28060),
+    ('Jubilee Park', (SELECT id FROM districts WHERE name = 'East Singhbhum'), 22.81200, 86.18900),
+    ('Dimna Lake', (SELECT id FROM districts WHERE name = 'East Singhbhum'), 22.86400, 86.26900),
+    ('Dalma Wildlife Sanctuary', (SELECT id FROM districts WHERE name = 'East Singhbhum'), 22.88000, 86.05000),
+    ('Baidyanath Temple', (SELECT id FROM districts WHERE name = 'Deoghar'), 24.49210, 86.70000),
+    ('Trikut Pahar', (SELECT id FROM districts WHERE name = 'Deoghar'), 24.46600, 86.83800),
+    ('Naulakha Mandir', (SELECT id FROM districts WHERE name = 'Deoghar'), 24.47600, 86.71100),
+    ('Maithon Dam', (SELECT id FROM districts WHERE name = 'Dhanbad'), 23.78300, 86.81600),
+    ('Topchanchi Lake', (SELECT id FROM districts WHERE name = 'Dhanbad'), 23.90000, 86.20000),
+    ('Canary Hill', (SELECT id FROM districts WHERE name = 'Hazaribagh'), 23.99600, 85.36700),
+    ('Hazaribagh National Park', (SELECT id FROM districts WHERE name = 'Hazaribagh'), 24.14000, 85.36000),
+    ('Saranda Forest', (SELECT id FROM districts WHERE name = 'West Singhbhum'), 22.10000, 85.30000),
+    ('Betla National Park', (SELECT id FROM districts WHERE name = 'Latehar'), 23.89000, 84.19000),
+    ('Netarhat', (SELECT id FROM districts WHERE name = 'Latehar'), 23.48330, 84.26670),
+    ('Lodh Falls', (SELECT id FROM districts WHERE name = 'Latehar'), 23.47700, 84.05400),
+    ('Palamau Fort', (SELECT id FROM districts WHERE name = 'Latehar'), 23.86670, 84.20000),
+    ('Parasnath Hill', (SELECT id FROM districts WHERE name = 'Giridih'), 23.96200, 86.12900),
+    ('Usri Falls', (SELECT id FROM districts WHERE name = 'Giridih'), 24.23300, 86.30300),
+    ('Basukinath', (SELECT id FROM districts WHERE name = 'Dumka'), 24.38900, 87.08000),
+    ('Massanjore Dam', (SELECT id FROM districts WHERE name = 'Dumka'), 24.10600, 87.31000),
+    ('Tamasin Falls', (SELECT id FROM districts WHERE name = 'Chatra'), 24.20000, 84.90000),
+    ('Anjan Dham', (SELECT id FROM districts WHERE name = 'Gumla'), 23.13300, 84.56700),
+    ('Tangi Nath', (SELECT id FROM districts WHERE name = 'Gumla'), 23.10000, 84.30000),
+    ('Panch Gagh Falls', (SELECT id FROM districts WHERE name = 'Khunti'), 23.00500, 85.32200),
+    ('Ulihatu', (SELECT id FROM districts WHERE name = 'Khunti'), 22.99000, 85.20000),
+    ('Tilaiya Dam', (SELECT id FROM districts WHERE name = 'Koderma'), 24.32100, 85.52400),
+    ('Patratu Valley', (SELECT id FROM districts WHERE name = 'Ramgarh'), 23.63500, 85.29000),
+    ('Rajrappa Temple', (SELECT id FROM districts WHERE name = 'Ramgarh'), 23.63180, 85.71050),
+    ('Rajmahal Hills', (SELECT id FROM districts WHERE name = 'Sahebganj'), 25.05000, 87.83000),
+    ('Chandil Dam', (SELECT id FROM districts WHERE name = 'Saraikela Kharsawan'), 22.97000, 86.03000),
+    ('Kelaghagh Dam', (SELECT id FROM districts WHERE name = 'Simdega'), 22.60000, 84.52000);
@@ -0,0 +1,6 @@
+-- /all_content feed: WHERE [upload_type = ? | location = ?]
+-- ORDER BY upload_date DESC, id DESC, continued with a keyset on
+-- (upload_date, id). InnoDB appends id to both indexes, so every page is one
+-- index range read however deep it is; idx_uploads_date serves the unfiltered feed.
+CREATE INDEX idx_uploads_type_date ON guide_uploads (upload_type, upload_date);
+CREATE INDEX idx_uploads_location_date ON guide_uploads (location, upload_date);
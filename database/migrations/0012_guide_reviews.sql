@@ -0,0 +1,21 @@
+-- Tourist reviews of guides, one per completed booking. guides.rating is kept
+-- as rating_sum / review_count, maintained by the review routes in the same
+-- transaction as the review itself rather than recomputed with AVG().
+
+CREATE TABLE reviews (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    booking_id INT NOT NULL UNIQUE,
+    guide_id INT NOT NULL,
+    tourist_id INT NOT NULL,
+    rating TINYINT NOT NULL,
+    comment TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_reviews_guide_created (guide_id, created_at),
+    INDEX idx_reviews_tourist (tourist_id),
+    FOREIGN KEY (booking_id) REFERENCES bookings(id) ON DELETE CASCADE,
+    FOREIGN KEY (guide_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (tourist_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+ALTER TABLE guides ADD COLUMN rating_sum INT NOT NULL DEFAULT 0 AFTER rating;
+ALTER TABLE guides ADD COLUMN review_count INT NOT NULL DEFAULT 0 AFTER rating_sum;
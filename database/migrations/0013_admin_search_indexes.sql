@@ -0,0 +1,10 @@
+-- Admin dashboard search: a prefix match (col LIKE 'q%') on each search
+-- column separately, the matching ids combined with UNION. users.username is
+-- already unique, guide_uploads.location leads idx_uploads_location_date, and
+-- the username arms reach bookings and uploads through the guide_id and
+-- tourist_id indexes; these cover the remaining columns.
+CREATE INDEX idx_users_full_name ON users (full_name);
+CREATE INDEX idx_users_email ON users (email);
+CREATE INDEX idx_bookings_tourist_name ON bookings (tourist_name);
+CREATE INDEX idx_bookings_phone ON bookings (phone);
+CREATE INDEX idx_uploads_title ON guide_uploads (title);
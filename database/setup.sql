@@ -1,8 +1,14 @@
-CREATE DATABASE IF NOT EXISTS arunachal_tourism;
-USE arunachal_tourism;
+-- Fresh install of the Jharkhand Tourism schema.
+-- This is the schema after every migration in database/migrations. Existing
+-- databases should be upgraded with `python migrate.py` instead; running it
+-- after this script only records the migrations as applied.
+-- On PythonAnywhere the database already exists as <username>$jharkhand_tourism
+-- (Config.MYSQL_DB); skip the two lines below and run the rest inside it.
+CREATE DATABASE IF NOT EXISTS jharkhand_tourism;
+USE jharkhand_tourism;
 
 -- Users table for authentication
-CREATE TABLE users (
+CREATE TABLE IF NOT EXISTS users (
     id INT AUTO_INCREMENT PRIMARY KEY,
     username VARCHAR(50) UNIQUE NOT NULL,
     password VARCHAR(255) NOT NULL,
@@ -10,11 +16,13 @@ CREATE TABLE users (
     full_name VARCHAR(100),
     phone VARCHAR(15),
     email VARCHAR(100),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_users_full_name (full_name),
+    INDEX idx_users_email (email)
 );
 
 -- Guides profile table
-CREATE TABLE guides (
+CREATE TABLE IF NOT EXISTS guides (
     id INT AUTO_INCREMENT PRIMARY KEY,
     user_id INT,
     specialization VARCHAR(200),
@@ -24,39 +32,204 @@ CREATE TABLE guides (
     price_per_day DECIMAL(10,2),
     availability_status ENUM('available', 'busy') DEFAULT 'available',
     rating DECIMAL(3,2) DEFAULT 0.00,
+    rating_sum INT NOT NULL DEFAULT 0,
+    review_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_guides_status_location (availability_status, location),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
 -- Tourist bookings table
-CREATE TABLE bookings (
+CREATE TABLE IF NOT EXISTS bookings (
     id INT AUTO_INCREMENT PRIMARY KEY,
     tourist_id INT,
     guide_id INT,
     tourist_name VARCHAR(100),
     native_place VARCHAR(100),
     phone VARCHAR(15),
+    email VARCHAR(100),
     days_to_stay INT,
     arrival_date DATE,
     departure_date DATE,
+    group_size INT DEFAULT 1,
+    price_per_day DECIMAL(10,2),
+    tour_type VARCHAR(100),
+    specific_places TEXT,
+    accommodation VARCHAR(50),
+    transport VARCHAR(50),
+    dietary_preference VARCHAR(50),
+    fitness_level VARCHAR(20),
+    additional_requirements TEXT,
     booking_status ENUM('pending', 'confirmed', 'completed', 'cancelled') DEFAULT 'pending',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_bookings_guide_created (guide_id, created_at),
+    INDEX idx_bookings_tourist_created (tourist_id, created_at),
+    INDEX idx_bookings_created (created_at),
+    INDEX idx_bookings_updated (updated_at),
+    INDEX idx_bookings_tourist_name (tourist_name),
+    INDEX idx_bookings_phone (phone),
     FOREIGN KEY (tourist_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (guide_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
 -- Events and photos uploaded by guides
-CREATE TABLE guide_uploads (
+CREATE TABLE IF NOT EXISTS guide_uploads (
     id INT AUTO_INCREMENT PRIMARY KEY,
     guide_id INT,
     upload_type ENUM('event', 'photo', 'location') NOT NULL,
     title VARCHAR(200),
     description TEXT,
     image_path VARCHAR(500),
+    image_width INT,
+    image_height INT,
+    image_variants TEXT,
     location VARCHAR(200),
     upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_uploads_date (upload_date),
+    INDEX idx_uploads_guide_date (guide_id, upload_date),
+    INDEX idx_uploads_type_date (upload_type, upload_date),
+    INDEX idx_uploads_location_date (location, upload_date),
+    INDEX idx_uploads_title (title),
+    FULLTEXT INDEX ft_uploads_text (title, description, location),
     FOREIGN KEY (guide_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
+-- Tourist reviews of guides, one per completed booking; guides.rating is
+-- rating_sum / review_count, maintained alongside each review
+CREATE TABLE IF NOT EXISTS reviews (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    booking_id INT NOT NULL UNIQUE,
+    guide_id INT NOT NULL,
+    tourist_id INT NOT NULL,
+    rating TINYINT NOT NULL,
+    comment TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_reviews_guide_created (guide_id, created_at),
+    INDEX idx_reviews_tourist (tourist_id),
+    FOREIGN KEY (booking_id) REFERENCES bookings(id) ON DELETE CASCADE,
+    FOREIGN KEY (guide_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (tourist_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Per-guide, per-month booking summary maintained by the booking routes
+CREATE TABLE IF NOT EXISTS guide_booking_stats (
+    guide_id INT NOT NULL,
+    month DATE NOT NULL,
+    pending_count INT NOT NULL DEFAULT 0,
+    confirmed_count INT NOT NULL DEFAULT 0,
+    completed_count INT NOT NULL DEFAULT 0,
+    cancelled_count INT NOT NULL DEFAULT 0,
+    guest_days INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (guide_id, month),
+    FOREIGN KEY (guide_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Booking notifications waiting for the outbox worker (outbox.py)
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(50) NOT NULL,
+    booking_id INT,
+    recipient_name VARCHAR(100),
+    recipient_email VARCHAR(100),
+    recipient_phone VARCHAR(20),
+    subject VARCHAR(200) NOT NULL,
+    body TEXT NOT NULL,
+    status ENUM('pending', 'sent', 'failed') NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    claim_token CHAR(32),
+    last_error VARCHAR(500),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at DATETIME,
+    INDEX idx_outbox_due (status, next_attempt_at),
+    INDEX idx_outbox_claim (claim_token)
+);
+
+-- Jharkhand districts and well-known places with coordinates (geo.py)
+CREATE TABLE IF NOT EXISTS districts (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    headquarters VARCHAR(100),
+    latitude DECIMAL(8,5) NOT NULL,
+    longitude DECIMAL(8,5) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS places (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(150) NOT NULL UNIQUE,
+    district_id INT NOT NULL,
+    latitude DECIMAL(8,5) NOT NULL,
+    longitude DECIMAL(8,5) NOT NULL,
+    FOREIGN KEY (district_id) REFERENCES districts(id)
+);
+
+INSERT IGNORE INTO districts (name, headquarters, latitude, longitude) VALUES
+    ('Ranchi', 'Ranchi', 23.34410, 85.30960),
+    ('East Singhbhum', 'Jamshedpur', 22.80460, 86.20290),
+    ('Deoghar', 'Deoghar', 24.48200, 86.69500),
+    ('Dhanbad', 'Dhanbad', 23.79570, 86.43040),
+    ('Hazaribagh', 'Hazaribagh', 23.99250, 85.36370),
+    ('Bokaro', 'Bokaro Steel City', 23.66930, 86.15110),
+    ('West Singhbhum', 'Chaibasa', 22.55200, 85.80660),
+    ('Palamu', 'Medininagar', 24.03070, 84.06700),
+    ('Giridih', 'Giridih', 24.19130, 86.30870),
+    ('Dumka', 'Dumka', 24.26760, 87.24970),
+    ('Godda', 'Godda', 24.82700, 87.21250),
+    ('Chatra', 'Chatra', 24.20700, 84.87070),
+    ('Garhwa', 'Garhwa', 24.15490, 83.79960),
+    ('Gumla', 'Gumla', 23.04410, 84.53790),
+    ('Jamtara', 'Jamtara', 23.96280, 86.80280),
+    ('Khunti', 'Khunti', 23.07170, 85.27890),
+    ('Koderma', 'Koderma', 24.46770, 85.59380),
+    ('Latehar', 'Latehar', 23.74430, 84.49870),
+    ('Lohardaga', 'Lohardaga', 23.43430, 84.68340),
+    ('Pakur', 'Pakur', 24.63370, 87.84970),
+    ('Ramgarh', 'Ramgarh', 23.63020, 85.52140),
+    ('Sahebganj', 'Sahebganj', 25.24450, 87.63190),
+    ('Saraikela Kharsawan', 'Seraikela', 22.69960, 85.93060),
+    ('Simdega', 'Simdega', 22.61600, 84.50290);
+
+INSERT IGNORE INTO places (name, district_id, latitude, longitude) VALUES
+    ('Hundru Falls', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.45000, 85.65000),
+    ('Dassam Falls', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.14360, 85.46570),
+    ('Jonha Falls', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.34170, 85.60810),
+    ('Pahari Mandir', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.37140, 85.32060),
+    ('Rock Garden', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.38420, 85.31000),
+    ('Jagannath Temple', (SELECT id FROM districts WHERE name = 'Ranchi'), 23.31700, 85.28060),
+    ('Jubilee Park', (SELECT id FROM districts WHERE name = 'East Singhbhum'), 22.81200, 86.18900),
+    ('Dimna Lake', (SELECT id FROM districts WHERE name = 'East Singhbhum'), 22.86400, 86.26900),
+    ('Dalma Wildlife Sanctuary', (SELECT id FROM districts WHERE name = 'East Singhbhum'), 22.88000, 86.05000),
+    ('Baidyanath Temple', (SELECT id FROM districts WHERE name = 'Deoghar'), 24.49210, 86.70000),
+    ('Trikut Pahar', (SELECT id FROM districts WHERE name = 'Deoghar'), 24.46600, 86.83800),
+    ('Naulakha Mandir', (SELECT id FROM districts WHERE name = 'Deoghar'), 24.47600, 86.71100),
+    ('Maithon Dam', (SELECT id FROM districts WHERE name = 'Dhanbad'), 23.78300, 86.81600),
+    ('Topchanchi Lake', (SELECT id FROM districts WHERE name = 'Dhanbad'), 23.90000, 86.20000),
+    ('Canary Hill', (SELECT id FROM districts WHERE name = 'Hazaribagh'), 23.99600, 85.36700),
+    ('Hazaribagh National Park', (SELECT id FROM districts WHERE name = 'Hazaribagh'), 24.14000, 85.36000),
+    ('Saranda Forest', (SELECT id FROM districts WHERE name = 'West Singhbhum'), 22.10000, 85.30000),
+    ('Betla National Park', (SELECT id FROM districts WHERE name = 'Latehar'), 23.89000, 84.19000),
+    ('Netarhat', (SELECT id FROM districts WHERE name = 'Latehar'), 23.48330, 84.26670),
+    ('Lodh Falls', (SELECT id FROM districts WHERE name = 'Latehar'), 23.47700, 84.05400),
+    ('Palamau Fort', (SELECT id FROM districts WHERE name = 'Latehar'), 23.86670, 84.20000),
+    ('Parasnath Hill', (SELECT id FROM districts WHERE name = 'Giridih'), 23.96200, 86.12900),
+    ('Usri Falls', (SELECT id FROM districts WHERE name = 'Giridih'), 24.23300, 86.30300),
+    ('Basukinath', (SELECT id FROM districts WHERE name = 'Dumka'), 24.38900, 87.08000),
+    ('Massanjore Dam', (SELECT id FROM districts WHERE name = 'Dumka'), 24.10600, 87.31000),
+    ('Tamasin Falls', (SELECT id FROM districts WHERE name = 'Chatra'), 24.20000, 84.90000),
+    ('Anjan Dham', (SELECT id FROM districts WHERE name = 'Gumla'), 23.13300, 84.56700),
+    ('Tangi Nath', (SELECT id FROM districts WHERE name = 'Gumla'), 23.10000, 84.30000),
+    ('Panch Gagh Falls', (SELECT id FROM districts WHERE name = 'Khunti'), 23.00500, 85.32200),
+    ('Ulihatu', (SELECT id FROM districts WHERE name = 'Khunti'), 22.99000, 85.20000),
+    ('Tilaiya Dam', (SELECT id FROM districts WHERE name = 'Koderma'), 24.32100, 85.52400),
+    ('Patratu Valley', (SELECT id FROM districts WHERE name = 'Ramgarh'), 23.63500, 85.29000),
+    ('Rajrappa Temple', (SELECT id FROM districts WHERE name = 'Ramgarh'), 23.63180, 85.71050),
+    ('Rajmahal Hills', (SELECT id FROM districts WHERE name = 'Sahebganj'), 25.05000, 87.83000),
+    ('Chandil Dam', (SELECT id FROM districts WHERE name = 'Saraikela Kharsawan'), 22.97000, 86.03000),
+    ('Kelaghagh Dam', (SELECT id FROM districts WHERE name = 'Simdega'), 22.60000, 84.52000);
+
 -- Insert default admin user
-INSERT INTO users (username, password, user_type, full_name, email) 
-VALUES ('admin', 'admin123', 'admin', 'System Administrator', 'admin@arunachaltourism.com');
+INSERT IGNORE INTO users (username, password, user_type, full_name, email)
+VALUES ('admin', 'admin123', 'admin', 'System Administrator', 'admin@jharkhandtourism.com');
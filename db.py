@@ -0,0 +1,159 @@
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import Error, InterfaceError, pooling
+from mysql.connector.errors import PoolError
+
+
+class PoolTimeout(PoolError):
+    """Raised when no connection frees up within MYSQL_POOL_TIMEOUT seconds"""
+
+
+class ConnectionPool:
+    """MySQL connection pool with bounded overflow, health checks and usage stats
+
+    MYSQL_POOL_SIZE connections are kept open by mysql.connector.pooling. When
+    all of them are checked out, up to MYSQL_POOL_MAX_OVERFLOW extra short-lived
+    connections are opened; beyond that, callers wait up to MYSQL_POOL_TIMEOUT
+    seconds for a connection to be released before PoolTimeout is raised.
+
+    Sessions are not reset between checkouts unless MYSQL_POOL_RESET_SESSION
+    is set, because a reset also deallocates the connection's prepared
+    statements (see repository.py).
+    """
+
+    def __init__(self, config):
+        self.size = min(int(config['MYSQL_POOL_SIZE']), pooling.CNX_POOL_MAXSIZE)
+        self.max_overflow = int(config['MYSQL_POOL_MAX_OVERFLOW'])
+        self.timeout = float(config['MYSQL_POOL_TIMEOUT'])
+        self.reconnect_attempts = max(1, int(config['MYSQL_POOL_RECONNECT_ATTEMPTS']))
+        self.name = config['MYSQL_POOL_NAME']
+        self.reset_session = bool(config.get('MYSQL_POOL_RESET_SESSION', False))
+        self._connect_args = {
+            'host': config['MYSQL_HOST'],
+            'user': config['MYSQL_USER'],
+            'password': config['MYSQL_PASSWORD'],
+            'database': config['MYSQL_DB'],
+            'charset': config['MYSQL_CHARSET'],
+            'auth_plugin': config['MYSQL_AUTH_PLUGIN'],
+        }
+
+        # The underlying pool opens all of its connections up front, so it is
+        # only created on the first checkout rather than at import time
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size + self.max_overflow)
+
+        self._stats_lock = threading.Lock()
+        self._in_use = 0
+        self._overflow_in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._timeouts = 0
+        self._reconnects = 0
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = pooling.MySQLConnectionPool(
+                        pool_name=self.name,
+                        pool_size=self.size,
+                        pool_reset_session=self.reset_session,
+                        **self._connect_args
+                    )
+        return self._pool
+
+    def _checkout(self):
+        """Return (connection, is_overflow) for a slot the caller already holds"""
+        pool = self._get_pool()
+        for attempt in range(self.reconnect_attempts):
+            try:
+                # get_connection() pings the pooled connection and reconnects
+                # it if the server dropped it (wait_timeout, restart, ...)
+                return pool.get_connection(), False
+            except PoolError:
+                # Every pooled connection is busy; open a short-lived extra one
+                return mysql.connector.connect(**self._connect_args), True
+            except InterfaceError:
+                # Stale connection could not be revived; it went back to the
+                # pool, so try again before giving up
+                with self._stats_lock:
+                    self._reconnects += 1
+                if attempt == self.reconnect_attempts - 1:
+                    raise
+
+    def acquire(self):
+        """Check out a healthy connection, waiting for a free slot if needed"""
+        started = time.perf_counter()
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self._waits += 1
+            if not self._slots.acquire(timeout=self.timeout):
+                with self._stats_lock:
+                    self._timeouts += 1
+                    self._wait_time += time.perf_counter() - started
+                raise PoolTimeout(f"No MySQL connection available within {self.timeout}s")
+        waited = time.perf_counter() - started
+
+        try:
+            connection, overflow = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._stats_lock:
+            self._checkouts += 1
+            self._in_use += 1
+            if overflow:
+                self._overflow_in_use += 1
+            self._wait_time += waited
+            self._max_wait_time = max(self._max_wait_time, waited)
+        return connection
+
+    def release(self, connection, rollback=False):
+        """Return a connection to the pool (or close it if it was overflow)"""
+        overflow = not isinstance(connection, pooling.PooledMySQLConnection)
+        try:
+            try:
+                # Without a session reset the open transaction would carry over to
+                # the next checkout, so pooled connections are always rolled back
+                if rollback or (not overflow and not self.reset_session):
+                    connection.rollback()
+            except Error as e:
+                print(f"Error rolling back MySQL connection: {e}")
+            finally:
+                # Pooled connections go back to the queue, even when the rollback
+                # failed (get_connection() revives a dropped one); overflow
+                # connections are really closed
+                connection.close()
+        except Error as e:
+            print(f"Error releasing MySQL connection: {e}")
+        finally:
+            with self._stats_lock:
+                self._in_use -= 1
+                if overflow:
+                    self._overflow_in_use -= 1
+            self._slots.release()
+
+    def stats(self):
+        """Snapshot of pool usage for sizing against the worker count"""
+        with self._stats_lock:
+            return {
+                'pool_name': self.name,
+                'pool_size': self.size,
+                'max_overflow': self.max_overflow,
+                'timeout': self.timeout,
+                'initialized': self._pool is not None,
+                'in_use': self._in_use,
+                'overflow_in_use': self._overflow_in_use,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'wait_time': round(self._wait_time, 6),
+                'max_wait_time': round(self._max_wait_time, 6),
+                'timeouts': self._timeouts,
+                'reconnects': self._reconnects,
+            }
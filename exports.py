@@ -0,0 +1,96 @@
+"""Streaming CSV and JSON exports of whole admin tables
+
+Rows are read through an unbuffered cursor EXPORT_BATCH_SIZE at a time and
+written out as they arrive, so an export holds one batch in memory however
+large the table is. Each batch becomes one chunk of the response body.
+
+Passwords are never exported: every table lists the columns it exports.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {'csv': 'text/csv', 'json': 'application/json'}
+
+EXPORT_TABLES = {
+    'bookings': {
+        'columns': ['b.id', 'b.tourist_id', 'u1.username as tourist_username', 'b.tourist_name',
+                    'b.phone', 'b.email', 'b.native_place', 'b.guide_id', 'u2.username as guide_username',
+                    'b.arrival_date', 'b.departure_date', 'b.days_to_stay', 'b.group_size',
+                    'b.price_per_day', 'b.tour_type', 'b.specific_places', 'b.accommodation', 'b.transport',
+                    'b.dietary_preference', 'b.fitness_level', 'b.additional_requirements',
+                    'b.booking_status', 'b.created_at', 'b.updated_at'],
+        'from': """bookings b
+                   LEFT JOIN users u1 ON b.tourist_id = u1.id
+                   LEFT JOIN users u2 ON b.guide_id = u2.id""",
+        'id_column': 'b.id',
+    },
+    'users': {
+        'columns': ['u.id', 'u.username', 'u.user_type', 'u.full_name', 'u.phone', 'u.email', 'u.created_at'],
+        'from': "users u",
+        'id_column': 'u.id',
+    },
+    'uploads': {
+        'columns': ['gu.id', 'gu.guide_id', 'u.username as guide_username', 'gu.upload_type', 'gu.title',
+                    'gu.description', 'gu.location', 'gu.image_path', 'gu.upload_date', 'gu.updated_at'],
+        'from': """guide_uploads gu
+                   LEFT JOIN users u ON gu.guide_id = u.id""",
+        'id_column': 'gu.id',
+    },
+}
+
+
+def export_query(name, conditions=(), params=()):
+    """SELECT for an export table, filtered by SQL conditions, in id order"""
+    table = EXPORT_TABLES[name]
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    return (f"SELECT {', '.join(table['columns'])} FROM {table['from']} {where} "
+            f"ORDER BY {table['id_column']}"), list(params)
+
+
+def export_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return str(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', 'replace')
+    return value
+
+
+def row_batches(cursor):
+    while True:
+        rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+        if not rows:
+            return
+        yield rows
+
+
+def csv_chunks(cursor):
+    """A header line, then one chunk of CSV lines per batch of rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(cursor.column_names)
+    yield buffer.getvalue()
+    for rows in row_batches(cursor):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([export_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+
+
+def json_chunks(cursor):
+    """A JSON array of row objects, one chunk per batch of rows"""
+    columns = cursor.column_names
+    separator = '[\n'
+    for rows in row_batches(cursor):
+        yield separator + ',\n'.join(
+            json.dumps({column: export_value(value) for column, value in zip(columns, row)}, ensure_ascii=False)
+            for row in rows)
+        separator = ',\n'
+    yield '[]\n' if separator == '[\n' else '\n]\n'
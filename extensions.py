@@ -0,0 +1,335 @@
+"""Per-application services and the helpers every blueprint shares
+
+create_app() builds one Services per application: the connection pool,
+prepared statement cache, result and fragment caches, image pipeline,
+in-memory indexes and rate limiters. Blueprints reach them through the
+module-level proxies below (werkzeug LocalProxy, like flask.current_app), so
+importing this module or a blueprint builds nothing, and nothing connects to
+MySQL until a request first needs a connection.
+
+Request, query and template metrics are process-wide, like the worker they
+describe; gauges report the services of the most recently created app.
+"""
+import base64
+import json
+import math
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+from functools import wraps
+
+from flask import current_app, flash, g, has_app_context, has_request_context, redirect, request, session, url_for
+from mysql.connector import Error
+from werkzeug.exceptions import TooManyRequests, ServiceUnavailable
+from werkzeug.local import LocalProxy
+
+from assets import AssetManifest
+from availability import AvailabilityIndex, HISTORY_DAYS
+from cache import ResultCache
+from conditional import ResponseOptimizer
+from db import ConnectionPool
+from geo import ProximityIndex
+from images import ImagePipeline
+from metrics import MetricsRegistry, SlowQueryLog, InstrumentedConnection, statement_type, QUERY_COUNT_BUCKETS
+from ratelimit import TokenBuckets, RateLimiter, AdmissionGate
+from recommend import GuideRecommender
+from repository import Repository
+
+# Request, query and template timings, served at /metrics (metrics.py)
+metrics_registry = MetricsRegistry()
+request_latency = metrics_registry.histogram(
+    'http_request_duration_seconds', 'Time to handle a request', ('endpoint', 'method', 'status'))
+request_queries = metrics_registry.histogram(
+    'db_queries_per_request', 'SQL statements executed per request', ('endpoint',), QUERY_COUNT_BUCKETS)
+request_query_time = metrics_registry.histogram(
+    'db_query_time_per_request_seconds', 'Total SQL time per request', ('endpoint',))
+query_latency = metrics_registry.histogram(
+    'db_query_duration_seconds', 'Time to execute one SQL statement', ('statement',))
+slow_queries_total = metrics_registry.counter(
+    'db_slow_queries_total', 'SQL statements slower than SLOW_QUERY_THRESHOLD_MS', ('endpoint',))
+pool_acquire_time = metrics_registry.histogram(
+    'db_pool_acquire_seconds', 'Time to check a connection out of the pool')
+template_render_time = metrics_registry.histogram(
+    'template_render_seconds', 'Time to render a Jinja template', ('template',))
+rate_limited_total = metrics_registry.counter(
+    'rate_limited_requests_total', 'Requests refused by a per-client rate limit', ('rule', 'key'))
+
+# Every route that changes guide_uploads bumps this content cache namespace after commit
+CONTENT_CACHE_NAMESPACE = 'guide_content'
+
+
+class Services:
+    """Everything one application keeps in memory; every constructor is cheap and lazy"""
+
+    def __init__(self, app):
+        config = app.config
+        self.db_pool = ConnectionPool(config)
+        self.slow_query_log = SlowQueryLog(config['SLOW_QUERY_THRESHOLD_MS'] / 1000.0)
+        # Fixed queries run as prepared statements cached per pooled connection (repository.py)
+        self.repo = Repository(config['PREPARED_STATEMENT_CACHE_SIZE'], record_query)
+
+        # Per-client throttling of login, registration and booking, and the cap on
+        # requests holding a database connection at once (ratelimit.py)
+        self.rate_limiter = RateLimiter(config['RATE_LIMITS'], TokenBuckets(config['RATE_LIMIT_SHARDS']))
+        self.admission = AdmissionGate(config['MAX_CONCURRENT_DB_REQUESTS'])
+
+        # Cache for published guide content (homepage feed and content details)
+        self.content_cache = ResultCache(config['CONTENT_CACHE_MAX_ENTRIES'], config['CONTENT_CACHE_TTL'])
+        # Rendered guide and content cards, keyed on id + updated_at (fragments.py)
+        self.fragment_cache = ResultCache(config['FRAGMENT_CACHE_MAX_ENTRIES'], config['FRAGMENT_CACHE_TTL'])
+
+        # Resized WebP/JPEG variants of guide upload images, built off the request thread
+        def on_processed(upload_id, image_path, metadata):
+            with app.app_context():
+                store_image_variants(upload_id, image_path, metadata)
+        self.image_pipeline = ImagePipeline(app.static_folder, config['IMAGE_PIPELINE_WORKERS'], on_processed)
+
+        # Which guides are booked on which days, for date-based search and calendars
+        self.availability = AvailabilityIndex(fetch_availability_bookings,
+                                              config['AVAILABILITY_SYNC_INTERVAL'],
+                                              config['AVAILABILITY_FULL_RELOAD_INTERVAL'],
+                                              config['AVAILABILITY_SYNC_OVERLAP'])
+        # The districts and places tables: which districts lie near each known
+        # place, and which district a guide's location or a tourist's places name
+        self.proximity = ProximityIndex(fetch_places, config['PROXIMITY_RELOAD_INTERVAL'])
+        # Guide feature matrix for ranking guides against booking criteria
+        self.recommender = GuideRecommender(fetch_recommender_guides, self.proximity.district_of,
+                                            config['RECOMMENDER_SYNC_INTERVAL'],
+                                            config['RECOMMENDER_FULL_RELOAD_INTERVAL'],
+                                            config['RECOMMENDER_SYNC_OVERLAP'])
+
+        # Fingerprinted CSS/JS built by `python assets.py`; templates link them via asset_url()
+        self.asset_manifest = AssetManifest(app.static_folder, reload=app.debug)
+        # ETag/304 handling and gzip/brotli compression for pages and JSON (conditional.py)
+        self.response_optimizer = ResponseOptimizer(config['COMPRESS_MIN_SIZE'], config['COMPRESS_GZIP_LEVEL'],
+                                                    config['COMPRESS_BROTLI_QUALITY'])
+
+        metrics_registry.gauges('db_pool', 'Connection pool state', self.db_pool.stats)
+        metrics_registry.gauges('prepared_statements', 'Prepared statement cache', self.repo.stats)
+        metrics_registry.gauges('rate_limit', 'Rate limit buckets', self.rate_limiter.buckets.stats)
+        metrics_registry.gauges('admission', 'Requests holding a database connection', self.admission.stats)
+        metrics_registry.gauges('content_cache', 'Published content cache', self.content_cache.stats)
+        metrics_registry.gauges('fragment_cache', 'Rendered template fragment cache', self.fragment_cache.stats)
+        metrics_registry.gauges('recommender', 'Guide recommendation matrix', self.recommender.stats)
+
+
+def _service(name):
+    return LocalProxy(lambda: getattr(current_app.extensions['jharkhand'], name))
+
+
+db_pool = _service('db_pool')
+slow_query_log = _service('slow_query_log')
+repo = _service('repo')
+rate_limiter = _service('rate_limiter')
+admission = _service('admission')
+content_cache = _service('content_cache')
+fragment_cache = _service('fragment_cache')
+image_pipeline = _service('image_pipeline')
+availability = _service('availability')
+recommender = _service('recommender')
+proximity = _service('proximity')
+asset_manifest = _service('asset_manifest')
+response_optimizer = _service('response_optimizer')
+
+
+def record_query(sql, params, seconds):
+    """Called by every instrumented cursor after execute()/executemany()"""
+    query_latency.observe(seconds, statement_type(sql))
+    endpoint = None
+    if has_request_context():
+        endpoint = request.endpoint
+        g.query_count = g.get('query_count', 0) + 1
+        g.query_time = g.get('query_time', 0.0) + seconds
+    if slow_query_log.record(sql, params, seconds, endpoint):
+        slow_queries_total.inc(endpoint or 'none')
+
+
+def get_db_connection():
+    """Return this request's pooled connection, checking one out on first use"""
+    if 'db_connection' not in g:
+        # Past the cap, answer 503 straight away instead of queueing on the pool
+        if not admission.try_enter():
+            raise ServiceUnavailable('Jharkhand Tourism is very busy right now. Please try again in a moment.',
+                                     retry_after=current_app.config['ADMISSION_RETRY_AFTER'])
+        started = time.perf_counter()
+        try:
+            connection = db_pool.acquire()
+        except Error as e:
+            admission.leave()
+            print(f"Error connecting to MySQL: {e}")
+            return None
+        finally:
+            pool_acquire_time.observe(time.perf_counter() - started)
+        g.db_connection = InstrumentedConnection(connection, record_query)
+    return g.db_connection
+
+
+def release_db_connection(exc):
+    """Hand the request's connection back to the pool, rolling back on errors"""
+    connection = g.pop('db_connection', None)
+    if connection is not None:
+        db_pool.release(connection.raw, rollback=exc is not None)
+        admission.leave()
+
+
+@contextmanager
+def index_connection():
+    """A connection for loading an in-memory index"""
+    # Inside a request, reuse its connection rather than taking a second pool slot
+    in_request = has_app_context() and get_db_connection() is not None
+    connection = get_db_connection() if in_request else db_pool.acquire()
+    try:
+        yield connection
+    finally:
+        if not in_request:
+            db_pool.release(connection)
+
+
+def fetch_changed_rows(all_statement, since_statement, since, *params):
+    """Rows for an in-memory index: every row, or those changed since a DB timestamp, plus the DB clock"""
+    with index_connection() as connection:
+        now = repo.one(connection, 'db_now').now
+        if since is None:
+            return repo.all(connection, all_statement, *params), now
+        return repo.all(connection, since_statement, since), now
+
+
+def fetch_availability_bookings(since):
+    """Bookings for the availability index: all live ones, or those changed since a DB timestamp"""
+    return fetch_changed_rows('availability_all', 'availability_since', since, HISTORY_DAYS)
+
+
+def fetch_recommender_guides(since):
+    """Guide profiles for the recommender: all of them, or those changed since a DB timestamp"""
+    return fetch_changed_rows('recommender_guides_all', 'recommender_guides_since', since)
+
+
+def fetch_places():
+    """Districts and places with their coordinates, for the proximity index"""
+    with index_connection() as connection:
+        return repo.all(connection, 'districts_all'), repo.all(connection, 'places_all')
+
+
+def refresh_guide_recommendation(connection, guide_id):
+    """Re-read a guide's committed profile into the recommender"""
+    try:
+        guide = repo.one(connection, 'guide_for_booking', guide_id)
+    except Error as e:
+        print(f"Error refreshing guide recommendation: {e}")
+        recommender.invalidate()
+        return
+    if guide:
+        recommender.update(guide)
+
+
+def invalidate_content_cache():
+    content_cache.bump(CONTENT_CACHE_NAMESPACE)
+
+
+def store_image_variants(upload_id, image_path, metadata):
+    """Record processed image variants; runs on an image pipeline worker thread"""
+    connection = db_pool.acquire()
+    try:
+        # Match on image_path too, in case the image was replaced meanwhile
+        repo.run(connection, 'store_image_variants',
+                 metadata['width'], metadata['height'], json.dumps(metadata), upload_id, image_path)
+        connection.commit()
+    finally:
+        db_pool.release(connection)
+    invalidate_content_cache()
+
+
+def parse_image_variants(rows):
+    """Decode the image_variants JSON column of guide_uploads rows in place"""
+    for row in rows:
+        if row and row.get('image_variants'):
+            try:
+                row['image_variants'] = json.loads(row['image_variants'])
+            except (TypeError, ValueError):
+                row['image_variants'] = None
+    return rows
+
+
+def require_user_type(user_type):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if 'user_id' not in session:
+                flash('Please login to access this page.')
+                return redirect(url_for('auth.login'))
+
+            if session.get('user_type') != user_type:
+                flash(f'Access denied. This page is only for {user_type}s.')
+                return redirect(url_for('auth.login'))
+
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+def rate_limited(rule, username_field=None):
+    """Throttle POSTs to a view per client IP and per username (a form field, else the session's)"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method == 'POST':
+                username = request.form.get(username_field) if username_field else session.get('username')
+                limited = rate_limiter.check(rule, request.remote_addr, username)
+                if limited:
+                    key, retry_after = limited
+                    rate_limited_total.inc(rule, key)
+                    raise TooManyRequests('Too many attempts. Please wait a little and try again.',
+                                          retry_after=math.ceil(retry_after))
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+def encode_cursor(values):
+    """Opaque keyset-pagination cursor for the last row of a page"""
+    payload = json.dumps([str(v) if isinstance(v, Decimal) else v.isoformat() if isinstance(v, datetime) else v
+                          for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; returns None for a missing or malformed cursor"""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        return None
+    return values if isinstance(values, list) else None
+
+
+# Keyset position before every row of a newest-first (timestamp, id) listing:
+# the dashboard bookings, the content feed and guide reviews all start here
+NEWEST_FIRST = (datetime(9999, 12, 31), 2 ** 31 - 1)
+BOOKINGS_PAGE_SIZE = 20  # bookings per dashboard page
+
+
+def bookings_page_position():
+    """(created_at, id) after which the dashboard's ?bookings_cursor= page starts; the newest page if absent"""
+    values = decode_cursor(request.args.get('bookings_cursor'))
+    try:
+        return datetime.fromisoformat(values[0]), int(values[1])
+    except (TypeError, ValueError, IndexError):
+        return NEWEST_FIRST
+
+
+def split_bookings_page(rows, limit):
+    """(bookings, cursor of the next page or None) from a page fetched with one extra row"""
+    bookings = rows[:limit]
+    if len(rows) <= limit:
+        return bookings, None
+    return bookings, encode_cursor([bookings[-1]['created_at'], bookings[-1]['id']])
+
+
+def parse_date_arg(name):
+    """A YYYY-MM-DD query argument as a date, or None if missing or malformed"""
+    try:
+        return datetime.strptime(request.args.get(name, ''), '%Y-%m-%d').date()
+    except ValueError:
+        return None
@@ -0,0 +1,45 @@
+"""Fragment caching for Jinja templates
+
+    {% cache 'content_card', content.id, content.updated_at %}
+        ...expensive markup...
+    {% endcache %}
+
+The block is rendered once per distinct key and the HTML reused after that.
+Keys should carry a version of everything the fragment shows (typically an
+updated_at column), so an edit produces a new key instead of needing an
+invalidation; superseded fragments age out of the LRU. The template name is
+added to every key, so two templates can use the same key names.
+
+Rendered fragments live in a cache.ResultCache set as
+environment.fragment_cache; with none set, blocks simply render every time.
+Nothing request-specific (the session, CSRF tokens, flashed messages) may be
+rendered inside a cached block.
+"""
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+FRAGMENT_NAMESPACE = 'template_fragments'
+
+
+class FragmentCacheExtension(Extension):
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=None)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        key = nodes.Tuple([nodes.Const(parser.name)] + parts, 'load')
+        return nodes.CallBlock(self.call_method('_render', [key]), [], [], body).set_lineno(lineno)
+
+    def _render(self, key, caller):
+        cache = self.environment.fragment_cache
+        if cache is None:
+            return caller()
+        return Markup(cache.get_or_load(FRAGMENT_NAMESPACE, key, lambda: str(caller())))
@@ -0,0 +1,166 @@
+"""Jharkhand districts and places, and the distances between them, precomputed
+
+The districts and places tables hold coordinates for every district
+headquarters and for well-known places (falls, temples, parks), and are the
+one source of district and place names for the app. On load, ProximityIndex
+works out once, for every place (and every district, by name), all districts
+sorted by how far their nearest known point is, 0 km for the place's own
+district. "Which districts are within N km of Netarhat" is then a dictionary
+lookup and a bisect, with no distance worked out per request.
+
+It also resolves free text to districts: district_of() matches a guide's
+location to a district, and districts_in() finds the districts a tourist's
+"specific places" mention, by district, headquarters or place name ("Hundru
+Falls" or just "hundru").
+
+fetch_places() must return (districts, places): district rows with name,
+headquarters, latitude and longitude, and place rows with name, district,
+latitude and longitude. The data rarely changes, so it is reloaded only
+every reload_interval seconds.
+"""
+import math
+import re
+import threading
+import time
+from bisect import bisect_right
+
+EARTH_RADIUS_KM = 6371.0
+
+# Trailing words a tourist often leaves out of a place name ("hundru" for Hundru Falls)
+GENERIC_PLACE_WORDS = ('falls', 'dam', 'lake', 'temple', 'mandir', 'hill', 'hills', 'pahar', 'park',
+                       'national park', 'wildlife sanctuary', 'forest', 'fort', 'valley', 'dham')
+MIN_SHORT_NAME = 4  # shorter leftovers ("ho") would match inside unrelated words
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between two (latitude, longitude) points"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def place_key(name):
+    """Lookup key for a place or district name: lower case, without a trailing 'district'"""
+    name = re.sub(r'\s+', ' ', (name or '').strip().lower())
+    return re.sub(r' district$', '', name)
+
+
+def short_names(key):
+    """A place key and, without a trailing generic word, its short form"""
+    names = {key}
+    for word in GENERIC_PLACE_WORDS:
+        if key.endswith(' ' + word) and len(key) - len(word) - 1 >= MIN_SHORT_NAME:
+            names.add(key[:-len(word) - 1])
+    return names
+
+
+class ProximityIndex:
+    """Nearest districts to every known place, for "guides within N km" queries"""
+
+    def __init__(self, fetch_places, reload_interval=3600):
+        self.fetch_places = fetch_places
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._districts = []   # district names, in table order
+        self._district_keys = {}  # place key of a district name -> the name
+        self._places = {}      # place key -> {'name', 'district', 'latitude', 'longitude'}
+        self._nearby = {}      # place key -> ([km, ...], [district index, ...]) sorted by km
+        self._mentions = None  # (regex of every district, headquarters and place name, name -> district)
+
+    def _load(self):
+        districts, places = self.fetch_places()
+        names = [row['name'] for row in districts]
+        index = {name: i for i, name in enumerate(names)}
+
+        # Every known point of each district: its headquarters and its places
+        points = [[(float(row['latitude']), float(row['longitude']))] for row in districts]
+        entries = {}
+        for row in districts:
+            entries[place_key(row['name'])] = {'name': row['name'], 'district': row['name'],
+                                               'latitude': float(row['latitude']),
+                                               'longitude': float(row['longitude'])}
+        for row in places:
+            if row['district'] not in index:
+                continue
+            point = (float(row['latitude']), float(row['longitude']))
+            points[index[row['district']]].append(point)
+            entries[place_key(row['name'])] = {'name': row['name'], 'district': row['district'],
+                                               'latitude': point[0], 'longitude': point[1]}
+
+        def distance_to(point, district):
+            return min(haversine_km(*point, *other) for other in points[district])
+
+        nearby = {}
+        mentioned = {}
+        for row in districts:
+            for name in (row['name'], row.get('headquarters')):
+                if name:
+                    mentioned[place_key(name)] = row['name']
+        for key, entry in entries.items():
+            for name in short_names(key):
+                mentioned.setdefault(name, entry['district'])
+            own = index[entry['district']]
+            point = (entry['latitude'], entry['longitude'])
+            ranked = sorted((0.0 if i == own else distance_to(point, i), i) for i in range(len(names)))
+            nearby[key] = ([km for km, _ in ranked], [i for _, i in ranked])
+
+        # Longest names first, so "east singhbhum" wins over a shorter overlapping name
+        alternatives = '|'.join(re.escape(name) for name in sorted(mentioned, key=len, reverse=True))
+        self._mentions = (re.compile(rf'\b(?:{alternatives})\b'), mentioned) if mentioned else None
+        self._districts, self._places, self._nearby = names, entries, nearby
+        self._district_keys = {place_key(name): name for name in names}
+        self._loaded_at = time.monotonic()
+
+    def refresh(self):
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.reload_interval:
+                self._load()
+
+    def invalidate(self):
+        """Reload on next use (after editing the districts or places tables)"""
+        with self._lock:
+            self._loaded_at = None
+
+    def place(self, name):
+        """The known place or district called name, or None"""
+        self.refresh()
+        return self._places.get(place_key(name))
+
+    def places(self):
+        """Names of every known place and district, sorted"""
+        self.refresh()
+        return sorted(entry['name'] for entry in self._places.values())
+
+    def within(self, name, km):
+        """[(district, km)] for districts within km of a place, nearest first; None for an unknown place"""
+        self.refresh()
+        ranked = self._nearby.get(place_key(name))
+        if ranked is None:
+            return None
+        distances, districts = ranked
+        count = bisect_right(distances, km)
+        return [(self._districts[districts[i]], round(distances[i], 1)) for i in range(count)]
+
+    def districts(self):
+        """Every district name, in table order"""
+        self.refresh()
+        return list(self._districts)
+
+    def district_of(self, location):
+        """The district a guide's free-text location names, or None (all of Jharkhand, or unknown)"""
+        self.refresh()
+        return self._district_keys.get(place_key(location))
+
+    def districts_in(self, text):
+        """Names of the districts a free-text list of places mentions"""
+        self.refresh()
+        mentions = self._mentions
+        if not text or mentions is None:
+            return set()
+        pattern, districts = mentions
+        return {districts[name] for name in pattern.findall(text.lower())}
+
+    def stats(self):
+        with self._lock:
+            return {'districts': len(self._districts), 'places': len(self._places)}
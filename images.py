@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it uploads keep serving the original file
+    Image = None
+
+# Variant name -> target width in pixels (never upscaled past the original)
+IMAGE_VARIANTS = {'thumb': 320, 'card': 640, 'full': 1600}
+
+# Output format -> (Pillow format, save options)
+VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+VARIANTS_SUBDIR = 'variants'
+
+
+def variant_path(image_path, variant, fmt):
+    """Static-relative path of one variant, e.g. uploads/variants/x_card.webp"""
+    folder, filename = os.path.split(image_path)
+    stem = os.path.splitext(filename)[0]
+    return f"{folder}/{VARIANTS_SUBDIR}/{stem}_{variant}.{fmt}"
+
+
+class ImagePipeline:
+    """Builds resized WebP/JPEG variants of uploaded images on a worker pool
+
+    submit() returns immediately; when the variants are written, on_processed
+    is called from the worker thread with (upload_id, image_path, metadata),
+    where metadata holds the original dimensions and every variant's paths and
+    dimensions. Until then (or if Pillow is missing) pages use the original.
+    """
+
+    def __init__(self, static_folder, max_workers=2, on_processed=None):
+        self.static_folder = static_folder
+        self.max_workers = max_workers
+        self.on_processed = on_processed
+        self._executor = None
+
+    @property
+    def enabled(self):
+        return Image is not None
+
+    def submit(self, upload_id, image_path):
+        if not self.enabled or not image_path:
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='image-pipeline')
+        return self._executor.submit(self._process, upload_id, image_path)
+
+    def _process(self, upload_id, image_path):
+        try:
+            metadata = self.build_variants(image_path)
+            if self.on_processed:
+                self.on_processed(upload_id, image_path, metadata)
+            return metadata
+        except Exception as e:
+            print(f"Error processing image {image_path} for upload {upload_id}: {e}")
+            return None
+
+    def build_variants(self, image_path):
+        """Write every variant of a static-relative image and describe them"""
+        source = os.path.join(self.static_folder, image_path)
+        os.makedirs(os.path.join(os.path.dirname(source), VARIANTS_SUBDIR), exist_ok=True)
+
+        with Image.open(source) as original:
+            # Apply the camera's EXIF rotation so variants display upright
+            image = ImageOps.exif_transpose(original)
+            image.load()
+        width, height = image.size
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        variants = {}
+        for name, target_width in IMAGE_VARIANTS.items():
+            variant_width = min(target_width, width)
+            variant_height = max(round(height * variant_width / width), 1)
+            resized = image if variant_width == width else image.resize(
+                (variant_width, variant_height), Image.LANCZOS)
+
+            variants[name] = {'width': variant_width, 'height': variant_height}
+            for fmt, (pil_format, options) in VARIANT_FORMATS.items():
+                output = resized
+                if pil_format == 'JPEG' and output.mode == 'RGBA':
+                    # JPEG has no alpha channel; flatten onto white
+                    background = Image.new('RGB', output.size, (255, 255, 255))
+                    background.paste(output, mask=output.split()[-1])
+                    output = background
+                path = variant_path(image_path, name, fmt)
+                output.save(os.path.join(self.static_folder, path), pil_format, **options)
+                variants[name][fmt] = path
+
+        return {'width': width, 'height': height, 'variants': variants}
+
+    def remove_variants(self, image_path):
+        """Delete the variant files of an image (the original is left alone)"""
+        if not image_path:
+            return
+        for name in IMAGE_VARIANTS:
+            for fmt in VARIANT_FORMATS:
+                path = os.path.join(self.static_folder, variant_path(image_path, name, fmt))
+                if os.path.exists(path):
+                    try:
+                        os.remove(path)
+                    except OSError as e:
+                        print(f"Warning: Could not delete image variant {path}: {e}")
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -0,0 +1,189 @@
+"""Low-overhead request, query and template metrics in Prometheus text format
+
+Metrics are plain in-process counters and fixed-bucket histograms guarded by
+a lock; observing a value is a bisect and two additions, so instrumentation
+can stay on in production. Each worker process exposes its own numbers at
+/metrics; Prometheus sums them across workers.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+# Seconds; spans a cached page (~1ms) up to a request stuck behind the pool timeout
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_labels(self.labelnames, labels)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = [(labels, list(series)) for labels, series in sorted(self._series.items())]
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {series[-1]:.6f}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric plus callbacks that report gauges at scrape time"""
+
+    def __init__(self):
+        self._metrics = []
+        self._gauge_collectors = {}
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def gauges(self, prefix, documentation, collect):
+        """Report every numeric value of collect() as gauge <prefix>_<key>; replaces an earlier collect for prefix"""
+        self._gauge_collectors[prefix] = (documentation, collect)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for prefix, (documentation, collect) in self._gauge_collectors.items():
+            for key, value in collect().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f'{prefix}_{key}'
+                lines.extend([f'# HELP {name} {documentation} ({key})', f'# TYPE {name} gauge',
+                              f'{name} {value}'])
+        return '\n'.join(lines) + '\n'
+
+
+class SlowQueryLog:
+    """Keeps the most recent queries slower than the threshold
+
+    Only the SQL text and the number of bind parameters are kept: the values
+    can be passwords or personal details, and the log is shown to admins and
+    printed to the server log.
+    """
+
+    def __init__(self, threshold, max_entries=100):
+        self.threshold = threshold
+        self._entries = deque(maxlen=max_entries)
+
+    def record(self, sql, params, seconds, endpoint=None):
+        if seconds < self.threshold:
+            return False
+        statement = ' '.join(sql.split())
+        param_count = len(params) if isinstance(params, (list, tuple, dict)) else 0
+        self._entries.append({'time': time.time(), 'seconds': round(seconds, 6), 'endpoint': endpoint,
+                              'sql': statement, 'param_count': param_count})
+        print(f"Slow query ({seconds * 1000:.1f} ms, {endpoint}): {statement} [{param_count} parameter(s)]")
+        return True
+
+    def entries(self):
+        return list(reversed(self._entries))
+
+
+def statement_type(sql):
+    """First keyword of a statement (SELECT, INSERT, ...), for low-cardinality labels"""
+    keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+    return keyword if keyword in ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE') else 'OTHER'
+
+
+class InstrumentedCursor:
+    """Cursor proxy that reports the duration of every execute()"""
+
+    def __init__(self, cursor, on_query):
+        self._cursor = cursor
+        self._on_query = on_query
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            self._on_query(operation, params, time.perf_counter() - started)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            self._on_query(operation, seq_params, time.perf_counter() - started)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors are InstrumentedCursors; `raw` is the
+    underlying connection, which is what goes back to the pool"""
+
+    def __init__(self, connection, on_query):
+        self.raw = connection
+        self._on_query = on_query
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self.raw.cursor(*args, **kwargs), self._on_query)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
@@ -0,0 +1,145 @@
+"""Versioned schema migrations for the Jharkhand Tourism database
+
+Migrations live in database/migrations as NNNN_description.sql and are applied
+in version order; applied versions are recorded in schema_migrations.
+
+    python migrate.py            # apply pending migrations
+    python migrate.py --status   # list applied and pending migrations
+
+MySQL commits DDL implicitly, so a migration cannot be rolled back half way.
+Instead every statement is safe to re-run: errors meaning "this change is
+already there" (table/column/index exists, index already dropped) are skipped,
+so an interrupted run can simply be repeated.
+"""
+import hashlib
+import os
+import re
+import sys
+
+import mysql.connector
+from mysql.connector import Error, errorcode
+
+from config import Config
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database', 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+LOCK_NAME = 'jharkhand_tourism_schema_migrations'
+LOCK_TIMEOUT = 30  # seconds to wait for another migration run to finish
+
+ALREADY_APPLIED_ERRORS = {
+    errorcode.ER_TABLE_EXISTS_ERROR,       # CREATE TABLE
+    errorcode.ER_DUP_FIELDNAME,            # ADD COLUMN
+    errorcode.ER_DUP_KEYNAME,              # CREATE INDEX / ADD INDEX
+    errorcode.ER_CANT_DROP_FIELD_OR_KEY,   # DROP INDEX / DROP COLUMN
+}
+
+
+class Migration:
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+        with open(path, encoding='utf-8') as f:
+            self.sql = f.read()
+        self.checksum = hashlib.sha256(self.sql.encode('utf-8')).hexdigest()
+
+    def statements(self):
+        """SQL statements in the file, with -- comments stripped"""
+        lines = [line for line in self.sql.splitlines() if not line.strip().startswith('--')]
+        return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise SystemExit(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+def connect(config=Config):
+    return mysql.connector.connect(
+        host=config.MYSQL_HOST,
+        user=config.MYSQL_USER,
+        password=config.MYSQL_PASSWORD,
+        database=config.MYSQL_DB,
+        charset=config.MYSQL_CHARSET,
+        auth_plugin=config.MYSQL_AUTH_PLUGIN
+    )
+
+
+def applied_migrations(cursor):
+    """{version: checksum} for every migration already recorded"""
+    cursor.execute("""CREATE TABLE IF NOT EXISTS schema_migrations (
+                        version INT PRIMARY KEY,
+                        name VARCHAR(200) NOT NULL,
+                        checksum CHAR(64) NOT NULL,
+                        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )""")
+    cursor.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cursor.fetchall())
+
+
+def apply_migration(connection, cursor, migration):
+    for statement in migration.statements():
+        try:
+            cursor.execute(statement)
+        except Error as e:
+            if e.errno not in ALREADY_APPLIED_ERRORS:
+                raise
+            print(f"  already applied, skipping: {statement.splitlines()[0]}")
+    cursor.execute("INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                   (migration.version, migration.name, migration.checksum))
+    connection.commit()
+
+
+def migrate(connection, migrations, status_only=False):
+    cursor = connection.cursor()
+    try:
+        # Serialise concurrent runs (e.g. several workers deploying at once)
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, LOCK_TIMEOUT))
+        if cursor.fetchone()[0] != 1:
+            raise SystemExit("Another migration run holds the schema lock; try again later")
+
+        applied = applied_migrations(cursor)
+        pending = [m for m in migrations if m.version not in applied]
+
+        for migration in migrations:
+            if migration.version in applied:
+                state = 'applied'
+                if applied[migration.version] != migration.checksum:
+                    state = 'applied (file changed since it was applied!)'
+            else:
+                state = 'pending'
+            print(f"{migration.version:04d} {migration.name}: {state}")
+
+        if status_only:
+            return pending
+
+        for migration in pending:
+            print(f"Applying {migration.version:04d} {migration.name}...")
+            apply_migration(connection, cursor, migration)
+        print(f"{len(pending)} migration(s) applied")
+        return pending
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+        cursor.fetchall()
+        cursor.close()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    connection = connect()
+    try:
+        migrate(connection, load_migrations(), status_only='--status' in argv)
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
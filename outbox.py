@@ -0,0 +1,328 @@
+"""Transactional outbox for booking notifications, and the worker that drains it
+
+The booking routes never talk to a mail server. They add rows to
+notification_outbox with enqueue_messages(), using the same cursor and
+transaction as the booking write, so a notification exists exactly when the
+booking change was committed. A separate worker process delivers them:
+
+    python outbox.py          # poll forever
+    python outbox.py --once   # deliver what is due and exit
+
+The worker claims a batch by stamping it with a random token and pushing
+next_attempt_at forward by OUTBOX_LEASE seconds, then sends outside any
+transaction. A message that was sent is marked sent; one that failed is
+retried with exponential backoff until OUTBOX_MAX_ATTEMPTS, then marked
+failed. If a worker dies mid-batch, its lease runs out and the batch is
+picked up again, so delivery is at-least-once. Several workers can run side
+by side; the claiming UPDATE only takes rows that nobody else holds.
+
+Messages go to a pluggable sender (OUTBOX_SENDER):
+  file - writes each message as an .eml file under OUTBOX_FILE_DIR (default)
+  smtp - sends through SMTP_HOST:SMTP_PORT; for local testing run a debug
+         server with `python -m aiosmtpd -n -l localhost:1025`
+"""
+import argparse
+import os
+import random
+import smtplib
+import time
+import uuid
+from email.message import EmailMessage
+
+from mysql.connector import Error
+
+from config import Config
+from migrate import connect
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MAX_ERROR_LENGTH = 500
+
+MESSAGE_COLUMNS = ('event_type', 'booking_id', 'recipient_name', 'recipient_email',
+                   'recipient_phone', 'subject', 'body')
+
+STATUS_SUBJECTS = {
+    'confirmed': 'Your Jharkhand tour booking #{id} is confirmed',
+    'cancelled': 'Your Jharkhand tour booking #{id} was cancelled',
+    'completed': 'Thank you for touring Jharkhand (booking #{id})',
+}
+STATUS_TEXT = {
+    'confirmed': 'Your guide {guide} has confirmed your tour from {arrival} to {departure}. '
+                 'They will contact you before you arrive.',
+    'cancelled': 'Your guide {guide} has cancelled the tour planned from {arrival} to {departure}. '
+                 'You can book another guide from your dashboard.',
+    'completed': 'Your guide {guide} has marked your tour as completed. We hope you enjoyed Jharkhand!',
+}
+
+
+class UndeliverableError(Exception):
+    """The message can never be delivered (no address, rejected recipient); do not retry"""
+
+
+def message(event_type, booking_id, name, email, phone, subject, body):
+    return {'event_type': event_type, 'booking_id': booking_id, 'recipient_name': name,
+            'recipient_email': email or None, 'recipient_phone': phone or None,
+            'subject': subject, 'body': body}
+
+
+def booking_requested_messages(booking_id, booking, guide):
+    """Notifications for a new booking: a receipt for the tourist and a request for the guide"""
+    dates = f"{booking['arrival_date']} to {booking['departure_date']}"
+    return [
+        message('booking_requested', booking_id, booking['tourist_name'], booking['email'], booking['phone'],
+                f'Jharkhand tour booking #{booking_id} received',
+                f"Hello {booking['tourist_name']},\n\n"
+                f"Your request to tour with {guide['full_name']} from {dates} "
+                f"({booking['days_to_stay']} day(s), {booking['group_size']} guest(s)) has been sent. "
+                "Your guide will contact you within 24 hours.\n\nJharkhand Tourism"),
+        message('booking_received', booking_id, guide['full_name'], guide['email'], guide['phone'],
+                f'New booking request #{booking_id} from {booking["tourist_name"]}',
+                f"Hello {guide['full_name']},\n\n"
+                f"{booking['tourist_name']} from {booking['native_place']} would like to tour with you "
+                f"from {dates} with {booking['group_size']} guest(s).\n"
+                f"Phone: {booking['phone']}\n"
+                "Please confirm or cancel the request from your guide dashboard within 24 hours.\n\n"
+                "Jharkhand Tourism"),
+    ]
+
+
+def booking_status_message(booking, status, guide_name):
+    """Notification telling the tourist their booking changed status, or None for no message"""
+    if status not in STATUS_SUBJECTS:
+        return None
+    text = STATUS_TEXT[status].format(guide=guide_name, arrival=booking['arrival_date'],
+                                      departure=booking['departure_date'])
+    return message(f'booking_{status}', booking['id'], booking['tourist_name'], booking['email'],
+                   booking['phone'], STATUS_SUBJECTS[status].format(id=booking['id']),
+                   f"Hello {booking['tourist_name']},\n\n{text}\n\nJharkhand Tourism")
+
+
+def enqueue_messages(cursor, messages):
+    """Add messages to the outbox inside the caller's transaction"""
+    rows = [tuple(m[column] for column in MESSAGE_COLUMNS) for m in messages
+            if m and (m['recipient_email'] or m['recipient_phone'])]
+    if rows:
+        cursor.executemany(f"""INSERT INTO notification_outbox ({', '.join(MESSAGE_COLUMNS)})
+                              VALUES ({', '.join(['%s'] * len(MESSAGE_COLUMNS))})""", rows)
+    return len(rows)
+
+
+def outbox_stats(cursor):
+    """Message counts by status, plus how many pending ones are already due"""
+    cursor.execute("""SELECT status, COUNT(*) as total, SUM(next_attempt_at <= NOW()) as due,
+                             MIN(created_at) as oldest
+                      FROM notification_outbox GROUP BY status""")
+    stats = {}
+    for row in cursor.fetchall():
+        stats[row['status']] = {'total': row['total'], 'due': int(row['due'] or 0),
+                                'oldest': row['oldest'].isoformat() if row['oldest'] else None}
+    return stats
+
+
+class FileSender:
+    """Writes every message to an .eml file; the default for development and tests"""
+
+    def __init__(self, directory, sender_address):
+        self.directory = directory
+        self.sender_address = sender_address
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, row):
+        mail = build_email(row, self.sender_address)
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%d_%H%M%S')}_{row['id']}.eml")
+        with open(path, 'wb') as f:
+            f.write(bytes(mail))
+
+
+class SmtpSender:
+    """Sends messages through an SMTP server, reusing one connection per batch"""
+
+    def __init__(self, host, port, sender_address, username=None, password=None, use_tls=False, timeout=10):
+        self.host = host
+        self.port = port
+        self.sender_address = sender_address
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._smtp = None
+
+    def _connect(self):
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            self._smtp = smtp
+        return self._smtp
+
+    def send(self, row):
+        if not row['recipient_email']:
+            raise UndeliverableError('no email address (SMS is not configured)')
+        try:
+            self._connect().send_message(build_email(row, self.sender_address))
+        except smtplib.SMTPRecipientsRefused as e:
+            raise UndeliverableError(f'recipient refused: {e.recipients}') from e
+        except (smtplib.SMTPException, OSError):
+            # Drop the connection so the next message reconnects
+            self.close()
+            raise
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+def build_email(row, sender_address):
+    mail = EmailMessage()
+    mail['From'] = sender_address
+    mail['To'] = (f"{row['recipient_name']} <{row['recipient_email']}>" if row['recipient_email']
+                  else f"{row['recipient_name']} (phone {row['recipient_phone']})")
+    mail['Subject'] = row['subject']
+    mail['X-Outbox-Id'] = str(row['id'])
+    mail['X-Outbox-Event'] = row['event_type']
+    mail.set_content(row['body'])
+    return mail
+
+
+def make_sender(config=Config):
+    if config.OUTBOX_SENDER == 'smtp':
+        return SmtpSender(config.SMTP_HOST, config.SMTP_PORT, config.MAIL_FROM, config.SMTP_USERNAME,
+                          config.SMTP_PASSWORD, config.SMTP_USE_TLS)
+    if config.OUTBOX_SENDER == 'file':
+        return FileSender(os.path.join(ROOT, config.OUTBOX_FILE_DIR), config.MAIL_FROM)
+    raise ValueError(f'Unknown OUTBOX_SENDER: {config.OUTBOX_SENDER}')
+
+
+class OutboxWorker:
+    def __init__(self, connection, sender, batch_size=50, max_attempts=8, retry_base=30,
+                 retry_max=3600, lease=300):
+        self.connection = connection
+        self.sender = sender
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease = lease
+
+    def retry_delay(self, attempts):
+        """Seconds before the next attempt: exponential, capped, with jitter"""
+        delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+        return int(delay * random.uniform(0.75, 1.0)) + 1
+
+    def claim(self):
+        """Take up to batch_size due messages; they stay claimed for `lease` seconds"""
+        token = uuid.uuid4().hex
+        cursor = self.connection.cursor(dictionary=True)
+        try:
+            cursor.execute("""UPDATE notification_outbox
+                              SET claim_token = %s, attempts = attempts + 1,
+                                  next_attempt_at = NOW() + INTERVAL %s SECOND
+                              WHERE status = 'pending' AND next_attempt_at <= NOW()
+                              ORDER BY next_attempt_at, id LIMIT %s""",
+                           (token, self.lease, self.batch_size))
+            self.connection.commit()
+            if cursor.rowcount == 0:
+                return []
+            cursor.execute(f"""SELECT id, attempts, {', '.join(MESSAGE_COLUMNS)}
+                              FROM notification_outbox WHERE claim_token = %s ORDER BY id""", (token,))
+            rows = cursor.fetchall()
+            self.connection.commit()
+            return rows
+        finally:
+            cursor.close()
+
+    def deliver(self, rows):
+        """Send claimed messages and record the outcome; returns (sent, retrying, failed)"""
+        sent, retries, failures = [], [], []
+        for row in rows:
+            try:
+                self.sender.send(row)
+                sent.append(row['id'])
+            except UndeliverableError as e:
+                failures.append((str(e)[:MAX_ERROR_LENGTH], row['id']))
+            except Exception as e:
+                error = f'{type(e).__name__}: {e}'[:MAX_ERROR_LENGTH]
+                if row['attempts'] >= self.max_attempts:
+                    failures.append((error, row['id']))
+                else:
+                    retries.append((self.retry_delay(row['attempts']), error, row['id']))
+        close = getattr(self.sender, 'close', None)
+        if close:
+            close()
+
+        cursor = self.connection.cursor()
+        try:
+            if sent:
+                cursor.execute(f"""UPDATE notification_outbox
+                                  SET status = 'sent', sent_at = NOW(), last_error = NULL, claim_token = NULL
+                                  WHERE id IN ({', '.join(['%s'] * len(sent))})""", sent)
+            if retries:
+                cursor.executemany("""UPDATE notification_outbox
+                                      SET next_attempt_at = NOW() + INTERVAL %s SECOND, last_error = %s,
+                                          claim_token = NULL
+                                      WHERE id = %s""", retries)
+            if failures:
+                cursor.executemany("""UPDATE notification_outbox
+                                      SET status = 'failed', last_error = %s, claim_token = NULL
+                                      WHERE id = %s""", failures)
+            self.connection.commit()
+        finally:
+            cursor.close()
+        return len(sent), len(retries), len(failures)
+
+    def run_once(self):
+        """Deliver batches until nothing is due; returns the number of messages handled"""
+        handled = 0
+        while True:
+            rows = self.claim()
+            if not rows:
+                return handled
+            sent, retrying, failed = self.deliver(rows)
+            handled += len(rows)
+            print(f"Outbox: {sent} sent, {retrying} to retry, {failed} failed")
+
+    def run(self, poll_interval, reconnect_max=300):
+        """Poll forever; database errors and failed reconnects are logged and retried with backoff"""
+        failures = 0
+        while True:
+            try:
+                if failures:
+                    self.connection.reconnect(attempts=1, delay=0)
+                self.run_once()
+                failures = 0
+            except Error as e:
+                failures += 1
+                delay = min(poll_interval * 2 ** (failures - 1), reconnect_max) * random.uniform(0.75, 1.0)
+                print(f"Outbox worker database error ({failures} in a row), retrying in {delay:.0f}s: {e}")
+                time.sleep(delay)
+                continue
+            time.sleep(poll_interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Deliver queued booking notifications')
+    parser.add_argument('--once', action='store_true', help='deliver what is due, then exit')
+    args = parser.parse_args(argv)
+
+    connection = connect()
+    worker = OutboxWorker(connection, make_sender(), Config.OUTBOX_BATCH_SIZE, Config.OUTBOX_MAX_ATTEMPTS,
+                          Config.OUTBOX_RETRY_BASE, Config.OUTBOX_RETRY_MAX, Config.OUTBOX_LEASE)
+    try:
+        if args.once:
+            print(f"Outbox: handled {worker.run_once()} message(s)")
+        else:
+            print(f"Outbox worker polling every {Config.OUTBOX_POLL_INTERVAL}s")
+            worker.run(Config.OUTBOX_POLL_INTERVAL, Config.OUTBOX_RECONNECT_MAX)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Per-client rate limits and a concurrency cap, in process
+
+Login, registration and booking are throttled per client IP and per username
+with token buckets: a bucket holds up to `requests` tokens, refilled evenly
+over `period` seconds, and each request takes one. Buckets live in
+TokenBuckets, a dictionary split into lock-striped shards so concurrent
+requests for different clients rarely contend. A bucket that has refilled
+is the same as no bucket, so buckets are dropped once full again and idle
+clients cost no memory.
+
+AdmissionGate caps how many requests of a worker hold a database connection
+at once. A request over the cap is turned away straight away (the caller
+answers 503) instead of queueing on the pool, so a burst or retry storm
+cannot pile up behind a slow database and exhaust MySQL's connections.
+
+Limits are per worker process, like the rest of the in-process state.
+"""
+import threading
+import time
+
+SWEEP_EVERY = 1024  # operations on a shard between sweeps of its full buckets
+
+
+class TokenBuckets:
+    """Token buckets keyed by string, sharded across lock-striped dictionaries"""
+
+    def __init__(self, shards=16):
+        self._shards = [(threading.Lock(), {}) for _ in range(shards)]
+        self._operations = [0] * shards
+        self._stats_lock = threading.Lock()
+        self._allowed = 0
+        self._limited = 0
+        self._expired = 0
+
+    def take(self, key, requests, period):
+        """Take a token from key's bucket; 0 if allowed, else seconds until a token is due"""
+        rate = requests / period
+        shard = hash(key) % len(self._shards)
+        lock, buckets = self._shards[shard]
+        now = time.monotonic()
+        with lock:
+            tokens, updated, _ = buckets.get(key, (requests, now, now))
+            tokens = min(requests, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            # Kept until it would have refilled completely
+            buckets[key] = (tokens, now, now + (requests - tokens) / rate)
+            self._operations[shard] += 1
+            if self._operations[shard] % SWEEP_EVERY == 0:
+                expired = self._sweep(buckets, now)
+            else:
+                expired = 0
+
+        with self._stats_lock:
+            self._expired += expired
+            if allowed:
+                self._allowed += 1
+            else:
+                self._limited += 1
+        return 0 if allowed else (1 - tokens) / rate
+
+    @staticmethod
+    def _sweep(buckets, now):
+        full = [key for key, (_, _, expires) in buckets.items() if expires <= now]
+        for key in full:
+            del buckets[key]
+        return len(full)
+
+    def stats(self):
+        keys = 0
+        for lock, buckets in self._shards:
+            with lock:
+                keys += len(buckets)
+        with self._stats_lock:
+            return {'shards': len(self._shards), 'keys': keys, 'allowed': self._allowed,
+                    'limited': self._limited, 'expired': self._expired}
+
+
+class RateLimiter:
+    """Named rules of per-IP and per-username limits over one TokenBuckets store
+
+    rules maps a rule name to {'ip': (requests, period), 'username': (requests, period)};
+    either kind may be left out.
+    """
+
+    def __init__(self, rules, buckets):
+        self.rules = rules
+        self.buckets = buckets
+
+    def check(self, rule, ip, username=None):
+        """(kind, retry_after) of the first exhausted limit, or None if the request may go ahead"""
+        limits = self.rules.get(rule, {})
+        keys = (('ip', ip), ('username', str(username).strip().lower() if username else None))
+        for kind, value in keys:
+            if kind not in limits or not value:
+                continue
+            requests, period = limits[kind]
+            retry_after = self.buckets.take(f'{rule}:{kind}:{value}', requests, period)
+            if retry_after:
+                return kind, retry_after
+        return None
+
+
+class AdmissionGate:
+    """Caps concurrent holders without queueing: try_enter() fails when the cap is reached"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._admitted = 0
+        self._shed = 0
+
+    def try_enter(self):
+        with self._lock:
+            if self._in_flight >= self.limit:
+                self._shed += 1
+                return False
+            self._in_flight += 1
+            self._admitted += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+            return True
+
+    def leave(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            return {'limit': self.limit, 'in_flight': self._in_flight, 'max_in_flight': self._max_in_flight,
+                    'admitted': self._admitted, 'shed': self._shed}
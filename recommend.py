@@ -0,0 +1,408 @@
+"""Ranks guides against what a tourist is looking for
+
+Every guide is one row of a packed float32 feature matrix:
+
+    rating | experience | price | all Jharkhand | languages... | tour types...
+
+plus, alongside it, a small integer code for the guide's home district, so
+scoring a request against every guide at once is a handful of column
+operations plus an argpartition for the top K, however many guides there
+are. The request side (tour type, districts, languages, budget, group size
+and fitness) is turned into column indexes and weights once per call.
+
+District names come from the districts table, through the district_of(location)
+callable the recommender is given (geo.ProximityIndex.district_of); the
+caller resolves a tourist's places to district names the same way
+(ProximityIndex.districts_in) before building Criteria.
+
+Like availability.AvailabilityIndex, writes in this process are applied
+straight away through update() and remove(), other workers' profile changes
+are picked up by a delta query on guides.updated_at at most every
+sync_interval seconds, and a full reload every full_reload_interval seconds
+also catches deleted guides. As there, each delta query starts sync_overlap
+seconds before the last database clock reading, for profile and rating
+changes committed after the timestamp they were stamped with; re-read guides
+whose row is unchanged are skipped.
+
+fetch_guides(since) must return guide rows with user_id, guide_name,
+specialization, experience_years, languages_spoken, location, price_per_day,
+rating and availability_status, changed at or after `since` (a datetime from
+the database clock), or every guide when since is None. It must also return
+that clock reading, as (rows, now).
+
+NumPy is optional: without it the same scores are computed row by row.
+"""
+import heapq
+import re
+import threading
+import time
+from datetime import timedelta
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; scoring falls back to plain Python
+    np = None
+
+LANGUAGES = ['Hindi', 'English', 'Santhali', 'Nagpuri', 'Bengali', 'Ho', 'Mundari', 'Kurukh',
+             'Khortha', 'Odia', 'Urdu']
+TOUR_TYPES = ['Wildlife & Nature Tours', 'Cultural Heritage Tours', 'Adventure & Trekking',
+              'Photography Tours', 'Spiritual & Temple Tours', 'Industrial Heritage Tours',
+              'Tribal Culture Tours', 'Waterfall Tours', 'General Tourism']
+
+LANGUAGE_ALIASES = {'santali': 'Santhali', 'oraon': 'Kurukh', 'oriya': 'Odia', 'bangla': 'Bengali'}
+
+# Guides with no single district, or who list "All Jharkhand", cover every district
+# but rank below a guide based in the district itself
+ALL_JHARKHAND_MATCH = 0.5
+# A "General Tourism" guide is a partial match for any tour type
+GENERAL_TOUR_MATCH = 0.5
+GENERAL_TOUR = 'General Tourism'
+ADVENTURE_TOUR = 'Adventure & Trekking'
+LOW_FITNESS_LEVELS = ('low', 'mobility-assistance')
+EXPERIENCE_CAP = 15  # years; more experience than this earns no extra score
+
+WEIGHTS = {
+    'tour_type': 3.0,
+    'district': 2.0,
+    'language': 1.5,
+    'price': 1.5,
+    'rating': 1.0,
+    'experience': 0.5,
+}
+GROUP_EXPERIENCE_BOOST = 0.1  # extra experience weight per traveller beyond the first
+MAX_GROUP_SIZE = 10
+
+# Column layout of the feature matrix
+RATING, EXPERIENCE, PRICE, ALL_DISTRICTS = range(4)
+LANGUAGE_BASE = 4
+TOUR_BASE = LANGUAGE_BASE + len(LANGUAGES)
+WIDTH = TOUR_BASE + len(TOUR_TYPES)
+
+DISPLAY_FIELDS = ('guide_name', 'specialization', 'experience_years', 'languages_spoken',
+                  'location', 'price_per_day', 'rating', 'review_count')
+
+
+def languages_in(text):
+    """Indexes into LANGUAGES of the languages in a comma-separated list"""
+    found = set()
+    for word in re.split(r'[,/;&]|\band\b', (text or '').lower()):
+        word = word.strip()
+        name = LANGUAGE_ALIASES.get(word, word)
+        for index, language in enumerate(LANGUAGES):
+            if language.lower() == name.lower():
+                found.add(index)
+    return found
+
+
+def tour_types_in(text):
+    """Indexes into TOUR_TYPES of the tour types a specialization names"""
+    text = (text or '').lower()
+    return {index for index, tour_type in enumerate(TOUR_TYPES) if tour_type.lower() in text}
+
+
+def encode(row, district):
+    """A guide row (based in district, None for all of Jharkhand) as a feature vector,
+    and whether the guide can be recommended"""
+    vector = [0.0] * WIDTH
+    vector[RATING] = float(row['rating'] or 0)
+    vector[EXPERIENCE] = float(min(row['experience_years'] or 0, EXPERIENCE_CAP))
+    vector[PRICE] = float(row['price_per_day'] or 0)
+    if district is None:
+        vector[ALL_DISTRICTS] = 1.0
+    for index in languages_in(row['languages_spoken']):
+        vector[LANGUAGE_BASE + index] = 1.0
+    for index in tour_types_in(row['specialization']):
+        vector[TOUR_BASE + index] = 1.0
+    return vector, row['availability_status'] == 'available'
+
+
+class Criteria:
+    """What a tourist asked for, resolved to feature columns and weights
+
+    districts are the names of the districts the tourist wants to visit.
+    """
+
+    def __init__(self, tour_type='', districts=(), languages='', group_size=1, fitness_level='', budget=None):
+        tour_types = tour_types_in(tour_type)
+        self.tour_column = TOUR_BASE + min(tour_types) if tour_types else None
+        self.general_column = TOUR_BASE + TOUR_TYPES.index(GENERAL_TOUR)
+        # Adventure specialists are a poor fit for a low-fitness group that
+        # did not ask for adventure
+        self.adventure_column = None
+        if fitness_level in LOW_FITNESS_LEVELS and tour_type != ADVENTURE_TOUR:
+            self.adventure_column = TOUR_BASE + TOUR_TYPES.index(ADVENTURE_TOUR)
+
+        self.districts = frozenset(district for district in districts if district)
+        self.language_columns = sorted(LANGUAGE_BASE + index for index in languages_in(languages))
+        self.budget = float(budget) if budget else None
+
+        group_size = min(max(int(group_size or 1), 1), MAX_GROUP_SIZE)
+        self.weights = dict(WEIGHTS)
+        self.weights['experience'] *= 1 + GROUP_EXPERIENCE_BOOST * (group_size - 1)
+
+    def components(self, vector, district):
+        """Per-feature scores in [0, 1] (the adventure penalty may go below) for one guide based in district"""
+        scores = {
+            'rating': vector[RATING] / 5,
+            'experience': vector[EXPERIENCE] / EXPERIENCE_CAP,
+            'price': 0.0,
+            'district': 0.0,
+            'language': 0.0,
+            'tour_type': 0.0,
+        }
+        if self.budget:
+            over = (vector[PRICE] - self.budget) / self.budget
+            scores['price'] = 1.0 if over <= 0 else max(0.0, 1 - over)
+        if self.districts:
+            scores['district'] = max(1.0 if district in self.districts else 0.0,
+                                     vector[ALL_DISTRICTS] * ALL_JHARKHAND_MATCH)
+        if self.language_columns:
+            scores['language'] = sum(vector[column] for column in self.language_columns) / len(self.language_columns)
+        if self.tour_column is not None:
+            scores['tour_type'] = max(vector[self.tour_column], vector[self.general_column] * GENERAL_TOUR_MATCH)
+        if self.adventure_column is not None:
+            scores['tour_type'] -= vector[self.adventure_column]
+        return scores
+
+    def score(self, vector, district):
+        return sum(self.weights[name] * value for name, value in self.components(vector, district).items())
+
+    def score_matrix(self, features, in_districts):
+        """The score of every row of a feature matrix, as one vector
+
+        in_districts flags the rows of guides based in one of self.districts.
+        """
+        w = self.weights
+        scores = w['rating'] * features[:, RATING] / 5
+        scores += w['experience'] * features[:, EXPERIENCE] / EXPERIENCE_CAP
+        if self.budget:
+            over = (features[:, PRICE] - self.budget) / self.budget
+            scores += w['price'] * np.clip(1 - over, 0, 1)
+        if self.districts:
+            scores += w['district'] * np.maximum(in_districts, features[:, ALL_DISTRICTS] * ALL_JHARKHAND_MATCH)
+        if self.language_columns:
+            scores += w['language'] * features[:, self.language_columns].mean(axis=1)
+        if self.tour_column is not None:
+            scores += w['tour_type'] * np.maximum(features[:, self.tour_column],
+                                                  features[:, self.general_column] * GENERAL_TOUR_MATCH)
+        if self.adventure_column is not None:
+            scores -= w['tour_type'] * features[:, self.adventure_column]
+        return scores
+
+
+class GuideRecommender:
+    """Guide feature matrix kept in step with guide profiles, scored per request"""
+
+    def __init__(self, fetch_guides, district_of, sync_interval=5, full_reload_interval=300, sync_overlap=30):
+        self.fetch_guides = fetch_guides
+        self.district_of = district_of
+        self.sync_interval = sync_interval
+        self.full_reload_interval = full_reload_interval
+        self.sync_overlap = timedelta(seconds=sync_overlap)
+        self._lock = threading.RLock()
+        self._clear()
+        self._loaded_at = None
+        self._synced_at = None
+        self._db_clock = None
+        self._queries = 0
+
+    # -- storage ---------------------------------------------------------
+
+    def _clear(self):
+        self._slots = {}      # guide id -> row of the matrix
+        self._free = []       # rows of removed guides, reused first
+        self._guides = {}     # guide id -> display fields
+        self._applied = {}    # guide id -> (district, status, display values) last applied
+        self._home = {}       # guide id -> district name, None for all of Jharkhand
+        self._by_district = {}  # district name (None for all of Jharkhand) -> ids of recommendable guides
+        self._district = {}   # guide id -> its key in _by_district
+        self._codes = {None: 0}  # district name -> code in _homes
+        self._size = 0        # rows in use, including freed ones
+        if np is not None:
+            self._ids = np.zeros(64, dtype=np.int64)
+            self._active = np.zeros(64, dtype=bool)
+            self._homes = np.zeros(64, dtype=np.int32)
+            self._features = np.zeros((64, WIDTH), dtype=np.float32)
+        else:
+            self._ids, self._active, self._homes, self._features = [], [], [], []
+
+    def _slot(self, guide_id):
+        slot = self._slots.get(guide_id)
+        if slot is not None:
+            return slot
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = self._size
+            self._size += 1
+            if np is None:
+                self._ids.append(0)
+                self._active.append(False)
+                self._homes.append(0)
+                self._features.append(None)
+            elif slot == len(self._ids):
+                # Double the capacity, so n inserts cost O(n) copying overall
+                capacity = 2 * len(self._ids)
+                self._ids = np.resize(self._ids, capacity)
+                self._active = np.resize(self._active, capacity)
+                self._active[slot:] = False
+                self._homes = np.resize(self._homes, capacity)
+                features = np.zeros((capacity, WIDTH), dtype=np.float32)
+                features[:slot] = self._features
+                self._features = features
+        self._slots[guide_id] = slot
+        return slot
+
+    def _apply(self, row):
+        guide_id = int(row['user_id'])
+        district = self.district_of(row['location'])
+        applied = (district, row['availability_status'], tuple(row[name] for name in DISPLAY_FIELDS))
+        if self._applied.get(guide_id) == applied:
+            # Already known (a row re-read in the sync overlap window): nothing to redo
+            return
+        self._applied[guide_id] = applied
+        vector, active = encode(row, district)
+        slot = self._slot(guide_id)
+        self._ids[slot] = guide_id
+        self._active[slot] = active
+        self._homes[slot] = self._codes.setdefault(district, len(self._codes))
+        self._features[slot] = vector
+        self._guides[guide_id] = {name: row[name] for name in DISPLAY_FIELDS}
+        self._home[guide_id] = district
+        self._unbucket(guide_id)
+        if active:
+            self._district[guide_id] = district
+            self._by_district.setdefault(district, set()).add(guide_id)
+
+    def _unbucket(self, guide_id):
+        if guide_id in self._district:
+            self._by_district[self._district.pop(guide_id)].discard(guide_id)
+
+    def _remove(self, guide_id):
+        slot = self._slots.pop(guide_id, None)
+        if slot is not None:
+            self._active[slot] = False
+            self._free.append(slot)
+            self._guides.pop(guide_id, None)
+            self._applied.pop(guide_id, None)
+            self._home.pop(guide_id, None)
+            self._unbucket(guide_id)
+
+    # -- maintenance -----------------------------------------------------
+
+    def update(self, row):
+        """Record a guide profile created or changed by this process"""
+        with self._lock:
+            self._apply(row)
+
+    def remove(self, guide_id):
+        """Stop recommending a deleted guide"""
+        with self._lock:
+            self._remove(int(guide_id))
+
+    def invalidate(self):
+        """Force a full reload on next use"""
+        with self._lock:
+            self._loaded_at = None
+
+    def _reload(self):
+        rows, db_clock = self.fetch_guides(None)
+        self._clear()
+        for row in rows:
+            self._apply(row)
+        self._loaded_at = self._synced_at = time.monotonic()
+        self._db_clock = db_clock
+
+    def refresh(self, force=False):
+        """Bring the matrix up to date with the database if it may be stale"""
+        now = time.monotonic()
+        with self._lock:
+            if self._loaded_at is None or now - self._loaded_at >= self.full_reload_interval:
+                self._reload()
+            elif force or now - self._synced_at >= self.sync_interval:
+                # Re-read the overlap window for late commits (and updated_at's
+                # one-second resolution); unchanged rows are skipped in _apply
+                rows, db_clock = self.fetch_guides(self._db_clock - self.sync_overlap)
+                for row in rows:
+                    self._apply(row)
+                self._synced_at = now
+                self._db_clock = db_clock
+
+    # -- queries ---------------------------------------------------------
+
+    def _top(self, criteria, exclude, k):
+        """[(score, guide id)] of the k best-scoring recommendable guides, best first"""
+        if np is None:
+            candidates = (
+                (criteria.score(self._features[slot], self._home[self._ids[slot]]), self._ids[slot])
+                for slot in range(self._size)
+                if self._active[slot] and self._ids[slot] not in exclude
+            )
+            return heapq.nlargest(k, candidates, key=lambda item: (item[0], -item[1]))
+
+        ids = self._ids[:self._size]
+        mask = self._active[:self._size].copy()
+        if exclude:
+            mask &= ~np.isin(ids, np.fromiter(exclude, dtype=np.int64, count=len(exclude)))
+        candidates = np.flatnonzero(mask)
+        if not len(candidates):
+            return []
+        codes = [self._codes[name] for name in criteria.districts if name in self._codes]
+        in_districts = np.isin(self._homes[candidates], codes)
+        scores = criteria.score_matrix(self._features[candidates], in_districts)
+        if len(candidates) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+            candidates, scores = candidates[best], scores[best]
+        # Best score first; ties go to the longest-registered (lowest id) guide
+        order = np.lexsort((ids[candidates], -scores))
+        return [(float(scores[i]), int(ids[candidates[i]])) for i in order]
+
+    def recommend(self, criteria, exclude=(), k=10):
+        """The k guides that best match a Criteria, skipping the ids in exclude
+
+        Each result carries the guide's display fields, its total score and
+        the per-feature scores that made it up.
+        """
+        self.refresh()
+        exclude = set(exclude)
+        with self._lock:
+            self._queries += 1
+            results = []
+            for score, guide_id in self._top(criteria, exclude, k):
+                vector = self._features[self._slots[guide_id]]
+                results.append({
+                    'user_id': guide_id,
+                    **self._guides[guide_id],
+                    'score': round(score, 4),
+                    'match': {name: round(float(value), 3)
+                              for name, value in criteria.components(vector, self._home[guide_id]).items()},
+                })
+            return results
+
+    def in_districts(self, districts, exclude=()):
+        """Recommendable guides based in each named district, as [(district, [guide])], in the order given
+
+        Names are as in the districts table; None stands for the guides who cover
+        all of Jharkhand. Each district's guides are sorted best rated first.
+        """
+        self.refresh()
+        exclude = set(exclude)
+        with self._lock:
+            results = []
+            for name in districts:
+                ids = self._by_district.get(name, ())
+                guides = [{'user_id': guide_id, **self._guides[guide_id]}
+                          for guide_id in ids if guide_id not in exclude]
+                guides.sort(key=lambda guide: (-float(guide['rating'] or 0), guide['user_id']))
+                results.append((name, guides))
+            return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                'guides': len(self._slots),
+                'recommendable': int(sum(self._active[:self._size])),
+                'rows': self._size,
+                'backend': 'numpy' if np is not None else 'python',
+                'queries': self._queries,
+            }
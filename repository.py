@@ -0,0 +1,487 @@
+"""Named SQL statements, run as server-side prepared statements
+
+Every fixed query the routes issue lives in STATEMENTS under a name. The first
+time a pooled connection runs a statement, Repository prepares it on that
+connection and keeps the prepared cursor, so later requests that check the
+same connection out skip the parse and plan step and only send parameters.
+Prepared statements belong to one server session: the cache is keyed on the
+underlying connection and dropped when its connection id changes (the pool
+reconnected it), or when the server reports an unknown statement handle.
+
+Result rows are Row objects (one __slots__ class per column list) rather than
+dicts. They read like dicts (row['name'], row.get(), `in`, keys()) and like
+objects (row.name), so templates and route code work with either.
+
+Queries with optional filters are a few named variants where that is
+enough (content search with or without a type filter, the content feed by
+type and location). Guide search has too many filter combinations and a
+variable IN list, so guide_search() builds its SQL here and
+Repository.query() runs it on an ordinary cursor. Admin table paging and
+exports (exports.py) still assemble their own SQL.
+"""
+import keyword
+import threading
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+
+from mysql.connector import errorcode
+from mysql.connector.errors import DatabaseError
+
+CONTENT_SEARCH = """SELECT gu.id, gu.upload_type, gu.title, gu.description, gu.image_path,
+                           gu.image_width, gu.image_height, gu.image_variants, gu.location, gu.upload_date,
+                           u.full_name as guide_name, u.username as guide_username,
+                           MATCH(gu.title, gu.description, gu.location) AGAINST (%s IN BOOLEAN MODE) as relevance
+                    FROM guide_uploads gu JOIN users u ON gu.guide_id = u.id
+                    WHERE MATCH(gu.title, gu.description, gu.location) AGAINST (%s IN BOOLEAN MODE)
+                    AND u.user_type = 'guide' {type_filter}
+                    ORDER BY relevance DESC, gu.upload_date DESC, gu.id DESC
+                    LIMIT %s OFFSET %s"""
+
+# /all_content feed, newest first after an (upload_date, id) keyset position;
+# the first page passes a position past every upload
+CONTENT_FEED = """SELECT gu.*, u.full_name as guide_name, u.username as guide_username
+                  FROM guide_uploads gu JOIN users u ON gu.guide_id = u.id
+                  WHERE u.user_type = 'guide' {filters}
+                  AND (gu.upload_date < %s OR (gu.upload_date = %s AND gu.id < %s))
+                  ORDER BY gu.upload_date DESC, gu.id DESC
+                  LIMIT %s"""
+
+STATEMENTS = {
+    # Users and guide profiles
+    'user_by_username': "SELECT id FROM users WHERE username = %s",
+    'user_for_login': """SELECT id, username, password, user_type, full_name FROM users
+                         WHERE username = %s AND user_type = %s""",
+    'insert_user': """INSERT INTO users (username, password, user_type, full_name, phone, email)
+                      VALUES (%s, %s, %s, %s, %s, %s)""",
+    'delete_user': "DELETE FROM users WHERE id = %s",
+    'guide_profile_id': "SELECT id FROM guides WHERE user_id = %s",
+    'guide_profile': "SELECT * FROM guides WHERE user_id = %s",
+    'insert_guide_profile': """INSERT INTO guides (user_id, specialization, experience_years,
+                               languages_spoken, location, price_per_day, availability_status)
+                               VALUES (%s, %s, %s, %s, %s, %s, 'available')""",
+    'update_guide_profile': """UPDATE guides SET specialization = %s, experience_years = %s,
+                               languages_spoken = %s, location = %s, price_per_day = %s
+                               WHERE user_id = %s""",
+    'available_guide_count': """SELECT COUNT(*) as total
+                                FROM users u JOIN guides g ON u.id = g.user_id
+                                WHERE g.availability_status = 'available' AND u.user_type = 'guide'""",
+    'guide_for_booking': """SELECT u.id as user_id, u.full_name as guide_name, u.username,
+                                   g.specialization, g.experience_years, g.languages_spoken,
+                                   g.location, g.price_per_day, g.rating, g.review_count, g.availability_status,
+                                   g.updated_at
+                            FROM users u JOIN guides g ON u.id = g.user_id
+                            WHERE u.id = %s AND u.user_type = 'guide'""",
+    'recommender_guides_all': """SELECT u.id as user_id, u.full_name as guide_name, g.specialization,
+                                     g.experience_years, g.languages_spoken, g.location,
+                                     g.price_per_day, g.rating, g.review_count, g.availability_status
+                              FROM users u JOIN guides g ON u.id = g.user_id
+                              WHERE u.user_type = 'guide'""",
+    'recommender_guides_since': """SELECT u.id as user_id, u.full_name as guide_name, g.specialization,
+                                       g.experience_years, g.languages_spoken, g.location,
+                                       g.price_per_day, g.rating, g.review_count, g.availability_status
+                                FROM users u JOIN guides g ON u.id = g.user_id
+                                WHERE u.user_type = 'guide' AND g.updated_at >= %s""",
+    'bookable_guide': """SELECT u.id, u.full_name, u.email, u.phone, g.price_per_day
+                         FROM users u LEFT JOIN guides g ON g.user_id = u.id
+                         WHERE u.id = %s AND u.user_type = 'guide'""",
+
+    # Bookings
+    # Dashboard booking lists, newest first and a page at a time after a
+    # (created_at, id) keyset position
+    'tourist_bookings': """SELECT b.*, u.full_name as guide_name, r.rating as review_rating
+                           FROM bookings b LEFT JOIN users u ON b.guide_id = u.id
+                           LEFT JOIN reviews r ON r.booking_id = b.id
+                           WHERE b.tourist_id = %s AND (b.created_at < %s OR (b.created_at = %s AND b.id < %s))
+                           ORDER BY b.created_at DESC, b.id DESC
+                           LIMIT %s""",
+    'tourist_booking_count': "SELECT COUNT(*) as total FROM bookings WHERE tourist_id = %s",
+    'guide_bookings': """SELECT b.*, u.username as tourist_username, u.full_name as tourist_full_name
+                         FROM bookings b JOIN users u ON b.tourist_id = u.id
+                         WHERE b.guide_id = %s AND (b.created_at < %s OR (b.created_at = %s AND b.id < %s))
+                         ORDER BY b.created_at DESC, b.id DESC
+                         LIMIT %s""",
+    'insert_booking': """INSERT INTO bookings (
+                             tourist_id, guide_id, tourist_name, phone, email, native_place,
+                             arrival_date, departure_date, days_to_stay, group_size, price_per_day, tour_type,
+                             specific_places, accommodation, transport, dietary_preference,
+                             fitness_level, additional_requirements, booking_status
+                         ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'pending')""",
+    'guide_booking_for_update': """SELECT id, arrival_date, departure_date, booking_status, created_at,
+                                          days_to_stay, group_size, price_per_day,
+                                          tourist_name, phone, email FROM bookings
+                                   WHERE id = %s AND guide_id = %s FOR UPDATE""",
+    'update_booking_status': "UPDATE bookings SET booking_status = %s WHERE id = %s AND guide_id = %s",
+    'booking_count': "SELECT COUNT(*) as total FROM bookings",
+
+    # Reviews. guides.rating is rating_sum / review_count, kept current by the
+    # same transaction that writes a review instead of AVG() over reviews.
+    'tourist_booking_for_review': """SELECT b.id, b.guide_id, b.booking_status, r.id as review_id
+                                    FROM bookings b LEFT JOIN reviews r ON r.booking_id = b.id
+                                    WHERE b.id = %s AND b.tourist_id = %s FOR UPDATE""",
+    'insert_review': """INSERT INTO reviews (booking_id, guide_id, tourist_id, rating, comment)
+                        VALUES (%s, %s, %s, %s, %s)""",
+    # Single-table UPDATE assigns left to right, so rating sees the new sum and count
+    'add_guide_rating': """UPDATE guides SET rating_sum = rating_sum + %s, review_count = review_count + 1,
+                                           rating = rating_sum / review_count
+                           WHERE user_id = %s""",
+    # Multiple-table UPDATEs have no assignment order, so the rating is
+    # recomputed by a second statement
+    'forget_tourist_ratings': """UPDATE guides g
+                                JOIN (SELECT guide_id, SUM(rating) as total, COUNT(*) as reviews
+                                      FROM reviews WHERE tourist_id = %s GROUP BY guide_id) r
+                                  ON r.guide_id = g.user_id
+                                SET g.rating_sum = g.rating_sum - r.total, g.review_count = g.review_count - r.reviews""",
+    'recompute_tourist_guide_ratings': """UPDATE guides SET rating = IF(review_count > 0, rating_sum / review_count, 0)
+                                         WHERE user_id IN (SELECT guide_id FROM reviews WHERE tourist_id = %s)""",
+    'rebuild_guide_ratings': """UPDATE guides g
+                               LEFT JOIN (SELECT guide_id, SUM(rating) as total, COUNT(*) as reviews
+                                          FROM reviews GROUP BY guide_id) r ON r.guide_id = g.user_id
+                               SET g.rating_sum = COALESCE(r.total, 0), g.review_count = COALESCE(r.reviews, 0),
+                                   g.rating = IF(r.reviews > 0, r.total / r.reviews, 0)""",
+    # Newest first; the first page passes a cursor past every review
+    'guide_reviews_page': """SELECT r.id, r.rating, r.comment, r.created_at, u.full_name as tourist_name
+                             FROM reviews r JOIN users u ON r.tourist_id = u.id
+                             WHERE r.guide_id = %s AND (r.created_at < %s OR (r.created_at = %s AND r.id < %s))
+                             ORDER BY r.created_at DESC, r.id DESC
+                             LIMIT %s""",
+    'guide_rating': """SELECT u.full_name as guide_name, g.rating, g.review_count
+                       FROM users u JOIN guides g ON u.id = g.user_id
+                       WHERE u.id = %s AND u.user_type = 'guide'""",
+    'availability_all': """SELECT id, guide_id, arrival_date, departure_date, booking_status
+                           FROM bookings
+                           WHERE booking_status <> 'cancelled'
+                           AND departure_date >= CURDATE() - INTERVAL %s DAY""",
+    'availability_since': """SELECT id, guide_id, arrival_date, departure_date, booking_status
+                             FROM bookings WHERE updated_at >= %s""",
+
+    # Guide uploads
+    'homepage_feed': """SELECT gu.*, u.full_name as guide_name, u.username as guide_username
+                        FROM guide_uploads gu
+                        JOIN users u ON gu.guide_id = u.id
+                        WHERE u.user_type = 'guide'
+                        ORDER BY gu.upload_date DESC
+                        LIMIT 12""",
+    'content_details': """SELECT gu.*, u.full_name as guide_name, u.username as guide_username
+                          FROM guide_uploads gu
+                          JOIN users u ON gu.guide_id = u.id
+                          WHERE gu.id = %s""",
+    'guide_uploads': "SELECT * FROM guide_uploads WHERE guide_id = %s ORDER BY upload_date DESC",
+    'guide_upload': "SELECT * FROM guide_uploads WHERE id = %s AND guide_id = %s",
+    'insert_upload': """INSERT INTO guide_uploads (guide_id, upload_type, title, description,
+                        image_path, location) VALUES (%s, %s, %s, %s, %s, %s)""",
+    'update_upload': """UPDATE guide_uploads
+                        SET upload_type = %s, title = %s, description = %s, location = %s, image_path = %s
+                        WHERE id = %s AND guide_id = %s""",
+    'clear_image_variants': """UPDATE guide_uploads SET image_width = NULL, image_height = NULL,
+                               image_variants = NULL WHERE id = %s""",
+    'store_image_variants': """UPDATE guide_uploads SET image_width = %s, image_height = %s, image_variants = %s
+                               WHERE id = %s AND image_path = %s""",
+    'unprocessed_uploads': """SELECT id, image_path FROM guide_uploads
+                              WHERE image_path <> '' AND image_variants IS NULL""",
+    'delete_upload': "DELETE FROM guide_uploads WHERE id = %s AND guide_id = %s",
+    'upload_count': "SELECT COUNT(*) as total FROM guide_uploads",
+
+    # Content search: one variant per optional filter, so each is a fixed
+    # statement that can be prepared; the fulltext query string is bound twice
+    'content_search': CONTENT_SEARCH.format(type_filter=''),
+    'content_search_by_type': CONTENT_SEARCH.format(type_filter='AND gu.upload_type = %s'),
+
+    # Content feed, one variant per combination of the type and location filters
+    'content_feed': CONTENT_FEED.format(filters=''),
+    'content_feed_by_type': CONTENT_FEED.format(filters='AND gu.upload_type = %s'),
+    'content_feed_by_location': CONTENT_FEED.format(filters='AND gu.location = %s'),
+    'content_feed_by_type_location': CONTENT_FEED.format(filters='AND gu.upload_type = %s AND gu.location = %s'),
+
+    # Places
+    'districts_all': "SELECT name, headquarters, latitude, longitude FROM districts ORDER BY id",
+    'places_all': """SELECT p.name, d.name as district, p.latitude, p.longitude
+                     FROM places p JOIN districts d ON p.district_id = d.id""",
+
+    # Admin and housekeeping
+    'user_type_counts': "SELECT user_type, COUNT(*) as total FROM users GROUP BY user_type",
+    'db_now': "SELECT NOW() as now",
+    'current_database': "SELECT DATABASE() as name",
+}
+
+
+# Sort orders for guide search: name -> (sort expression, direction). Every order
+# breaks ties on u.id so (sort value, id) is a unique keyset cursor.
+GUIDE_SORTS = {
+    'rating': ('COALESCE(g.rating, 0)', 'DESC'),
+    'experience': ('COALESCE(g.experience_years, 0)', 'DESC'),
+    'price_low': ('COALESCE(g.price_per_day, 0)', 'ASC'),
+    'price_high': ('COALESCE(g.price_per_day, 0)', 'DESC'),
+}
+
+
+def guide_search(sort, limit, location='', specialization='', language='', min_price=None, max_price=None,
+                 min_rating=None, exclude=(), after=None):
+    """(sql, params) for a page of available guides, in GUIDE_SORTS order
+
+    Empty or None filters are left out; exclude is guide ids to skip and after
+    the (sort value, id) keyset position of the previous page. Rows carry a
+    sort_value column for the next cursor.
+    """
+    sort_expr, direction = GUIDE_SORTS[sort]
+    conditions = ["g.availability_status = 'available'", "u.user_type = 'guide'"]
+    params = []
+    if location:
+        # Guides without a location, or who list "All Jharkhand", cover every district
+        conditions.append("(g.location LIKE %s OR g.location IS NULL OR g.location = '' "
+                          "OR g.location = 'All Jharkhand')")
+        params.append(location + '%')
+    if specialization:
+        conditions.append("g.specialization LIKE %s")
+        params.append('%' + specialization + '%')
+    if language:
+        conditions.append("g.languages_spoken LIKE %s")
+        params.append('%' + language + '%')
+    if min_price is not None:
+        conditions.append("g.price_per_day >= %s")
+        params.append(min_price)
+    if max_price is not None:
+        conditions.append("g.price_per_day <= %s")
+        params.append(max_price)
+    if min_rating is not None:
+        conditions.append("g.rating >= %s")
+        params.append(min_rating)
+    if exclude:
+        conditions.append(f"u.id NOT IN ({', '.join(['%s'] * len(exclude))})")
+        params.extend(sorted(exclude))
+    if after:
+        comparison = '<' if direction == 'DESC' else '>'
+        conditions.append(f"({sort_expr} {comparison} %s OR ({sort_expr} = %s AND u.id > %s))")
+        params.extend([after[0], after[0], after[1]])
+
+    sql = f"""SELECT u.id as user_id, u.full_name as guide_name, u.username,
+                     g.specialization, g.experience_years, g.languages_spoken,
+                     g.location, g.price_per_day, g.rating, g.review_count, g.availability_status,
+                     {sort_expr} as sort_value
+              FROM users u JOIN guides g ON u.id = g.user_id
+              WHERE {' AND '.join(conditions)}
+              ORDER BY sort_value {direction}, u.id ASC
+              LIMIT %s"""
+    return sql, (*params, limit)
+
+
+def content_feed_statement(upload_type, location):
+    """(statement name, filter parameters) of the content feed variant for optional type and location filters"""
+    name = 'content_feed'
+    if upload_type or location:
+        name += '_by' + ('_type' if upload_type else '') + ('_location' if location else '')
+    return name, [value for value in (upload_type, location) if value]
+
+
+class Row:
+    """Base class of result rows; subclasses set __slots__ to the column names"""
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self):
+        return self.__slots__
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if isinstance(other, Row):
+            return self.__slots__ == other.__slots__ and self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'Row({self.to_dict()!r})'
+
+
+_row_types = {}
+
+
+def row_type(columns):
+    """The Row subclass for a tuple of column names, created once per distinct list"""
+    cls = _row_types.get(columns)
+    if cls is None:
+        for name in columns:
+            if not name.isidentifier() or keyword.iskeyword(name) or name.startswith('_'):
+                raise ValueError(f'Column {name!r} cannot be a row attribute; alias it in the SQL')
+        if len(set(columns)) != len(columns):
+            raise ValueError(f'Duplicate column names in {columns!r}; alias them in the SQL')
+        # A generated positional __init__, as namedtuple does, is much faster
+        # than setting attributes in a loop
+        args = ', '.join(f'_{i}' for i in range(len(columns)))
+        body = '; '.join(f'self.{name} = _{i}' for i, name in enumerate(columns)) or 'pass'
+        namespace = {}
+        exec(f'def __init__(self, {args}):\n    {body}', namespace)
+        cls = type('Row', (Row,), {'__slots__': columns, '__init__': namespace['__init__']})
+        _row_types[columns] = cls
+    return cls
+
+
+Result = namedtuple('Result', 'rowcount lastrowid')
+
+
+def _session(connection):
+    """The real connection behind pool and instrumentation wrappers"""
+    # InstrumentedConnection exposes the pooled connection as .raw, and a
+    # PooledMySQLConnection is a fresh wrapper per checkout around ._cnx,
+    # which is what the prepared statements actually live on
+    connection = getattr(connection, 'raw', connection)
+    return getattr(connection, '_cnx', connection)
+
+
+class Repository:
+    """Runs STATEMENTS as prepared statements cached per connection"""
+
+    def __init__(self, max_statements=64, on_query=None):
+        self.max_statements = max_statements
+        self.on_query = on_query
+        self._cursors = weakref.WeakKeyDictionary()  # connection -> (connection_id, OrderedDict)
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._prepares = 0
+        self._reuses = 0
+        self._evictions = 0
+        self._reprepares = 0
+
+    def _cached(self, session):
+        """This connection's name -> prepared cursor map, emptied if the session changed"""
+        with self._lock:
+            entry = self._cursors.get(session)
+            if entry is None or entry[0] != session.connection_id:
+                entry = self._cursors[session] = (session.connection_id, OrderedDict())
+        return entry[1]
+
+    def _cursor(self, session, name):
+        cursors = self._cached(session)
+        cursor = cursors.get(name)
+        if cursor is not None:
+            cursors.move_to_end(name)
+            with self._stats_lock:
+                self._reuses += 1
+            return cursor
+
+        cursor = session.cursor(prepared=True)
+        cursors[name] = cursor
+        with self._stats_lock:
+            self._prepares += 1
+        if len(cursors) > self.max_statements:
+            _, oldest = cursors.popitem(last=False)
+            oldest.close()  # deallocates the statement on the server
+            with self._stats_lock:
+                self._evictions += 1
+        return cursor
+
+    def _execute(self, connection, name, params):
+        sql = STATEMENTS[name]
+        session = _session(connection)
+        started = time.perf_counter()
+        try:
+            cursor = self._cursor(session, name)
+            try:
+                cursor.execute(sql, params)
+            except DatabaseError as e:
+                if e.errno != errorcode.ER_UNKNOWN_STMT_HANDLER:
+                    raise
+                # The server dropped our statements (session reset); start over
+                with self._lock:
+                    self._cursors.pop(session, None)
+                with self._stats_lock:
+                    self._reprepares += 1
+                cursor = self._cursor(session, name)
+                cursor.execute(sql, params)
+            return cursor
+        finally:
+            if self.on_query is not None:
+                self.on_query(sql, params, time.perf_counter() - started)
+
+    def all(self, connection, name, *params):
+        """Every row of a named statement, as Row objects"""
+        cursor = self._execute(connection, name, params)
+        rows = cursor.fetchall()
+        cls = row_type(tuple(cursor.column_names))
+        return [cls(*row) for row in rows]
+
+    def one(self, connection, name, *params):
+        """The first row of a named statement, or None"""
+        rows = self.all(connection, name, *params)
+        return rows[0] if rows else None
+
+    def run(self, connection, name, *params):
+        """Execute a named INSERT/UPDATE/DELETE; returns (rowcount, lastrowid)"""
+        cursor = self._execute(connection, name, params)
+        return Result(cursor.rowcount, cursor.lastrowid)
+
+    def query(self, connection, sql, params=()):
+        """Every row of SQL built per request (guide_search() and the like), as dicts
+
+        Runs on an ordinary cursor of the request's instrumented connection,
+        which already records its timing.
+        """
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def stats(self):
+        with self._lock:
+            connections = len(self._cursors)
+            cached = sum(len(cursors) for _, cursors in self._cursors.values())
+        with self._stats_lock:
+            return {
+                'connections': connections,
+                'cached_statements': cached,
+                'prepares': self._prepares,
+                'reuses': self._reuses,
+                'evictions': self._evictions,
+                'reprepares': self._reprepares,
+            }
+
+
+class AsyncRepository:
+    """Runs STATEMENTS on mysql.connector.aio connections, for the ASGI views
+
+    Statements go over the text protocol and rows come back as dicts; the
+    async pool is sized for many short checkouts rather than long-lived
+    per-connection statement caches.
+    """
+
+    def __init__(self, on_query=None):
+        self.on_query = on_query
+
+    async def query(self, connection, sql, params=()):
+        """Every row of an SQL query, as dicts"""
+        started = time.perf_counter()
+        cursor = await connection.cursor(dictionary=True)
+        try:
+            await cursor.execute(sql, params)
+            return await cursor.fetchall()
+        finally:
+            await cursor.close()
+            if self.on_query is not None:
+                self.on_query(sql, params, time.perf_counter() - started)
+
+    async def all(self, connection, name, *params):
+        """Every row of a named statement"""
+        return await self.query(connection, STATEMENTS[name], params)
+
+    async def one(self, connection, name, *params):
+        """The first row of a named statement, or None"""
+        rows = await self.all(connection, name, *params)
+        return rows[0] if rows else None
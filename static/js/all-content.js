@@ -0,0 +1,53 @@
+// Infinite scroll for /all_content: fetch the next page of cards from
+// /api/content/feed whenever the sentinel below the grid comes into view
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.getElementById('contentFeed');
+    const sentinel = document.getElementById('feedSentinel');
+    if (!container || !sentinel) return;
+
+    let nextCursor = sentinel.dataset.nextCursor;
+    let loading = false;
+
+    function loadMore() {
+        if (loading || !nextCursor) return;
+        loading = true;
+
+        const params = new URLSearchParams({ cursor: nextCursor });
+        if (sentinel.dataset.type) params.set('type', sentinel.dataset.type);
+        if (sentinel.dataset.location) params.set('location', sentinel.dataset.location);
+
+        sentinel.innerHTML = '<div class="spinner-border text-primary" role="status"><span class="visually-hidden">Loading...</span></div>';
+        fetch(`/api/content/feed?${params.toString()}`)
+            .then(response => response.json())
+            .then(data => {
+                if (!data.success) throw new Error(data.message || 'Could not load content');
+                container.insertAdjacentHTML('beforeend', data.html);
+                nextCursor = data.next_cursor;
+                sentinel.innerHTML = nextCursor ? '' : '<p class="text-muted">You have reached the oldest content</p>';
+                // The observer only fires on changes; keep going if the new
+                // cards did not push the sentinel out of reach
+                if (nextCursor && sentinel.getBoundingClientRect().top < window.innerHeight + 600) {
+                    setTimeout(loadMore, 0);
+                }
+            })
+            .catch(error => {
+                console.error('Error loading content:', error);
+                sentinel.innerHTML = '<button class="btn btn-outline-primary">Try Again</button>';
+                sentinel.querySelector('button').addEventListener('click', loadMore);
+            })
+            .finally(() => {
+                loading = false;
+            });
+    }
+
+    if (!('IntersectionObserver' in window)) {
+        // The server-rendered "Show More" link keeps working without it
+        return;
+    }
+    const link = document.getElementById('loadMoreContent');
+    if (link) link.remove();
+    // Start loading a little before the visitor reaches the end of the grid
+    new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) loadMore();
+    }, { rootMargin: '600px 0px' }).observe(sentinel);
+});
@@ -0,0 +1,26 @@
+// Smooth scrolling function
+function scrollToAbout() {
+    document.getElementById('about').scrollIntoView({
+        behavior: 'smooth'
+    });
+}
+
+// Add fade-in animation to elements when they come into view
+const observerOptions = {
+    threshold: 0.1,
+    rootMargin: '0px 0px -100px 0px'
+};
+
+const observer = new IntersectionObserver(function(entries) {
+    entries.forEach(entry => {
+        if (entry.isIntersecting) {
+            entry.target.classList.add('fade-in-up');
+        }
+    });
+}, observerOptions);
+
+// Observe elements on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const animateElements = document.querySelectorAll('.feature-card, .destination-card, .content-card');
+    animateElements.forEach(el => observer.observe(el));
+});
@@ -280,6 +280,77 @@ function deleteContent(contentId) {
     });
 }
 
+// Show only bookings with the given status ('all' shows every booking)
+function filterBookings(status) {
+    document.querySelectorAll('.booking-card').forEach(card => {
+        const shown = status === 'all' || card.dataset.status === status;
+        card.style.display = shown ? '' : 'none';
+        // Hidden bookings drop out of the selection
+        const checkbox = card.querySelector('.booking-select');
+        if (checkbox && !shown) checkbox.checked = false;
+    });
+    const selectAll = document.getElementById('selectAllBookings');
+    if (selectAll) selectAll.checked = false;
+    updateBulkSelection();
+}
+
+function selectedBookingIds() {
+    return Array.from(document.querySelectorAll('.booking-select:checked')).map(box => parseInt(box.value, 10));
+}
+
+function toggleAllBookings(checked) {
+    document.querySelectorAll('.booking-card').forEach(card => {
+        const checkbox = card.querySelector('.booking-select');
+        if (checkbox && card.style.display !== 'none') checkbox.checked = checked;
+    });
+    updateBulkSelection();
+}
+
+function updateBulkSelection() {
+    const count = selectedBookingIds().length;
+    const label = document.getElementById('selectedBookingsCount');
+    if (label) label.textContent = `${count} selected`;
+    document.querySelectorAll('#bulkBookingActions button').forEach(btn => btn.disabled = count === 0);
+}
+
+// Apply one status to every selected booking in a single request
+function bulkUpdateBookings(status) {
+    const bookingIds = selectedBookingIds();
+    if (!bookingIds.length) return;
+
+    const verbs = { confirmed: 'accept', completed: 'mark as completed', cancelled: 'decline' };
+    if (!confirm(`Are you sure you want to ${verbs[status] || status} ${bookingIds.length} booking(s)?`)) {
+        return;
+    }
+
+    document.querySelectorAll('#bulkBookingActions button').forEach(btn => btn.disabled = true);
+    fetch('/api/bookings/status', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ booking_ids: bookingIds, status: status })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (!data.success) throw new Error(data.message || 'Unknown error');
+
+        const skipped = Object.values(data.results).filter(result => result !== 'updated');
+        const conflicts = skipped.filter(result => result === 'conflict').length;
+        let message = `${data.updated} booking(s) updated.`;
+        if (conflicts) message += ` ${conflicts} overlap an already confirmed tour.`;
+        if (skipped.length > conflicts) message += ` ${skipped.length - conflicts} could not be changed.`;
+        showToast(message, skipped.length ? 'warning' : 'success');
+
+        // Re-render the cards with their new statuses and actions
+        if (data.updated) setTimeout(() => window.location.reload(), 1200);
+        else updateBulkSelection();
+    })
+    .catch(error => {
+        console.error('Error updating bookings:', error);
+        showToast('Failed to update bookings: ' + error.message, 'error');
+        updateBulkSelection();
+    });
+}
+
 // Initialize when page loads
 document.addEventListener('DOMContentLoaded', function() {
     // Load content when content tab is shown
@@ -302,3 +373,7 @@ window.loadMyContent = loadMyContent;
 window.editContent = editContent;
 window.updateContent = updateContent;
 window.deleteContent = deleteContent;
+window.filterBookings = filterBookings;
+window.toggleAllBookings = toggleAllBookings;
+window.updateBulkSelection = updateBulkSelection;
+window.bulkUpdateBookings = bulkUpdateBookings;
@@ -0,0 +1,54 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Slideshow functionality
+    let currentSlide = 0;
+    const slides = document.querySelectorAll('.slide');
+    const indicators = document.querySelectorAll('.indicator');
+    const totalSlides = slides.length;
+    
+    function showSlide(index) {
+        // Remove active class from all slides and indicators
+        slides.forEach(slide => slide.classList.remove('active'));
+        indicators.forEach(indicator => indicator.classList.remove('active'));
+        
+        // Add active class to current slide and indicator
+        slides[index].classList.add('active');
+        indicators[index].classList.add('active');
+    }
+    
+    function nextSlide() {
+        currentSlide = (currentSlide + 1) % totalSlides;
+        showSlide(currentSlide);
+    }
+    
+    // Auto-advance slides every 6 seconds
+    let slideInterval = setInterval(nextSlide, 6000);
+    
+    // Add click listeners to indicators
+    indicators.forEach((indicator, index) => {
+        indicator.addEventListener('click', () => {
+            clearInterval(slideInterval);
+            currentSlide = index;
+            showSlide(currentSlide);
+            // Restart auto-advance after manual navigation
+            slideInterval = setInterval(nextSlide, 6000);
+        });
+    });
+    
+    // Pause slideshow on hover
+    const heroSection = document.querySelector('.hero-section');
+    heroSection.addEventListener('mouseenter', () => {
+        clearInterval(slideInterval);
+    });
+    
+    heroSection.addEventListener('mouseleave', () => {
+        slideInterval = setInterval(nextSlide, 6000);
+    });
+});
+
+// Smooth scrolling function
+function scrollToAbout() {
+    document.getElementById('about').scrollIntoView({
+        behavior: 'smooth',
+        block: 'start'
+    });
+}
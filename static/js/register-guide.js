@@ -0,0 +1,52 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('guideRegistrationForm');
+    const specializationSelect = document.querySelector('select[name="specialization"]');
+    const locationSelect = document.querySelector('select[name="location"]');
+    
+    // Form validation
+    form.addEventListener('submit', function(e) {
+        const agreeTerms = document.getElementById('agreeTerms').checked;
+        
+        if (!agreeTerms) {
+            e.preventDefault();
+            alert('Please agree to the terms and conditions to continue.');
+            return false;
+        }
+        
+        // Validate specialization
+        if (!specializationSelect.value) {
+            e.preventDefault();
+            alert('Please select your tourism specialization.');
+            specializationSelect.focus();
+            return false;
+        }
+        
+        // Validate location
+        if (!locationSelect.value) {
+            e.preventDefault();
+            alert('Please select your primary service district in Jharkhand.');
+            locationSelect.focus();
+            return false;
+        }
+        
+        return true;
+    });
+    
+    // Dynamic language suggestions based on location
+    locationSelect.addEventListener('change', function() {
+        const languageInput = document.querySelector('input[name="languages_spoken"]');
+        const selectedLocation = this.value;
+        
+        if (selectedLocation.includes('Ranchi')) {
+            languageInput.value = 'Hindi, English, Mundari, Kurukh';
+        } else if (selectedLocation.includes('Deoghar')) {
+            languageInput.value = 'Hindi, English, Bengali';
+        } else if (selectedLocation.includes('East Singhbhum')) {
+            languageInput.value = 'Hindi, English, Ho, Bengali';
+        } else if (selectedLocation.includes('Dumka')) {
+            languageInput.value = 'Hindi, English, Santali';
+        } else {
+            languageInput.value = 'Hindi, English, Santali';
+        }
+    });
+});
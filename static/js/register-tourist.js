@@ -0,0 +1,75 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('touristRegistrationForm');
+    const passwordInput = document.querySelector('input[name="password"]');
+    const phoneInput = document.querySelector('input[name="phone"]');
+    
+    // Form validation
+    form.addEventListener('submit', function(e) {
+        const agreeTerms = document.getElementById('agreeTerms').checked;
+        
+        if (!agreeTerms) {
+            e.preventDefault();
+            alert('Please agree to the terms and conditions to continue.');
+            return false;
+        }
+        
+        // Validate password strength
+        if (passwordInput.value.length < 6) {
+            e.preventDefault();
+            alert('Password must be at least 6 characters long.');
+            passwordInput.focus();
+            return false;
+        }
+        
+        // Validate phone number
+        if (phoneInput.value && !/^[0-9]{10}$/.test(phoneInput.value)) {
+            e.preventDefault();
+            alert('Please enter a valid 10-digit phone number.');
+            phoneInput.focus();
+            return false;
+        }
+        
+        return true;
+    });
+    
+    // Phone number formatting
+    phoneInput.addEventListener('input', function() {
+        // Remove non-numeric characters
+        let value = this.value.replace(/\D/g, '');
+        
+        // Limit to 10 digits
+        if (value.length > 10) {
+            value = value.slice(0, 10);
+        }
+        
+        this.value = value;
+    });
+    
+    // Dynamic recommendations based on preferences
+    const tourPreference = document.querySelector('select[name="tour_preference"]');
+    const interestedDistricts = document.querySelector('select[name="interested_districts"]');
+    
+    tourPreference.addEventListener('change', function() {
+        const selectedTour = this.value;
+        
+        // Suggest districts based on tour type
+        if (selectedTour.includes('Wildlife')) {
+            interestedDistricts.value = 'Hazaribagh District';
+        } else if (selectedTour.includes('Spiritual')) {
+            interestedDistricts.value = 'Deoghar District';
+        } else if (selectedTour.includes('Industrial')) {
+            interestedDistricts.value = 'East Singhbhum';
+        } else if (selectedTour.includes('Waterfall')) {
+            interestedDistricts.value = 'Ranchi District';
+        }
+    });
+    
+    // Welcome animation
+    setTimeout(function() {
+        document.querySelectorAll('.highlight-card').forEach(function(card, index) {
+            setTimeout(function() {
+                card.style.animation = 'fadeInUp 0.6s ease-out forwards';
+            }, index * 100);
+        });
+    }, 500);
+});
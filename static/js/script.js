@@ -291,28 +291,227 @@ document.addEventListener('submit', function(e) {
     }
 });
 
+// Guide search state for the tourist dashboard (pages come from /api/guides)
+const guideSearch = { cursor: null, requestId: 0 };
+
+function escapeHtml(value) {
+    return String(value ?? '').replace(/[&<>"']/g, ch => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[ch]);
+}
+
 // Filter guides by district and tour type (for tourist dashboard)
 function filterGuidesByDistrict() {
-    const selectedDistrict = document.getElementById('districtSelect')?.value || '';
-    const selectedTourType = document.getElementById('tourTypeSelect')?.value || '';
-    const guideCards = document.querySelectorAll('.guide-card');
-    
-    guideCards.forEach(card => {
-        const location = card.dataset.location || '';
-        const specialization = card.dataset.specialization || '';
-        
-        let showCard = true;
-        
-        if (selectedDistrict && !location.includes(selectedDistrict) && location !== 'All Jharkhand') {
-            showCard = false;
-        }
-        
-        if (selectedTourType && !specialization.includes(selectedTourType)) {
-            showCard = false;
-        }
-        
-        card.style.display = showCard ? 'block' : 'none';
-    });
+    // Any filter change restarts the listing from the first page
+    guideSearch.cursor = null;
+    loadGuides(false);
+}
+
+// Known places for the "guides near" box
+function loadPlaceOptions() {
+    const options = document.getElementById('nearPlaceOptions');
+    if (!options) return;
+    fetch('/api/places')
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) return;
+            options.innerHTML = data.places.map(name => `<option value="${escapeHtml(name)}">`).join('');
+        })
+        .catch(error => console.error('Error loading places:', error));
+}
+
+// Fetch a page of guides; append=true continues from the last cursor
+function loadGuides(append) {
+    const container = document.getElementById('guidesContainer');
+    if (!container) return;
+
+    const place = document.getElementById('nearPlaceInput')?.value.trim() || '';
+    if (place) {
+        loadGuidesNear(place);
+        return;
+    }
+
+    const params = new URLSearchParams();
+    const district = document.getElementById('districtSelect')?.value || '';
+    const tourType = document.getElementById('tourTypeSelect')?.value || '';
+    const sort = document.getElementById('guideSortSelect')?.value || '';
+    if (district) params.set('location', district);
+    if (tourType) params.set('specialization', tourType);
+    if (sort) params.set('sort', sort);
+    // Only guides free for the whole trip; the departure day itself is not a tour day
+    const startDate = document.getElementById('travelStartDate')?.value || '';
+    const endDate = document.getElementById('travelEndDate')?.value || '';
+    if (startDate && endDate && endDate > startDate) {
+        params.set('start', startDate);
+        params.set('end', endDate);
+    }
+    if (append && guideSearch.cursor) params.set('cursor', guideSearch.cursor);
+
+    // Ignore responses that arrive after the filters have changed again
+    const requestId = ++guideSearch.requestId;
+    const loadMoreBtn = document.getElementById('loadMoreGuides');
+    if (loadMoreBtn) loadMoreBtn.disabled = true;
+
+    fetch(`/api/guides?${params.toString()}`)
+        .then(response => response.json())
+        .then(data => {
+            if (requestId !== guideSearch.requestId) return;
+            if (!data.success) throw new Error(data.message || 'Could not load guides');
+
+            if (!append) container.innerHTML = '';
+            container.insertAdjacentHTML('beforeend', data.guides.map(renderGuideCard).join(''));
+            guideSearch.cursor = data.next_cursor;
+
+            const emptyState = document.getElementById('guidesEmptyState');
+            if (emptyState) emptyState.style.display = container.children.length ? 'none' : 'block';
+            if (loadMoreBtn) loadMoreBtn.style.display = data.has_more ? 'inline-block' : 'none';
+        })
+        .catch(error => {
+            console.error('Error loading guides:', error);
+            showToast('Could not load guides. Please try again.', 'error');
+        })
+        .finally(() => {
+            if (loadMoreBtn) loadMoreBtn.disabled = false;
+        });
+}
+
+// Guides within the chosen radius of a place, nearest district first (one page)
+function loadGuidesNear(place) {
+    const container = document.getElementById('guidesContainer');
+    const params = new URLSearchParams({ place: place });
+    params.set('km', document.getElementById('nearRadiusSelect')?.value || '50');
+    const startDate = document.getElementById('travelStartDate')?.value || '';
+    const endDate = document.getElementById('travelEndDate')?.value || '';
+    if (startDate && endDate && endDate > startDate) {
+        params.set('start', startDate);
+        params.set('end', endDate);
+    }
+
+    const requestId = ++guideSearch.requestId;
+    const loadMoreBtn = document.getElementById('loadMoreGuides');
+    if (loadMoreBtn) loadMoreBtn.style.display = 'none';
+
+    fetch(`/api/guides/near?${params.toString()}`)
+        .then(response => response.json())
+        .then(data => {
+            if (requestId !== guideSearch.requestId) return;
+            // Unknown places (still being typed) leave the current list alone
+            if (!data.success) return;
+            container.innerHTML = data.guides.map(renderGuideCard).join('');
+            guideSearch.cursor = null;
+            const emptyState = document.getElementById('guidesEmptyState');
+            if (emptyState) emptyState.style.display = container.children.length ? 'none' : 'block';
+        })
+        .catch(error => {
+            console.error('Error loading guides:', error);
+            showToast('Could not load guides. Please try again.', 'error');
+        });
+}
+
+function guideSpecialtyBadge(specialization) {
+    if (!specialization) return '';
+    if (specialization.includes('Wildlife')) return '<span class="badge bg-success">🦌 Wildlife Expert</span>';
+    if (specialization.includes('Cultural')) return '<span class="badge bg-primary">🏛️ Cultural Guide</span>';
+    if (specialization.includes('Adventure')) return '<span class="badge bg-warning">⛰️ Adventure Guide</span>';
+    if (specialization.includes('Photography')) return '<span class="badge bg-info">📸 Photo Guide</span>';
+    if (specialization.includes('Spiritual')) return '<span class="badge bg-secondary">🙏 Spiritual Guide</span>';
+    return '';
+}
+
+// Responsive <picture> for a guide upload, mirroring the upload_image macro;
+// uses the original file until the image pipeline has built variants
+function uploadImageHtml(content, className, sizes) {
+    const meta = content.image_variants;
+    const alt = escapeHtml(content.title);
+    if (!meta || !meta.variants) {
+        return `<img src="/static/${content.image_path}" class="${className}" alt="${alt}" loading="lazy" decoding="async">`;
+    }
+    const srcset = fmt => Object.values(meta.variants)
+        .filter((variant, i, all) => all.findIndex(other => other.width === variant.width) === i)
+        .sort((a, b) => a.width - b.width)
+        .map(variant => `/static/${variant[fmt]} ${variant.width}w`)
+        .join(', ');
+    const fallback = meta.variants.full || meta.variants.card;
+    return `
+        <picture>
+            <source type="image/webp" srcset="${srcset('webp')}" sizes="${sizes}">
+            <img src="/static/${fallback.jpeg}" srcset="${srcset('jpeg')}" sizes="${sizes}"
+                 width="${fallback.width}" height="${fallback.height}"
+                 class="${className}" alt="${alt}" decoding="async">
+        </picture>`;
+}
+
+// Markup for one guide card, matching the original server-rendered card
+function renderGuideCard(guide) {
+    const name = escapeHtml(guide.guide_name || guide.username);
+    const location = escapeHtml(guide.location || 'All Jharkhand');
+    const specialization = escapeHtml(guide.specialization || 'General Tourism');
+
+    return `
+        <div class="col-lg-4 col-md-6 mb-4 guide-card" data-location="${location}" data-specialization="${specialization}">
+            <div class="card h-100 shadow-sm">
+                <div class="card-header bg-light">
+                    <div class="d-flex align-items-center">
+                        <div class="guide-avatar me-3">
+                            <i class="fas fa-user-circle fa-3x text-primary"></i>
+                        </div>
+                        <div>
+                            <h6 class="mb-1">${name}</h6>
+                            <small class="text-muted">
+                                <i class="fas fa-map-pin"></i> ${location}
+                            </small>
+                        </div>
+                    </div>
+                </div>
+
+                <div class="card-body">
+                    <div class="guide-details">
+                        <p class="mb-2">
+                            <i class="fas fa-star text-warning"></i>
+                            <strong>Specialization:</strong> ${specialization}
+                        </p>
+                        ${Number(guide.review_count) ? `
+                        <p class="mb-2">
+                            <i class="fas fa-thumbs-up text-warning"></i>
+                            <strong>Rating:</strong> ${escapeHtml(Number(guide.rating).toFixed(1))} / 5
+                            <small class="text-muted">(${Number(guide.review_count)} review${Number(guide.review_count) === 1 ? '' : 's'})</small>
+                        </p>` : ''}
+                        ${guide.experience_years ? `
+                        <p class="mb-2">
+                            <i class="fas fa-clock text-info"></i>
+                            <strong>Experience:</strong> ${escapeHtml(guide.experience_years)} years
+                        </p>` : ''}
+                        ${guide.languages_spoken ? `
+                        <p class="mb-2">
+                            <i class="fas fa-language text-success"></i>
+                            <strong>Languages:</strong> ${escapeHtml(guide.languages_spoken)}
+                        </p>` : ''}
+                        ${Number(guide.price_per_day) ? `
+                        <div class="price-tag mb-3">
+                            <div class="d-flex justify-content-between align-items-center p-2 bg-light rounded">
+                                <span><i class="fas fa-rupee-sign text-success"></i> Per Day Rate:</span>
+                                <strong class="text-success">₹${escapeHtml(guide.price_per_day)}</strong>
+                            </div>
+                        </div>` : ''}
+                        <div class="guide-badges mb-3">
+                            <span class="badge bg-success">Available</span>
+                            ${guideSpecialtyBadge(guide.specialization)}
+                            ${guide.distance_km == null ? '' : guide.distance_km === 0
+                                ? '<span class="badge bg-info">📍 Local Guide</span>'
+                                : `<span class="badge bg-info">📍 ${escapeHtml(guide.distance_km)} km away</span>`}
+                        </div>
+                    </div>
+                </div>
+
+                <div class="card-footer bg-transparent">
+                    <button class="btn btn-primary w-100" data-guide-name="${name}"
+                            onclick="bookGuide(${Number(guide.user_id)}, this.dataset.guideName)">
+                        <i class="fas fa-calendar-plus"></i> Book This Guide
+                    </button>
+                </div>
+            </div>
+        </div>
+    `;
 }
 
 // Add event listener for tour type filter
@@ -455,7 +654,7 @@ function viewContent(contentId) {
                     <div class="row">
                         ${content.image_path ? `
                             <div class="col-12 mb-3">
-                                <img src="/static/${content.image_path}" class="img-fluid rounded" alt="${content.title}">
+                                ${uploadImageHtml(content, 'img-fluid rounded', '(min-width: 992px) 800px, 100vw')}
                             </div>
                         ` : ''}
                         <div class="col-12">
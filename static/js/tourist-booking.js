@@ -0,0 +1,86 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('bookingForm');
+    const arrivalDateInput = document.getElementById('arrivalDate');
+    const daysToStaySelect = document.getElementById('daysToStay');
+    const groupSizeSelect = document.getElementById('groupSize');
+    const guidePrice = Number(form.dataset.guidePrice) || 2000;
+    
+    // Set minimum date to today
+    const today = new Date().toISOString().split('T')[0];
+    arrivalDateInput.min = today;
+    
+    // Cost calculation
+    function updateCost() {
+        const days = parseInt(daysToStaySelect.value) || 1;
+        const groupSize = parseInt(groupSizeSelect.value) || 1;
+        
+        document.getElementById('selectedDays').textContent = days + ' day' + (days > 1 ? 's' : '');
+        document.getElementById('selectedGroupSize').textContent = groupSize + ' person' + (groupSize > 1 ? 's' : '');
+        
+        const totalCost = guidePrice * days;
+        document.getElementById('totalCost').textContent = '₹' + totalCost.toLocaleString();
+    }
+    
+    // Event listeners for cost calculation
+    daysToStaySelect.addEventListener('change', updateCost);
+    groupSizeSelect.addEventListener('change', updateCost);
+    
+    // Form validation
+    form.addEventListener('submit', function(e) {
+        const agreeTerms = document.getElementById('agreeBookingTerms').checked;
+        const arrivalDate = arrivalDateInput.value;
+        const daysToStay = daysToStaySelect.value;
+        
+        if (!agreeTerms) {
+            e.preventDefault();
+            alert('Please agree to the booking terms and conditions.');
+            return false;
+        }
+        
+        if (!arrivalDate) {
+            e.preventDefault();
+            alert('Please select your arrival date.');
+            arrivalDateInput.focus();
+            return false;
+        }
+        
+        if (!daysToStay) {
+            e.preventDefault();
+            alert('Please select the duration of your tour.');
+            daysToStaySelect.focus();
+            return false;
+        }
+        
+        // Check if arrival date is not in the past
+        const selectedDate = new Date(arrivalDate);
+        const currentDate = new Date();
+        currentDate.setHours(0, 0, 0, 0);
+        
+        if (selectedDate < currentDate) {
+            e.preventDefault();
+            alert('Please select a future date for your arrival.');
+            arrivalDateInput.focus();
+            return false;
+        }
+        
+        // Show loading state
+        const submitBtn = document.getElementById('submitBooking');
+        submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Sending Request...';
+        submitBtn.disabled = true;
+        
+        return true;
+    });
+    
+    // Phone number formatting
+    const phoneInput = document.querySelector('input[name="phone"]');
+    phoneInput.addEventListener('input', function() {
+        let value = this.value.replace(/\D/g, '');
+        if (value.length > 10) {
+            value = value.slice(0, 10);
+        }
+        this.value = value;
+    });
+    
+    // Initial cost calculation
+    updateCost();
+});
@@ -0,0 +1,138 @@
+"""Shared fixtures: an application wired to an in-memory stand-in for MySQL
+
+    python -m pytest -q
+
+Nothing here needs a database server. FakeConnection records every statement
+it is given and answers queries from canned rows, so a test sets up the rows
+a route should see and then checks which statements it ran.
+"""
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from config import Config  # noqa: E402
+
+
+class TestConfig(Config):
+    TESTING = True
+    SECRET_KEY = 'test'
+    MYSQL_HOST = '127.0.0.1'
+
+
+class FakeCursor:
+    """Dictionary, prepared or plain cursor over FakeConnection's answers"""
+
+    def __init__(self, connection, dictionary=False):
+        self.connection = connection
+        self.dictionary = dictionary
+        self.rows = []
+        self.column_names = ()
+        self.rowcount = 0
+        self.lastrowid = 1
+
+    def execute(self, sql, params=()):
+        sql = ' '.join(sql.split())
+        self.connection.statements.append((sql, tuple(params or ())))
+        rows = self.connection.respond(sql, params)
+        if isinstance(rows, int):
+            self.rows, self.rowcount = [], rows
+            return
+        rows = [dict(row) for row in rows]
+        self.rowcount = len(rows)
+        self.column_names = tuple(rows[0]) if rows else ()
+        self.rows = rows if self.dictionary else [tuple(row.values()) for row in rows]
+
+    def executemany(self, sql, seq_params):
+        for params in seq_params:
+            self.execute(sql, params)
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """A MySQL connection that records statements and answers them from canned rows"""
+
+    connection_id = 1
+    in_transaction = False
+
+    def __init__(self):
+        self.statements = []  # (sql with whitespace collapsed, params)
+        self.commits = 0
+        self.rollbacks = 0
+        self._answers = []
+
+    def answer(self, fragment, rows):
+        """Answer statements containing fragment with rows: dicts, a rowcount, or f(sql, params) giving either"""
+        self._answers.insert(0, (fragment, rows))
+
+    def respond(self, sql, params):
+        for fragment, rows in self._answers:
+            if fragment in sql:
+                return rows(sql, params) if callable(rows) else rows
+        return []
+
+    def executed(self, fragment):
+        """The (sql, params) of every statement run so far that contains fragment"""
+        return [(sql, params) for sql, params in self.statements if fragment in sql]
+
+    def cursor(self, dictionary=False, prepared=False, **kwargs):
+        return FakeCursor(self, dictionary)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def start_transaction(self, **kwargs):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def database():
+    connection = FakeConnection()
+    connection.answer('SELECT NOW()', [{'now': datetime(2026, 1, 1)}])
+    return connection
+
+
+def make_app(database, config=TestConfig):
+    """An application whose connection pool hands out the fake database"""
+    app = create_app(config)
+    services = app.extensions['jharkhand']
+    services.db_pool.acquire = lambda: database
+    services.db_pool.release = lambda connection, rollback=False: None
+    return app
+
+
+@pytest.fixture
+def app(database):
+    return make_app(database)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def log_in(client, user_type, user_id=1, username='user', full_name='Test User'):
+    with client.session_transaction() as session:
+        session.update(user_id=user_id, user_type=user_type, username=username, full_name=full_name)
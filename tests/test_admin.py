@@ -0,0 +1,92 @@
+"""Admin dashboard tables: keyset paging and index-backed search (views/admin.py)"""
+import sqlite3
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from conftest import log_in
+from views.admin import ADMIN_PAGE_SIZE, keyset_after
+
+
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+def test_keyset_pages_cover_a_nullable_column(order):
+    # SQLite sorts NULLs like MySQL: first ascending, last descending
+    db = sqlite3.connect(':memory:')
+    db.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    db.executemany("INSERT INTO t VALUES (?, ?)",
+                   [(1, 'b'), (2, None), (3, 'a'), (4, 'b'), (5, None), (6, 'c'), (7, 'a'), (8, None)])
+    everything = [row[0] for row in db.execute(f"SELECT id FROM t ORDER BY v {order}, id {order}")]
+
+    seen, where, params = [], '', []
+    while True:
+        rows = list(db.execute(f"SELECT id, v FROM t {where} ORDER BY v {order}, id {order} LIMIT 3", params))
+        seen += [row_id for row_id, _ in rows]
+        if len(rows) < 3:
+            break
+        condition, params = keyset_after('v', 'id', order, rows[-1][1], rows[-1][0])
+        where = 'WHERE ' + condition.replace('%s', '?')
+    assert seen == everything
+
+
+def user(user_id):
+    return {'id': user_id, 'username': f'user{user_id}', 'full_name': None, 'email': None, 'user_type': 'tourist',
+            'created_at': datetime(2026, 1, 1)}
+
+
+@pytest.fixture
+def admin(client, database):
+    log_in(client, 'admin')
+    database.answer('COUNT(*) as total', [{'total': 0}])
+    database.answer('GROUP BY user_type', [{'user_type': 'tourist', 'total': 26}])
+    database.answer('FROM users u', [user(user_id) for user_id in range(100, 100 - ADMIN_PAGE_SIZE - 1, -1)])
+    return client
+
+
+def users_page(database):
+    (sql, params), = database.executed('SELECT u.* FROM users u')
+    return sql, params
+
+
+def test_pages_are_not_counted(admin, database):
+    response = admin.get('/admin_dashboard')
+    assert response.status_code == 200
+    assert not database.executed('COUNT(*) as total FROM users u')
+    sql, params = users_page(database)
+    assert 'WHERE' not in sql
+    assert params == (ADMIN_PAGE_SIZE + 1,)
+    assert 'user76' in response.get_data(as_text=True)
+    assert 'user75' not in response.get_data(as_text=True)
+
+
+def test_next_link_continues_after_the_last_row(admin, database):
+    page = admin.get('/admin_dashboard').get_data(as_text=True)
+    start = page.index('users_cursor=')
+    link = page[page.rindex('href="', 0, start) + len('href="'):page.index('"', start)].replace('&amp;', '&')
+    database.statements.clear()
+
+    assert admin.get(link).status_code == 200
+    sql, params = users_page(database)
+    assert 'WHERE (u.created_at < %s OR (u.created_at = %s AND u.id < %s) OR u.created_at IS NULL)' in sql
+    assert params == ('2026-01-01 00:00:00', '2026-01-01 00:00:00', 76, ADMIN_PAGE_SIZE + 1)
+    assert parse_qs(urlparse(link).query)['tab'] == ['users']
+
+
+def test_search_is_a_union_of_prefix_matches(admin, database):
+    admin.get('/admin_dashboard?users_q=asha')
+    sql, params = users_page(database)
+    assert sql.count(' UNION ') == 2
+    assert ' OR ' not in sql
+    assert params == ('asha%', 'asha%', 'asha%', ADMIN_PAGE_SIZE + 1)
+
+
+def test_enum_columns_sort_as_text(admin, database):
+    admin.get('/admin_dashboard?users_sort=user_type&users_order=asc')
+    sql, _ = users_page(database)
+    assert 'ORDER BY CAST(u.user_type AS CHAR) ASC, u.id ASC' in sql
+
+
+def test_malformed_cursor_starts_over(admin, database):
+    admin.get('/admin_dashboard?users_cursor=garbage')
+    sql, _ = users_page(database)
+    assert 'WHERE' not in sql
@@ -0,0 +1,60 @@
+"""ASGI entry point plumbing (asgi.py)"""
+import asyncio
+
+import pytest
+
+import asgi
+from conftest import TestConfig, make_app
+
+
+class ProxiedConfig(TestConfig):
+    PROXY_COUNT = 1
+
+
+def environ(**headers):
+    return {'REQUEST_METHOD': 'GET', 'REMOTE_ADDR': '10.0.0.1', 'wsgi.url_scheme': 'http',
+            'HTTP_HOST': 'jharkhand.example', **headers}
+
+
+def test_async_views_see_the_client_behind_a_trusted_proxy(database):
+    fix = asgi.proxy_fix_for(make_app(database, ProxiedConfig))
+    forwarded = environ(HTTP_X_FORWARDED_FOR='203.0.113.9', HTTP_X_FORWARDED_PROTO='https')
+    fix(forwarded)
+    assert forwarded['REMOTE_ADDR'] == '203.0.113.9'
+    assert forwarded['wsgi.url_scheme'] == 'https'
+
+
+def test_forwarded_headers_are_ignored_without_a_trusted_proxy(database):
+    fix = asgi.proxy_fix_for(make_app(database))
+    forwarded = environ(HTTP_X_FORWARDED_FOR='203.0.113.9', HTTP_X_FORWARDED_PROTO='https')
+    fix(forwarded)
+    assert forwarded['REMOTE_ADDR'] == '10.0.0.1'
+    assert forwarded['wsgi.url_scheme'] == 'http'
+
+
+@pytest.mark.parametrize('path, served_async', [('/', True), ('/login/tourist', False)])
+def test_only_async_views_are_fixed_here(monkeypatch, path, served_async):
+    fixed, served = [], []
+
+    async def run_async_view(view, view_args, environ, send):
+        served.append('async')
+
+    async def run_wsgi(environ, send):
+        served.append('wsgi')
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        pass
+
+    monkeypatch.setattr(asgi, 'fix_proxy_headers', fixed.append)
+    monkeypatch.setattr(asgi, 'run_async_view', run_async_view)
+    monkeypatch.setattr(asgi, 'run_wsgi', run_wsgi)
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': [],
+             'client': ('10.0.0.1', 50000)}
+    asyncio.run(asgi.application(scope, receive, send))
+
+    assert served == ['async' if served_async else 'wsgi']
+    # The WSGI app applies its own ProxyFix
+    assert len(fixed) == (1 if served_async else 0)
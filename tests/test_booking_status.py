@@ -0,0 +1,93 @@
+"""Guide booking status changes (/update_booking_status) and the notifications they queue"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from conftest import log_in
+
+ARRIVAL = date.today() + timedelta(days=30)
+
+
+def booking(status):
+    return {'id': 7, 'arrival_date': ARRIVAL, 'departure_date': ARRIVAL + timedelta(days=3), 'booking_status': status,
+            'created_at': datetime(2026, 1, 10), 'days_to_stay': 3, 'group_size': 2, 'price_per_day': 1500,
+            'tourist_name': 'Asha', 'phone': '9000000000', 'email': 'asha@example.com'}
+
+
+@pytest.fixture
+def guide(client):
+    log_in(client, 'guide', user_id=3, username='guide', full_name='Ravi')
+    return client
+
+
+def change_status(client, database, current, status):
+    database.answer('FROM bookings WHERE id = %s AND guide_id = %s FOR UPDATE', [booking(current)])
+    response = client.get(f'/update_booking_status/7/{status}')
+    assert response.status_code == 302
+    return response
+
+
+def flashes(client):
+    with client.session_transaction() as session:
+        return [message for _, message in session.get('_flashes', [])]
+
+
+@pytest.mark.parametrize('current, status', [
+    ('pending', 'confirmed'), ('pending', 'cancelled'), ('confirmed', 'completed'), ('confirmed', 'cancelled'),
+])
+def test_allowed_transition_updates_the_booking_and_queues_a_notification(guide, database, current, status):
+    change_status(guide, database, current, status)
+
+    assert database.executed('UPDATE bookings SET booking_status')[0][1] == (status, 7, 3)
+    assert database.executed('INSERT INTO guide_booking_stats')
+    (_, message), = database.executed('INSERT INTO notification_outbox')
+    assert message[0] == f'booking_{status}'
+    assert message[1] == 7
+    assert message[3] == 'asha@example.com'
+    assert database.commits == 1
+
+
+@pytest.mark.parametrize('status', ['pending', 'confirmed', 'completed', 'cancelled'])
+def test_repeated_status_changes_nothing(guide, database, status):
+    change_status(guide, database, status, status)
+
+    assert flashes(guide) == [f'This booking is already {status}.']
+
+    assert not database.executed('UPDATE bookings')
+    assert not database.executed('INSERT INTO guide_booking_stats')
+    assert not database.executed('INSERT INTO notification_outbox')
+    assert database.commits == 0
+
+
+@pytest.mark.parametrize('current, status', [
+    ('pending', 'completed'), ('confirmed', 'pending'), ('completed', 'cancelled'), ('cancelled', 'confirmed'),
+])
+def test_disallowed_transition_is_refused(guide, database, current, status):
+    change_status(guide, database, current, status)
+
+    assert not database.executed('UPDATE bookings')
+    assert not database.executed('INSERT INTO notification_outbox')
+
+
+def test_unknown_status_is_refused(guide, database):
+    guide.get('/update_booking_status/7/approved')
+    assert not database.statements
+
+
+def test_other_guides_booking_is_refused(guide, database):
+    guide.get('/update_booking_status/7/confirmed')
+
+    assert database.executed('FOR UPDATE')[0][1] == (7, 3)
+    assert not database.executed('UPDATE bookings')
+    assert not database.executed('INSERT INTO notification_outbox')
+
+
+def test_confirming_over_a_confirmed_booking_is_refused(guide, database):
+    database.answer("WHERE booking_status <> 'cancelled'", [
+        {'id': 5, 'guide_id': 3, 'arrival_date': ARRIVAL + timedelta(days=1),
+         'departure_date': ARRIVAL + timedelta(days=5), 'booking_status': 'confirmed'},
+    ])
+    change_status(guide, database, 'pending', 'confirmed')
+
+    assert not database.executed('UPDATE bookings')
+    assert not database.executed('INSERT INTO notification_outbox')
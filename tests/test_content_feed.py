@@ -0,0 +1,109 @@
+"""The published content feed (/all_content and /api/content/feed) and its keyset cursor"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from repository import STATEMENTS, content_feed_statement
+
+START = datetime(2026, 1, 1)
+DISTRICTS = [
+    {'name': 'Ranchi', 'headquarters': 'Ranchi', 'latitude': 23.34, 'longitude': 85.31},
+    {'name': 'Deoghar', 'headquarters': 'Deoghar', 'latitude': 24.48, 'longitude': 86.70},
+]
+
+
+def upload(upload_id):
+    # Three uploads share each upload_date, so pages have to break ties on id
+    return {'id': upload_id, 'guide_id': 3, 'upload_type': ('event', 'photo', 'location')[upload_id % 3],
+            'title': f'Upload {upload_id}', 'description': '', 'image_path': None, 'image_variants': None,
+            'location': 'Ranchi' if upload_id % 2 else 'Deoghar',
+            'upload_date': START + timedelta(hours=upload_id // 3), 'updated_at': START,
+            'guide_name': 'Ravi', 'guide_username': 'ravi'}
+
+
+UPLOADS = [upload(upload_id) for upload_id in range(1, 51)]
+
+
+def newest_first(uploads):
+    return sorted(uploads, key=lambda row: (row['upload_date'], row['id']), reverse=True)
+
+
+def feed_page(sql, params):
+    """What MySQL would return for a content feed statement"""
+    *filters, after_date, _, after_id, limit = params
+    filters = iter(filters)
+    upload_type = next(filters) if 'gu.upload_type = %s' in sql else None
+    location = next(filters) if 'gu.location = %s' in sql else None
+    rows = [row for row in UPLOADS
+            if (row['upload_date'], row['id']) < (after_date, after_id)
+            and upload_type in (None, row['upload_type']) and location in (None, row['location'])]
+    return newest_first(rows)[:limit]
+
+
+@pytest.fixture
+def feed(database):
+    database.answer('FROM guide_uploads gu JOIN users u', feed_page)
+    database.answer('FROM districts', DISTRICTS)
+    return database
+
+
+def walk(client, query=''):
+    """Every page of the feed API: the ids on each page"""
+    pages, cursor = [], None
+    while True:
+        response = client.get(f'/api/content/feed?limit=7{query}' + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        page = response.get_json()
+        pages.append([row['id'] for row in page['content']])
+        assert page['has_more'] == (page['next_cursor'] is not None)
+        if not page['has_more']:
+            return pages
+        cursor = page['next_cursor']
+
+
+@pytest.mark.parametrize('upload_type, location', [('', ''), ('photo', ''), ('', 'Ranchi'), ('event', 'Deoghar')])
+def test_statement_variants_take_their_filters(upload_type, location):
+    name, filters = content_feed_statement(upload_type, location)
+    assert filters == [value for value in (upload_type, location) if value]
+    assert STATEMENTS[name].count('%s') == len(filters) + 4
+
+
+def test_pages_cover_the_feed_without_gaps_or_repeats(client, feed):
+    pages = walk(client)
+    assert [len(page) for page in pages] == [7] * 7 + [1]
+    assert [upload_id for page in pages for upload_id in page] == [row['id'] for row in newest_first(UPLOADS)]
+
+
+@pytest.mark.parametrize('query, upload_type, location', [
+    ('&type=photo', 'photo', None), ('&location=Ranchi', None, 'Ranchi'),
+    ('&type=event&location=Deoghar', 'event', 'Deoghar'),
+])
+def test_filtered_pages_cover_the_filtered_feed(client, feed, query, upload_type, location):
+    expected = [row['id'] for row in newest_first(UPLOADS)
+                if upload_type in (None, row['upload_type']) and location in (None, row['location'])]
+    assert [upload_id for page in walk(client, query) for upload_id in page] == expected
+
+
+def test_unknown_filters_are_ignored(client, feed):
+    client.get('/api/content/feed?type=video&location=Atlantis')
+    (sql, _), = feed.executed('FROM guide_uploads gu JOIN users u')
+    assert sql == ' '.join(STATEMENTS['content_feed'].split())
+
+
+def test_first_page_uses_the_keyset_condition(client, feed):
+    client.get('/api/content/feed?limit=5&type=photo')
+    (_, params), = feed.executed('FROM guide_uploads gu JOIN users u')
+    assert params[0] == 'photo'
+    assert params[-1] == 6
+
+
+def test_bad_cursor_is_rejected(client, feed):
+    response = client.get('/api/content/feed?cursor=not-a-cursor')
+    assert response.status_code == 400
+    assert not feed.executed('FROM guide_uploads gu JOIN users u')
+
+
+def test_all_content_renders_the_first_page(client, feed):
+    response = client.get('/all_content')
+    assert response.status_code == 200
+    assert 'Upload 50' in response.get_data(as_text=True)
@@ -0,0 +1,78 @@
+"""Guide search filters (repository.guide_search and /api/guides)"""
+import sqlite3
+
+import pytest
+
+from conftest import log_in
+from repository import guide_search
+
+GUIDES = [
+    # user_id, full_name, location, specialization, languages_spoken, price_per_day, rating, availability_status
+    (1, 'Ranchi Guide', 'Ranchi', 'Waterfalls', 'Hindi, English', 1500, 4.5, 'available'),
+    (2, 'Statewide Guide', 'All Jharkhand', 'Wildlife', 'Hindi', 2500, 4.9, 'available'),
+    (3, 'Roaming Guide', None, 'Temples', 'Santhali', 1000, 3.0, 'available'),
+    (4, 'Deoghar Guide', 'Deoghar', 'Temples', 'Hindi', 1200, 4.0, 'available'),
+    (5, 'Busy Ranchi Guide', 'Ranchi', 'Waterfalls', 'English', 1800, 4.8, 'busy'),
+]
+
+
+@pytest.fixture
+def guides_db():
+    """The users and guides tables in SQLite, enough to run guide_search() SQL"""
+    db = sqlite3.connect(':memory:')
+    db.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, full_name TEXT, username TEXT, user_type TEXT)")
+    db.execute("""CREATE TABLE guides (user_id INTEGER, specialization TEXT, experience_years INTEGER,
+                                       languages_spoken TEXT, location TEXT, price_per_day REAL, rating REAL,
+                                       review_count INTEGER, availability_status TEXT)""")
+    for user_id, name, location, specialization, languages, price, rating, status in GUIDES:
+        db.execute("INSERT INTO users VALUES (?, ?, ?, 'guide')", (user_id, name, f'guide{user_id}'))
+        db.execute("INSERT INTO guides VALUES (?, ?, 5, ?, ?, ?, ?, 0, ?)",
+                   (user_id, specialization, languages, location, price, rating, status))
+    yield db
+    db.close()
+
+
+def search(db, sort='rating', limit=10, **filters):
+    sql, params = guide_search(sort, limit, **filters)
+    return [row[0] for row in db.execute(sql.replace('%s', '?'), params)]
+
+
+def test_location_filter_keeps_guides_covering_every_district(guides_db):
+    assert search(guides_db, location='Ranchi') == [2, 1, 3]
+
+
+def test_no_location_filter_returns_every_available_guide(guides_db):
+    assert search(guides_db) == [2, 1, 4, 3]
+
+
+def test_filters_combine(guides_db):
+    assert search(guides_db, location='Deoghar', specialization='temple') == [4, 3]
+    assert search(guides_db, language='hindi', max_price=2000) == [1, 4]
+    assert search(guides_db, min_rating=4.2, exclude={2}) == [1]
+
+
+def test_keyset_pages_follow_the_sort_order(guides_db):
+    sql, params = guide_search('price_low', 2)
+    first = list(guides_db.execute(sql.replace('%s', '?'), params))
+    assert [row[0] for row in first] == [3, 4]
+    last = first[-1]
+    assert search(guides_db, sort='price_low', after=(last[-1], last[0])) == [1, 2]
+
+
+def test_api_passes_the_location_filter(client, database):
+    log_in(client, 'tourist')
+    database.answer('FROM users u JOIN guides g', [
+        {'user_id': 2, 'guide_name': 'Statewide Guide', 'location': 'All Jharkhand', 'sort_value': 4.9},
+    ])
+    response = client.get('/api/guides?location=Ranchi')
+    assert response.status_code == 200
+    assert response.get_json()['guides'] == [{'user_id': 2, 'guide_name': 'Statewide Guide',
+                                              'location': 'All Jharkhand'}]
+    (sql, params), = database.executed('FROM users u JOIN guides g')
+    assert "g.location = 'All Jharkhand'" in sql
+    assert params[0] == 'Ranchi%'
+
+
+def test_api_rejects_an_unknown_sort(client):
+    log_in(client, 'tourist')
+    assert client.get('/api/guides?sort=name').status_code == 400
@@ -0,0 +1,129 @@
+"""Outbox messages and the delivery worker (outbox.py)"""
+import pytest
+from mysql.connector import Error
+
+import outbox
+from conftest import FakeConnection
+
+
+class Sender:
+    def __init__(self, fail=()):
+        self.fail = dict(fail)  # message id -> exception to raise
+        self.sent = []
+
+    def send(self, row):
+        if row['id'] in self.fail:
+            raise self.fail[row['id']]
+        self.sent.append(row['id'])
+
+
+def claimed(*ids, attempts=1):
+    return [{'id': message_id, 'attempts': attempts, 'recipient_email': 'asha@example.com'} for message_id in ids]
+
+
+def test_status_messages_only_for_statuses_the_tourist_hears_about():
+    booking = {'id': 7, 'arrival_date': '2026-03-01', 'departure_date': '2026-03-04', 'tourist_name': 'Asha',
+               'email': 'asha@example.com', 'phone': ''}
+    assert outbox.booking_status_message(booking, 'pending', 'Ravi') is None
+    message = outbox.booking_status_message(booking, 'confirmed', 'Ravi')
+    assert message['event_type'] == 'booking_confirmed'
+    assert message['recipient_phone'] is None
+    assert 'Ravi' in message['body']
+
+
+def test_enqueue_skips_messages_nobody_can_receive():
+    connection = FakeConnection()
+    reachable = outbox.message('booking_confirmed', 7, 'Asha', '', '9000000000', 'Subject', 'Body')
+    unreachable = outbox.message('booking_confirmed', 8, 'Asha', '', '', 'Subject', 'Body')
+    assert outbox.enqueue_messages(connection.cursor(), [reachable, unreachable, None]) == 1
+    (_, params), = connection.executed('INSERT INTO notification_outbox')
+    assert params[1] == 7
+
+
+def test_deliver_marks_sent_retries_and_failures():
+    connection = FakeConnection()
+    sender = Sender({2: OSError('timed out'), 3: outbox.UndeliverableError('no address')})
+    worker = outbox.OutboxWorker(connection, sender, max_attempts=8)
+
+    assert worker.deliver(claimed(1, 2, 3)) == (1, 1, 1)
+    assert sender.sent == [1]
+    assert connection.executed("SET status = 'sent'")[0][1] == (1,)
+    (_, (delay, error, message_id)), = connection.executed('SET next_attempt_at')
+    assert message_id == 2 and error == 'OSError: timed out' and 1 <= delay <= 31
+    assert connection.executed("SET status = 'failed'")[0][1] == ('no address', 3)
+
+
+def test_deliver_gives_up_after_max_attempts():
+    connection = FakeConnection()
+    worker = outbox.OutboxWorker(connection, Sender({1: OSError('timed out')}), max_attempts=3)
+
+    assert worker.deliver(claimed(1, attempts=3)) == (0, 0, 1)
+    assert connection.executed("SET status = 'failed'")[0][1] == ('OSError: timed out', 1)
+
+
+def test_claim_reads_back_only_what_it_claimed():
+    connection = FakeConnection()
+    connection.answer('SET claim_token', 0)
+    assert outbox.OutboxWorker(connection, Sender()).claim() == []
+    assert not connection.executed('WHERE claim_token = %s')
+
+
+class Stop(Exception):
+    pass
+
+
+def test_run_backs_off_and_reconnects_after_database_errors(monkeypatch):
+    connection = FakeConnection()
+    reconnects = []
+    connection.reconnect = lambda attempts, delay: reconnects.append(attempts)
+    worker = outbox.OutboxWorker(connection, Sender())
+    outcomes = [Error('lost connection'), Error('still down'), Error('still down'), 0, 0]
+
+    def run_once():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if not outcomes:
+            raise Stop
+
+    monkeypatch.setattr(worker, 'run_once', run_once)
+    monkeypatch.setattr(outbox.random, 'uniform', lambda low, high: high)
+    monkeypatch.setattr(outbox.time, 'sleep', sleep)
+    with pytest.raises(Stop):
+        worker.run(poll_interval=5, reconnect_max=15)
+
+    # Doubling from the poll interval up to reconnect_max, then back to polling
+    assert sleeps == [5, 10, 15, 5, 5]
+    # Reconnecting after each failure, until a pass succeeds
+    assert len(reconnects) == 3
+
+
+def test_run_survives_a_failed_reconnect(monkeypatch):
+    def lost():
+        raise Error('lost connection')
+
+    def reconnect(attempts, delay):
+        raise Error('server gone')
+
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 4:
+            raise Stop
+
+    connection = FakeConnection()
+    connection.reconnect = reconnect
+    worker = outbox.OutboxWorker(connection, Sender())
+    monkeypatch.setattr(worker, 'run_once', lost)
+    monkeypatch.setattr(outbox.random, 'uniform', lambda low, high: high)
+    monkeypatch.setattr(outbox.time, 'sleep', sleep)
+    with pytest.raises(Stop):
+        worker.run(poll_interval=5, reconnect_max=300)
+    assert sleeps == [5, 10, 20, 40]
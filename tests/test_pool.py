@@ -0,0 +1,61 @@
+"""Connection pool checkout and release (db.ConnectionPool)"""
+import pytest
+from mysql.connector import Error, pooling
+
+from conftest import TestConfig
+from db import ConnectionPool
+
+
+class PooledConnection(pooling.PooledMySQLConnection):
+    """A pooled connection whose rollback and close can be made to fail"""
+
+    def __init__(self, rollback_error=None, close_error=None):
+        self.rollback_error = rollback_error
+        self.close_error = close_error
+        self.rolled_back = self.returned = False
+
+    def rollback(self):
+        if self.rollback_error:
+            raise self.rollback_error
+        self.rolled_back = True
+
+    def close(self):
+        if self.close_error:
+            raise self.close_error
+        self.returned = True
+
+
+@pytest.fixture
+def pool():
+    config = {name: getattr(TestConfig, name) for name in dir(TestConfig) if name.isupper()}
+    config.update(MYSQL_POOL_SIZE=1, MYSQL_POOL_MAX_OVERFLOW=0, MYSQL_POOL_TIMEOUT=0.01)
+    return ConnectionPool(config)
+
+
+def check_out(pool, connection):
+    pool._checkout = lambda: (connection, False)
+    assert pool.acquire() is connection
+    return connection
+
+
+def test_release_rolls_back_and_returns_the_connection(pool):
+    connection = check_out(pool, PooledConnection())
+    pool.release(connection)
+    assert connection.rolled_back and connection.returned
+    assert pool.stats()['in_use'] == 0
+
+
+def test_failed_rollback_still_returns_the_connection(pool):
+    connection = check_out(pool, PooledConnection(rollback_error=Error('Lost connection to MySQL server')))
+    pool.release(connection, rollback=True)
+    assert connection.returned
+    assert pool.stats()['in_use'] == 0
+    # The slot is free again
+    assert check_out(pool, PooledConnection())
+
+
+def test_failed_close_still_frees_the_slot(pool):
+    connection = check_out(pool, PooledConnection(close_error=Error('Pool is full')))
+    pool.release(connection)
+    assert pool.stats()['in_use'] == 0
+    assert check_out(pool, PooledConnection())
@@ -0,0 +1,116 @@
+"""Per-client rate limits (ratelimit.py) and the client address they key on"""
+import pytest
+
+import ratelimit
+from conftest import TestConfig, make_app
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit.time, 'monotonic', clock)
+    return clock
+
+
+def test_bucket_allows_a_burst_then_refills_evenly(clock):
+    buckets = ratelimit.TokenBuckets(shards=4)
+    assert [buckets.take('k', 3, 60) for _ in range(3)] == [0, 0, 0]
+    assert buckets.take('k', 3, 60) == pytest.approx(20)
+
+    clock.now += 20
+    assert buckets.take('k', 3, 60) == 0
+    assert buckets.take('k', 3, 60) == pytest.approx(20)
+    assert buckets.stats()['allowed'] == 4 and buckets.stats()['limited'] == 2
+
+
+def test_buckets_are_independent_per_key(clock):
+    buckets = ratelimit.TokenBuckets()
+    assert buckets.take('a', 1, 60) == 0
+    assert buckets.take('a', 1, 60) > 0
+    assert buckets.take('b', 1, 60) == 0
+
+
+def test_full_buckets_are_swept(clock, monkeypatch):
+    monkeypatch.setattr(ratelimit, 'SWEEP_EVERY', 4)
+    buckets = ratelimit.TokenBuckets(shards=1)
+    for key in 'abc':
+        buckets.take(key, 1, 10)
+    clock.now += 10
+    buckets.take('d', 1, 10)
+    assert buckets.stats()['keys'] == 1
+    assert buckets.stats()['expired'] == 3
+
+
+def test_limiter_checks_ip_and_normalised_username(clock):
+    limiter = ratelimit.RateLimiter({'login': {'ip': (3, 60), 'username': (2, 60)}}, ratelimit.TokenBuckets())
+    assert limiter.check('login', '10.0.0.1', 'Asha') is None
+    assert limiter.check('login', '10.0.0.2', ' asha ') is None
+    assert limiter.check('login', '10.0.0.3', 'ASHA')[0] == 'username'
+
+    assert limiter.check('login', '10.0.0.1', 'ravi') is None
+    assert limiter.check('login', '10.0.0.1', 'mina') is None
+    assert limiter.check('login', '10.0.0.1', 'tara')[0] == 'ip'
+    assert limiter.check('unlimited', '10.0.0.1', 'tara') is None
+
+
+def test_admission_gate_sheds_past_its_limit():
+    gate = ratelimit.AdmissionGate(2)
+    assert gate.try_enter() and gate.try_enter()
+    assert not gate.try_enter()
+    gate.leave()
+    assert gate.try_enter()
+    assert gate.stats()['shed'] == 1
+
+
+def log_in_attempt(client, username, forwarded_for=None):
+    headers = {'X-Forwarded-For': forwarded_for} if forwarded_for else {}
+    return client.post('/login/tourist', data={'username': username, 'password': 'wrong'}, headers=headers)
+
+
+def test_login_is_limited_per_username(client):
+    responses = [log_in_attempt(client, 'asha') for _ in range(6)]
+    assert [response.status_code for response in responses] == [200] * 5 + [429]
+    assert int(responses[-1].headers['Retry-After']) >= 1
+    assert log_in_attempt(client, 'ravi').status_code == 200
+
+
+def test_login_is_limited_per_ip(client):
+    statuses = [log_in_attempt(client, f'user{number}').status_code for number in range(21)]
+    assert statuses == [200] * 20 + [429]
+
+
+def test_forwarded_for_is_ignored_without_a_trusted_proxy(client):
+    statuses = [log_in_attempt(client, f'user{number}', forwarded_for=f'203.0.113.{number}').status_code
+                for number in range(21)]
+    assert statuses[-1] == 429
+
+
+def test_forwarded_for_identifies_clients_behind_a_trusted_proxy(database):
+    class ProxiedConfig(TestConfig):
+        PROXY_COUNT = 1
+
+    client = make_app(database, ProxiedConfig).test_client()
+
+    statuses = [log_in_attempt(client, f'user{number}', forwarded_for=f'203.0.113.{number}').status_code
+                for number in range(21)]
+    assert statuses == [200] * 21
+
+
+@pytest.mark.parametrize('path', ['/', '/all_content', '/content/1'])
+def test_shed_pages_answer_503_rather_than_an_empty_page(app, client, path):
+    # Load the districts index first, so /all_content gets as far as the feed
+    client.get('/all_content?type=event')
+    admission = app.extensions['jharkhand'].admission
+    while admission.try_enter():
+        pass
+    response = client.get(path)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(app.config['ADMISSION_RETRY_AFTER'])
@@ -0,0 +1,89 @@
+"""Guide recommender sync with the database (recommend.GuideRecommender)"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import recommend
+from recommend import Criteria, GuideRecommender
+
+CLOCK = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def guide(user_id, **fields):
+    return {'user_id': user_id, 'guide_name': f'Guide {user_id}', 'specialization': 'Waterfalls',
+            'experience_years': 5, 'languages_spoken': 'Hindi, English', 'location': 'Ranchi',
+            'price_per_day': 1500, 'rating': 4.0, 'review_count': 3, 'availability_status': 'available', **fields}
+
+
+class Guides:
+    """fetch_guides() over a list of rows, recording each `since` it was asked for"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.since = []
+        self.clock = CLOCK
+
+    def __call__(self, since):
+        self.since.append(since)
+        return list(self.rows), self.clock
+
+
+@pytest.fixture
+def encoded(monkeypatch):
+    """Ids of the guide rows encoded into the matrix, in order"""
+    ids = []
+    encode = recommend.encode
+
+    def counting_encode(row, district):
+        ids.append(row['user_id'])
+        return encode(row, district)
+    monkeypatch.setattr(recommend, 'encode', counting_encode)
+    return ids
+
+
+def test_delta_sync_rereads_the_overlap_window():
+    guides = Guides([guide(1)])
+    recommender = GuideRecommender(guides, lambda location: location, sync_overlap=45)
+    recommender.refresh()
+    guides.clock = CLOCK + timedelta(seconds=10)
+    recommender.refresh(force=True)
+    recommender.refresh(force=True)
+    assert guides.since == [None, CLOCK - timedelta(seconds=45), CLOCK - timedelta(seconds=35)]
+
+
+def test_unchanged_rows_in_the_overlap_are_skipped(encoded):
+    guides = Guides([guide(1), guide(2)])
+    recommender = GuideRecommender(guides, lambda location: location)
+    recommender.refresh()
+    assert encoded == [1, 2]
+
+    # Guide 2's rating changed in a transaction that committed late
+    guides.rows = [guide(1), guide(2, rating=4.9)]
+    recommender.refresh(force=True)
+    assert encoded == [1, 2, 2]
+    top = recommender.recommend(Criteria(districts={'Ranchi'}), k=1)
+    assert [(row['user_id'], row['rating']) for row in top] == [(2, 4.9)]
+
+
+def test_a_changed_district_is_reapplied(encoded):
+    districts = {'Ranchi': None}
+    guides = Guides([guide(1)])
+    recommender = GuideRecommender(guides, districts.get)
+    recommender.refresh()
+    assert recommender.in_districts(['Ranchi']) == [('Ranchi', [])]
+
+    # The districts table gained Ranchi, so the same row now has a home district
+    districts['Ranchi'] = 'Ranchi'
+    recommender.refresh(force=True)
+    assert encoded == [1, 1]
+    assert [row['user_id'] for row in recommender.in_districts(['Ranchi'])[0][1]] == [1]
+
+
+def test_removed_guide_is_applied_again_when_it_reappears(encoded):
+    guides = Guides([guide(1)])
+    recommender = GuideRecommender(guides, lambda location: location)
+    recommender.refresh()
+    recommender.remove(1)
+    recommender.refresh(force=True)
+    assert encoded == [1, 1]
+    assert recommender.stats()['guides'] == 1
@@ -0,0 +1 @@
+"""Route blueprints, one per role: auth, content, tourist, guide and admin"""
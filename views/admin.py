@@ -0,0 +1,329 @@
+"""Admin dashboard, exports, user management and operational stats"""
+import hmac
+from datetime import date
+
+from flask import Blueprint, Response, current_app, render_template, request, redirect, url_for, session, flash, jsonify, stream_with_context
+from mysql.connector import Error
+
+import booking_stats
+import outbox
+from exports import EXPORT_TABLES, EXPORT_FORMATS, export_query, csv_chunks, json_chunks
+from extensions import (get_db_connection, repo, db_pool, admission, rate_limiter, content_cache, fragment_cache,
+                        availability, recommender, proximity, slow_query_log, response_optimizer, metrics_registry,
+                        require_user_type, invalidate_content_cache, parse_image_variants, parse_date_arg,
+                        encode_cursor, decode_cursor)
+
+bp = Blueprint('admin', __name__)
+
+# Server-side paging for the admin dashboard tables. Each table reads
+# <name>_cursor, <name>_sort, <name>_order and <name>_q from the query string;
+# sort keys map to whitelisted columns. Pages continue from a keyset position
+# on (sort column, id) and fetch one extra row to learn whether another page
+# exists, so no page view counts the table (the totals are the summary
+# counters). Search is a prefix match on each search column separately: every
+# 'search' query reads one index (migration 0013) and the union of their ids
+# is joined back to the table.
+ADMIN_PAGE_SIZE = 25
+ADMIN_TABLES = {
+    'users': {
+        'columns': "u.*",
+        'from': "users u",
+        'search': ["SELECT id FROM users WHERE username LIKE %s",
+                   "SELECT id FROM users WHERE full_name LIKE %s",
+                   "SELECT id FROM users WHERE email LIKE %s"],
+        'sorts': {'created_at': 'u.created_at', 'id': 'u.id', 'username': 'u.username',
+                  'full_name': 'u.full_name', 'user_type': 'u.user_type'},
+        'default_sort': 'created_at',
+        'id_column': 'u.id',
+    },
+    'bookings': {
+        'columns': "b.*, u1.username as tourist_username, u2.username as guide_name",
+        'from': """bookings b 
+                   JOIN users u1 ON b.tourist_id = u1.id 
+                   JOIN users u2 ON b.guide_id = u2.id""",
+        'search': ["SELECT id FROM bookings WHERE tourist_name LIKE %s",
+                   "SELECT id FROM bookings WHERE phone LIKE %s",
+                   "SELECT b.id FROM users u JOIN bookings b ON b.tourist_id = u.id WHERE u.username LIKE %s",
+                   "SELECT b.id FROM users u JOIN bookings b ON b.guide_id = u.id WHERE u.username LIKE %s"],
+        'sorts': {'created_at': 'b.created_at', 'id': 'b.id', 'arrival_date': 'b.arrival_date',
+                  'days_to_stay': 'b.days_to_stay', 'status': 'b.booking_status'},
+        'default_sort': 'created_at',
+        'id_column': 'b.id',
+    },
+    'uploads': {
+        'columns': "gu.*, u.username as guide_name",
+        'from': """guide_uploads gu 
+                   JOIN users u ON gu.guide_id = u.id""",
+        'search': ["SELECT id FROM guide_uploads WHERE title LIKE %s",
+                   "SELECT id FROM guide_uploads WHERE location LIKE %s",
+                   "SELECT gu.id FROM users u JOIN guide_uploads gu ON gu.guide_id = u.id WHERE u.username LIKE %s"],
+        'sorts': {'upload_date': 'gu.upload_date', 'id': 'gu.id', 'title': 'gu.title',
+                  'upload_type': 'gu.upload_type'},
+        'default_sort': 'upload_date',
+        'id_column': 'gu.id',
+    },
+}
+
+# ORDER BY puts an ENUM in declaration order but `<` compares it as text, so
+# these sort as text for the keyset comparison to agree with the ordering
+ENUM_COLUMNS = {'u.user_type', 'b.booking_status', 'gu.upload_type'}
+
+def keyset_after(column, id_column, order, value, row_id):
+    """(condition, params) for the rows after (value, row_id) in ORDER BY column, id_column, both in order
+
+    MySQL sorts NULLs first ascending and last descending, so a nullable sort
+    column needs its own cases.
+    """
+    comparison = '>' if order == 'asc' else '<'
+    if value is None:
+        condition = f"{column} IS NULL AND {id_column} {comparison} %s"
+        if order == 'asc':
+            condition = f"({condition}) OR {column} IS NOT NULL"
+        return f"({condition})", [row_id]
+    condition = f"{column} {comparison} %s OR ({column} = %s AND {id_column} {comparison} %s)"
+    if order == 'desc':
+        condition += f" OR {column} IS NULL"
+    return f"({condition})", [value, value, row_id]
+
+def cursor_value(value):
+    """A sort column value as it goes into a cursor; MySQL compares the strings with dates and times"""
+    return value if value is None or isinstance(value, (int, str)) else str(value)
+
+def fetch_admin_page(cursor, name):
+    """One sorted, searched page of an admin table plus its paging state"""
+    table = ADMIN_TABLES[name]
+    sort = request.args.get(f'{name}_sort', table['default_sort'])
+    if sort not in table['sorts']:
+        sort = table['default_sort']
+    order = 'asc' if request.args.get(f'{name}_order') == 'asc' else 'desc'
+    q = request.args.get(f'{name}_q', '').strip()
+    sort_column, id_column = table['sorts'][sort], table['id_column']
+    sort_expression = f'CAST({sort_column} AS CHAR)' if sort_column in ENUM_COLUMNS else sort_column
+
+    source, params = table['from'], []
+    if q:
+        source += f" JOIN ({' UNION '.join(table['search'])}) matches ON {id_column} = matches.id"
+        params = [q + '%'] * len(table['search'])
+
+    where = ''
+    position = decode_cursor(request.args.get(f'{name}_cursor'))
+    if position and len(position) == 2 and isinstance(position[1], int):
+        condition, values = keyset_after(sort_expression, id_column, order, *position)
+        where = f'WHERE {condition}'
+        params += values
+
+    # Fetch one extra row to learn whether another page exists
+    cursor.execute(f"""SELECT {table['columns']} FROM {source} {where}
+                     ORDER BY {sort_expression} {order.upper()}, {id_column} {order.upper()}
+                     LIMIT %s""", (*params, ADMIN_PAGE_SIZE + 1))
+    rows = cursor.fetchall()
+    has_more = len(rows) > ADMIN_PAGE_SIZE
+    rows = rows[:ADMIN_PAGE_SIZE]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor([cursor_value(last[sort_column.split('.')[1]]),
+                                     last[id_column.split('.')[1]]])
+    if name == 'uploads':
+        parse_image_variants(rows)
+    return {'rows': rows, 'next_cursor': next_cursor, 'first_page': where == '',
+            'sort': sort, 'order': order, 'q': q}
+
+@bp.app_template_global()
+def admin_url(**changes):
+    """Admin dashboard URL with some query arguments replaced, keeping the rest"""
+    args = request.args.to_dict()
+    args.update(changes)
+    return url_for('admin.admin_dashboard', **args)
+
+@bp.route('/admin_dashboard')
+@require_user_type('admin')
+def admin_dashboard():
+    """Admin dashboard for Jharkhand Tourism platform management"""
+    connection = get_db_connection()
+    data = {}
+    
+    if connection:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            # Summary counters come from aggregates rather than loading every row
+            users_by_type = {row.user_type: row.total for row in repo.all(connection, 'user_type_counts')}
+            total_bookings = repo.one(connection, 'booking_count').total
+            total_uploads = repo.one(connection, 'upload_count').total
+            data['stats'] = {
+                'users': sum(users_by_type.values()),
+                'guides': users_by_type.get('guide', 0),
+                'bookings': total_bookings,
+                'uploads': total_uploads,
+            }
+            
+            for name in ADMIN_TABLES:
+                data[name] = fetch_admin_page(cursor, name)
+        except Error as e:
+            print(f"Error loading admin dashboard: {e}")
+            flash('Error loading dashboard data!')
+        finally:
+            cursor.close()
+    
+    active_tab = request.args.get('tab', 'users')
+    if active_tab not in ADMIN_TABLES:
+        active_tab = 'users'
+    return render_template('admin_dashboard.html', data=data, active_tab=active_tab)
+
+@bp.route('/admin/export/<name>.<fmt>')
+@require_user_type('admin')
+def export_table(name, fmt):
+    """Stream a whole table as CSV or JSON; bookings filter by arrival dates, guide and status"""
+    if name not in EXPORT_TABLES or fmt not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'message': 'Unknown export'}), 404
+
+    conditions, params = [], []
+    if name == 'bookings':
+        start, end = parse_date_arg('start'), parse_date_arg('end')
+        if start:
+            conditions.append('b.arrival_date >= %s')
+            params.append(start)
+        if end:
+            conditions.append('b.arrival_date <= %s')
+            params.append(end)
+        status = request.args.get('status', '')
+        if status:
+            if status not in booking_stats.BOOKING_STATUSES:
+                return jsonify({'success': False, 'message': 'Invalid booking status'}), 400
+            conditions.append('b.booking_status = %s')
+            params.append(status)
+    elif name == 'users':
+        user_type = request.args.get('user_type', '')
+        if user_type:
+            conditions.append('u.user_type = %s')
+            params.append(user_type)
+    elif name == 'uploads':
+        upload_type = request.args.get('type', '')
+        if upload_type:
+            conditions.append('gu.upload_type = %s')
+            params.append(upload_type)
+    guide_id = request.args.get('guide_id', type=int)
+    if guide_id and name in ('bookings', 'uploads'):
+        conditions.append('b.guide_id = %s' if name == 'bookings' else 'gu.guide_id = %s')
+        params.append(guide_id)
+    sql, params = export_query(name, conditions, params)
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'success': False, 'message': 'Database connection failed'}), 503
+    # Unbuffered: rows stay on the server until the generator fetches them
+    cursor = connection.cursor()
+    try:
+        cursor.execute(sql, params)
+    except Error as e:
+        cursor.close()
+        print(f"Error exporting {name}: {e}")
+        return jsonify({'success': False, 'message': 'Export failed'}), 500
+
+    def generate():
+        try:
+            yield from (csv_chunks if fmt == 'csv' else json_chunks)(cursor)
+        finally:
+            try:
+                cursor.close()
+            except Error:
+                # Download abandoned mid-table; the rollback on release drains the rest
+                pass
+
+    body, encoding = response_optimizer.compress_stream(request, generate())
+    # stream_with_context keeps the request (and its pooled connection) until the last chunk
+    response = Response(stream_with_context(body), mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={name}-{date.today():%Y%m%d}.{fmt}'
+    response.headers['Cache-Control'] = 'no-store'
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+@bp.route('/delete_user/<int:user_id>')
+def delete_user(user_id):
+    """Admin function to delete users from Jharkhand Tourism platform"""
+    if 'user_id' not in session or session['user_type'] != 'admin':
+        return redirect(url_for('auth.login'))
+    
+    connection = get_db_connection()
+    if connection:
+        cursor = connection.cursor()
+        try:
+            # A guide's summary rows cascade with them; a tourist's bookings do
+            # too, so take those out of their guides' summaries first
+            booking_stats.forget_tourist_bookings(cursor, user_id)
+            # Their reviews go with the bookings; take them out of guide ratings
+            # (bumping guides.updated_at, so the recommender resyncs them)
+            repo.run(connection, 'forget_tourist_ratings', user_id)
+            repo.run(connection, 'recompute_tourist_guide_ratings', user_id)
+            repo.run(connection, 'delete_user', user_id)
+            connection.commit()
+            # Deleting a user cascades to their uploads and bookings
+            invalidate_content_cache()
+            availability.invalidate()
+            recommender.remove(user_id)
+            flash('User deleted successfully from Jharkhand Tourism platform!')
+        except Error as e:
+            connection.rollback()
+            flash(f'Delete failed: {e}')
+        finally:
+            cursor.close()
+    
+    return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/admin/pool_stats')
+@require_user_type('admin')
+def pool_stats():
+    """Database connection pool usage, for sizing the pool per worker"""
+    return jsonify({'success': True, 'stats': db_pool.stats(), 'admission': admission.stats(),
+                    'rate_limits': rate_limiter.buckets.stats()})
+
+@bp.route('/admin/cache_stats')
+@require_user_type('admin')
+def cache_stats():
+    """Hit/miss counters for the published content cache"""
+    return jsonify({'success': True, 'stats': content_cache.stats(), 'availability': availability.stats(),
+                    'fragments': fragment_cache.stats(), 'recommender': recommender.stats(),
+                    'proximity': proximity.stats()})
+
+@bp.route('/admin/outbox_stats')
+@require_user_type('admin')
+def outbox_stats():
+    """Queued, sent and failed booking notifications"""
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
+    cursor = connection.cursor(dictionary=True)
+    try:
+        stats = outbox.outbox_stats(cursor)
+    except Error as e:
+        print(f"Error loading outbox stats: {e}")
+        return jsonify({'success': False, 'message': 'Could not load outbox stats'}), 500
+    finally:
+        cursor.close()
+    return jsonify({'success': True, 'stats': stats})
+
+@bp.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint, for logged-in admins or scrapers sending the METRICS_TOKEN bearer token"""
+    token = current_app.config['METRICS_TOKEN']
+    scraper = token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not scraper and session.get('user_type') != 'admin':
+        return 'Unauthorized\n', 401, {'Content-Type': 'text/plain'}
+    return metrics_registry.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@bp.route('/admin/slow_queries')
+@require_user_type('admin')
+def slow_queries():
+    """Most recent statements slower than SLOW_QUERY_THRESHOLD_MS"""
+    return jsonify({'success': True, 'threshold_ms': current_app.config['SLOW_QUERY_THRESHOLD_MS'],
+                    'queries': slow_query_log.entries()})
+
+# Additional convenience routes for Jharkhand Tourism
+@bp.route('/test_db')
+def test_db():
+    connection = get_db_connection()
+    if not connection:
+        return "Database connection failed"
+    return f"Connected to: {repo.one(connection, 'current_database').name}"
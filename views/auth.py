@@ -0,0 +1,211 @@
+"""Login, registration and logout"""
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+from mysql.connector import Error
+
+from extensions import get_db_connection, repo, rate_limited, refresh_guide_recommendation
+
+bp = Blueprint('auth', __name__)
+
+def find_login_user(connection, username, password, user_type):
+    """The user row for matching credentials, or None"""
+    user = repo.one(connection, 'user_for_login', username, user_type)
+    if user and user['password'] == password:  # In production, use hashed passwords
+        return user
+    return None
+
+def start_user_session(user):
+    session['user_id'] = user['id']
+    session['username'] = user['username']
+    session['user_type'] = user['user_type']
+    session['full_name'] = user['full_name']
+
+# Profile given to guides who register without filling in their details
+DEFAULT_GUIDE_PROFILE = ('General Tourism', 1, 'Hindi, English', 'Ranchi District', 2000.00)
+
+def create_user(connection, user_type, username, password, full_name, phone, email, guide_profile=None):
+    """Insert a user, plus their guide profile for guides; None if the username is taken"""
+    if repo.one(connection, 'user_by_username', username):
+        return None
+    user_id = repo.run(connection, 'insert_user', username, password, user_type, full_name, phone, email).lastrowid
+    if user_type == 'guide':
+        # (specialization, experience_years, languages_spoken, location, price_per_day)
+        repo.run(connection, 'insert_guide_profile', user_id, *(guide_profile or DEFAULT_GUIDE_PROFILE))
+    return user_id
+
+# Tourist Login Route
+@bp.route('/login/tourist', methods=['GET', 'POST'])
+@rate_limited('login', 'username')
+def login_tourist():
+    """Tourist login for Jharkhand Tourism"""
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+
+        connection = get_db_connection()
+        if connection:
+            user = find_login_user(connection, username, password, 'tourist')
+            if user:
+                start_user_session(user)
+                flash('Welcome to Jharkhand Tourism! Tourist login successful!')
+                return redirect(url_for('tourist.tourist_dashboard'))
+            else:
+                flash('Invalid tourist credentials! Please check your username and password.')
+
+    return render_template('login_tourist.html')
+
+# Guide Login Route
+@bp.route('/login/guide', methods=['GET', 'POST'])
+@rate_limited('login', 'username')
+def login_guide():
+    """Guide login for Jharkhand Tourism"""
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+
+        connection = get_db_connection()
+        if connection:
+            user = find_login_user(connection, username, password, 'guide')
+            if user:
+                start_user_session(user)
+                flash('Welcome to Jharkhand Tourism! Guide login successful!')
+                return redirect(url_for('guide.guide_dashboard'))
+            else:
+                flash('Invalid guide credentials! Please check your username and password.')
+
+    return render_template('login_guide.html')
+
+# Keep the original login route for backward compatibility (redirects to tourist login)
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    """Default login - redirects to tourist login"""
+    return redirect(url_for('auth.login_tourist'))
+
+@bp.route('/register', methods=['POST'])
+@rate_limited('register')
+def register():
+    """General registration handler for Jharkhand Tourism"""
+    user_type = request.form['user_type']
+    
+    # Prevent admin registration
+    if user_type == 'admin':
+        flash('Admin registration is not allowed!')
+        return redirect(url_for('auth.login'))
+    
+    # Validate user type
+    if user_type not in ['tourist', 'guide']:
+        flash('Invalid registration type!')
+        return redirect(url_for('auth.login'))
+    
+    username = request.form['username']
+    password = request.form['password']
+    full_name = request.form['full_name']
+    phone = request.form['phone']
+    email = request.form['email']
+    
+    connection = get_db_connection()
+    if connection:
+        try:
+            # Guides get a profile automatically with Jharkhand defaults
+            user_id = create_user(connection, user_type, username, password, full_name, phone, email)
+            if not user_id:
+                flash('Username already exists! Please choose a different username.')
+                return redirect(url_for('auth.login'))
+            
+            connection.commit()
+            if user_type == 'guide':
+                refresh_guide_recommendation(connection, user_id)
+            flash(f'{user_type.title()} registration successful! Welcome to Jharkhand Tourism! Please login with your credentials.')
+        except Error as e:
+            connection.rollback()
+            flash(f'Registration failed: {e}')
+    
+    return redirect(url_for('auth.login_tourist'))
+
+# Tourist Registration Route
+@bp.route('/register/tourist', methods=['GET', 'POST'])
+@rate_limited('register')
+def register_tourist():
+    """Tourist registration for Jharkhand Tourism"""
+    if request.method == 'POST':
+        user_type = 'tourist'
+        username = request.form['username']
+        password = request.form['password']
+        full_name = request.form['full_name']
+        phone = request.form['phone']
+        email = request.form['email']
+
+        connection = get_db_connection()
+        if connection:
+            try:
+                if not create_user(connection, user_type, username, password, full_name, phone, email):
+                    flash('Username already exists! Please choose a different username.')
+                    return redirect(url_for('auth.register_tourist'))
+
+                connection.commit()
+                flash('Tourist registration successful! Welcome to Jharkhand Tourism! Please login with your credentials.')
+                return redirect(url_for('auth.login_tourist'))
+            except Error as e:
+                connection.rollback()
+                flash(f'Registration failed: {e}')
+
+    return render_template('register_tourist.html')
+
+# Guide Registration Route
+@bp.route('/register/guide', methods=['GET', 'POST'])
+@rate_limited('register')
+def register_guide():
+    """Guide registration for Jharkhand Tourism"""
+    if request.method == 'POST':
+        user_type = 'guide'
+        username = request.form['username']
+        password = request.form['password']
+        full_name = request.form['full_name']
+        phone = request.form['phone']
+        email = request.form['email']
+        specialization = request.form.get('specialization', 'General Tourism')
+        experience_years = request.form.get('experience_years', 1)
+        languages_spoken = request.form.get('languages_spoken', 'Hindi, English, Santali')
+        price_per_day = request.form.get('price_per_day', 2000)
+        location = request.form.get('location', 'Ranchi District')
+
+        connection = get_db_connection()
+        if connection:
+            try:
+                # Create guide profile automatically with Jharkhand-specific defaults
+                profile = (specialization, experience_years, languages_spoken, location, price_per_day)
+                user_id = create_user(connection, user_type, username, password, full_name, phone, email, profile)
+                if not user_id:
+                    flash('Username already exists! Please choose a different username.')
+                    return redirect(url_for('auth.register_guide'))
+
+                connection.commit()
+                refresh_guide_recommendation(connection, user_id)
+                flash('Guide registration successful! Welcome to Jharkhand Tourism platform! Please login with your credentials.')
+                return redirect(url_for('auth.login_guide'))
+            except Error as e:
+                connection.rollback()
+                flash(f'Registration failed: {e}')
+
+    return render_template('register_guide.html')
+
+@bp.route('/logout')
+def logout():
+    """Logout from Jharkhand Tourism platform"""
+    session.clear()
+    flash('You have been logged out successfully from Jharkhand Tourism platform.')
+    return redirect(url_for('content.index'))
+
+@bp.route('/access_denied')
+def access_denied():
+    """Access denied page for Jharkhand Tourism platform"""
+    return render_template('access_denied.html'), 403
+
+@bp.route('/login_tourist')
+def old_login_tourist():
+    """Backward compatibility route"""
+    return redirect(url_for('auth.login_tourist'))
+
+@bp.route('/login_guide')
+def old_login_guide():
+    """Backward compatibility route"""
+    return redirect(url_for('auth.login_guide'))
@@ -0,0 +1,194 @@
+"""Published guide content: homepage, content details, search and the content feed"""
+import re
+from datetime import datetime
+
+from flask import Blueprint, render_template, request, jsonify, get_template_attribute
+from mysql.connector import Error
+
+from extensions import (get_db_connection, repo, content_cache, proximity, parse_image_variants, encode_cursor,
+                        decode_cursor, CONTENT_CACHE_NAMESPACE, NEWEST_FIRST)
+from repository import content_feed_statement
+
+bp = Blueprint('content', __name__)
+
+def fetch_homepage_feed():
+    """Latest published guide content for the homepage"""
+    connection = get_db_connection()
+    if not connection:
+        raise Error('Database connection failed')
+    # Fetch latest published content with guide information
+    return parse_image_variants(repo.all(connection, 'homepage_feed'))
+
+def fetch_content_details(content_id):
+    """Single piece of guide content, JSON-ready, or None if it does not exist"""
+    connection = get_db_connection()
+    if not connection:
+        raise Error('Database connection failed')
+    return prepare_content_details(repo.one(connection, 'content_details', content_id))
+
+def prepare_content_details(content):
+    """Make a content_details row JSON-ready in place"""
+    # Convert datetime to string for JSON serialization
+    if content and content['upload_date']:
+        content['upload_date'] = content['upload_date'].isoformat()
+    parse_image_variants([content])
+    return content
+
+SEARCH_PAGE_SIZE = 12
+SEARCH_MAX_PAGE = 50
+SEARCH_MAX_TERMS = 10
+UPLOAD_TYPES = ('event', 'photo', 'location')
+
+def fulltext_query(text):
+    """Boolean-mode MATCH query for free text: every word, prefix-matched"""
+    # Keep only word characters so user input cannot inject +, -, ", ( or ~
+    terms = re.findall(r'\w+', text.lower())[:SEARCH_MAX_TERMS]
+    return ' '.join(f'{term}*' for term in terms)
+
+def fetch_content_search(query, upload_type, page):
+    """One page of published content matching a fulltext query, most relevant first"""
+    connection = get_db_connection()
+    if not connection:
+        raise Error('Database connection failed')
+    # Fetch one extra row to know whether another page exists
+    page_params = (SEARCH_PAGE_SIZE + 1, (page - 1) * SEARCH_PAGE_SIZE)
+    if upload_type:
+        rows = repo.all(connection, 'content_search_by_type', query, query, upload_type, *page_params)
+    else:
+        rows = repo.all(connection, 'content_search', query, query, *page_params)
+    rows = parse_image_variants(rows)
+    return {'results': rows[:SEARCH_PAGE_SIZE], 'has_more': len(rows) > SEARCH_PAGE_SIZE}
+
+FEED_PAGE_SIZE = 12
+FEED_MAX_PAGE_SIZE = 48
+
+def fetch_content_feed(upload_type, location, after, limit):
+    """A page of published content, newest first, after an (upload_date, id) keyset position"""
+    connection = get_db_connection()
+    if not connection:
+        raise Error('Database connection failed')
+    name, filters = content_feed_statement(upload_type, location)
+    after_date, after_id = after or NEWEST_FIRST
+    # Fetch one extra row to learn whether another page exists
+    rows = parse_image_variants(repo.all(connection, name, *filters, after_date, after_date, after_id, limit + 1))
+
+    content = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor([content[-1]['upload_date'], content[-1]['id']])
+    return {'content': content, 'next_cursor': next_cursor}
+
+def load_content_feed(upload_type, location, cursor, limit):
+    """fetch_content_feed() for an encoded cursor, through the content cache; None for a bad cursor"""
+    after = None
+    if cursor:
+        values = decode_cursor(cursor)
+        try:
+            after = (datetime.fromisoformat(values[0]), int(values[1]))
+        except (TypeError, ValueError, IndexError):
+            return None
+    return content_cache.get_or_load(
+        CONTENT_CACHE_NAMESPACE, ('feed', upload_type, location, cursor, limit),
+        lambda: fetch_content_feed(upload_type, location, after, limit))
+
+@bp.route('/')
+def index():
+    """Homepage - Jharkhand Tourism Platform"""
+    # Get published content from guides (served from cache between content changes)
+    published_content = []
+    try:
+        published_content = content_cache.get_or_load(
+            CONTENT_CACHE_NAMESPACE, 'homepage_feed', fetch_homepage_feed)
+    except Error as e:
+        print(f"Error fetching content: {e}")
+    
+    return render_template('index.html', published_content=published_content)
+
+@bp.route('/content/<int:content_id>')
+def get_content_details(content_id):
+    """Get detailed information about Jharkhand tourism content"""
+    try:
+        content = content_cache.get_or_load(
+            CONTENT_CACHE_NAMESPACE, ('content', content_id),
+            lambda: fetch_content_details(content_id))
+    except Error as e:
+        return jsonify({'success': False, 'message': str(e)})
+    
+    if content:
+        return jsonify({'success': True, 'content': content})
+    return jsonify({'success': False, 'message': 'Content not found'})
+
+@bp.route('/api/content/search')
+def search_content():
+    """Search published Jharkhand tourism content by title, description and location"""
+    query = fulltext_query(request.args.get('q', ''))
+    if not query:
+        return jsonify({'success': False, 'message': 'Please enter something to search for'}), 400
+
+    upload_type = request.args.get('type', '')
+    if upload_type and upload_type not in UPLOAD_TYPES:
+        return jsonify({'success': False, 'message': 'Invalid content type'}), 400
+    page = min(max(request.args.get('page', 1, type=int), 1), SEARCH_MAX_PAGE)
+
+    try:
+        # Cached with the rest of the published content, so uploads, edits and
+        # deletes invalidate search results too
+        found = content_cache.get_or_load(
+            CONTENT_CACHE_NAMESPACE, ('search', query, upload_type, page),
+            lambda: fetch_content_search(query, upload_type, page))
+    except Error as e:
+        print(f"Error searching content: {e}")
+        return jsonify({'success': False, 'message': 'Search is unavailable right now'}), 500
+
+    return jsonify({'success': True, 'results': found['results'], 'page': page,
+                    'has_more': found['has_more'] and page < SEARCH_MAX_PAGE})
+
+def known_districts():
+    """District names for the location filter, or none if the districts table cannot be read"""
+    try:
+        return proximity.districts()
+    except Error as e:
+        print(f"Error loading districts: {e}")
+        return []
+
+def content_feed_filters(districts):
+    """(upload_type, location) from the query string, ignoring unknown values"""
+    upload_type = request.args.get('type', '')
+    location = request.args.get('location', '')
+    return (upload_type if upload_type in UPLOAD_TYPES else '',
+            location if location in districts else '')
+
+@bp.route('/all_content')
+def all_content():
+    """Show all published Jharkhand tourism content, loading older pages as the visitor scrolls"""
+    districts = known_districts()
+    upload_type, location = content_feed_filters(districts)
+    page = {'content': [], 'next_cursor': None}
+    try:
+        # ?cursor= is the no-JavaScript "Show More" link; a bad one starts over
+        page = (load_content_feed(upload_type, location, request.args.get('cursor'), FEED_PAGE_SIZE)
+                or load_content_feed(upload_type, location, None, FEED_PAGE_SIZE))
+    except Error as e:
+        print(f"Error fetching content: {e}")
+
+    return render_template('all_content.html', content=page['content'], next_cursor=page['next_cursor'],
+                           upload_type=upload_type, location=location,
+                           upload_types=UPLOAD_TYPES, districts=districts)
+
+@bp.route('/api/content/feed')
+def content_feed():
+    """Published content newest first, paged by an opaque cursor; includes the rendered cards"""
+    upload_type, location = content_feed_filters(known_districts())
+    limit = min(max(request.args.get('limit', FEED_PAGE_SIZE, type=int), 1), FEED_MAX_PAGE_SIZE)
+    try:
+        page = load_content_feed(upload_type, location, request.args.get('cursor'), limit)
+    except Error as e:
+        print(f"Error fetching content feed: {e}")
+        return jsonify({'success': False, 'message': 'Could not load content'}), 500
+    if page is None:
+        return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
+
+    content_card = get_template_attribute('macros.html', 'content_card')
+    return jsonify({'success': True, 'content': page['content'],
+                    'html': ''.join(content_card(content) for content in page['content']),
+                    'has_more': page['next_cursor'] is not None, 'next_cursor': page['next_cursor']})
@@ -0,0 +1,480 @@
+"""Guide pages and APIs: dashboard, profile, booking status and content management"""
+import os
+from datetime import datetime
+
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, session, flash, jsonify
+from mysql.connector import Error
+from werkzeug.utils import secure_filename
+
+import booking_stats
+import outbox
+from extensions import (get_db_connection, repo, availability, image_pipeline, require_user_type,
+                        refresh_guide_recommendation, invalidate_content_cache, parse_image_variants,
+                        bookings_page_position, split_bookings_page, BOOKINGS_PAGE_SIZE)
+
+bp = Blueprint('guide', __name__)
+
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+def upload_path(filename):
+    """Where to save an uploaded image, creating the upload folder on first use"""
+    os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+
+@bp.route('/guide_dashboard')
+@require_user_type('guide')
+def guide_dashboard():
+    """Guide dashboard - Manage Jharkhand tourism bookings and content"""
+    guide_id = session['user_id']
+    
+    # One page of this guide's bookings, newest first; totals come from the summary
+    connection = get_db_connection()
+    bookings, next_cursor = [], None
+    earnings = None
+    if connection:
+        after_date, after_id = bookings_page_position()
+        bookings, next_cursor = split_bookings_page(
+            repo.all(connection, 'guide_bookings', guide_id, after_date, after_date, after_id,
+                     BOOKINGS_PAGE_SIZE + 1), BOOKINGS_PAGE_SIZE)
+        cursor = connection.cursor(dictionary=True)
+        earnings = booking_stats.guide_summary(cursor, guide_id)
+        cursor.close()
+    
+    return render_template('guide_dashboard.html', bookings=bookings, earnings=earnings,
+                           next_bookings_cursor=next_cursor)
+
+@bp.route('/api/guide/earnings')
+@require_user_type('guide')
+def guide_earnings():
+    """Monthly bookings, guest-days and revenue for the logged-in guide"""
+    months = min(max(request.args.get('months', 12, type=int), 1), 120)
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
+    cursor = connection.cursor(dictionary=True)
+    try:
+        summary = booking_stats.guide_summary(cursor, session['user_id'], months)
+    except Error as e:
+        print(f"Error loading guide earnings: {e}")
+        return jsonify({'success': False, 'message': 'Could not load earnings'}), 500
+    finally:
+        cursor.close()
+    return jsonify({'success': True, **summary})
+
+@bp.route('/update_guide_profile', methods=['POST'])
+@require_user_type('guide')
+def update_guide_profile():
+    """Update Jharkhand guide profile with specializations and service areas"""
+    user_id = session['user_id']
+    specialization = request.form.get('specialization', '')
+    experience_years = request.form.get('experience_years', 0)
+    languages_spoken = request.form.get('languages_spoken', '')
+    location = request.form.get('location', '')
+    price_per_day = request.form.get('price_per_day', 0)
+    
+    connection = get_db_connection()
+    if connection:
+        try:
+            # First check if guide profile exists
+            guide_exists = repo.one(connection, 'guide_profile_id', user_id)
+            
+            if guide_exists:
+                # Update existing profile
+                repo.run(connection, 'update_guide_profile',
+                         specialization, experience_years, languages_spoken, location, price_per_day, user_id)
+                flash('Jharkhand guide profile updated successfully!')
+            else:
+                # Create new profile if doesn't exist
+                repo.run(connection, 'insert_guide_profile',
+                         user_id, specialization, experience_years, languages_spoken, location, price_per_day)
+                flash('Jharkhand guide profile created successfully!')
+            
+            connection.commit()
+            refresh_guide_recommendation(connection, user_id)
+        except Exception as e:
+            connection.rollback()
+            flash(f'Profile update failed: {str(e)}')
+            print(f"Database error: {e}")
+    else:
+        flash('Database connection failed!')
+    
+    return redirect(url_for('guide.guide_dashboard'))
+
+# Status changes a guide may make; completed and cancelled bookings are final
+BOOKING_TRANSITIONS = {
+    'pending': ('confirmed', 'cancelled'),
+    'confirmed': ('completed', 'cancelled'),
+    'completed': (),
+    'cancelled': (),
+}
+BULK_STATUS_MAX_BOOKINGS = 200
+
+@bp.route('/update_booking_status/<int:booking_id>/<status>')
+@require_user_type('guide')
+def update_booking_status(booking_id, status):
+    """Update Jharkhand tour booking status by guide"""
+    guide_id = session['user_id']
+    if status not in booking_stats.BOOKING_STATUSES:
+        flash('Invalid booking status!')
+        return redirect(url_for('guide.guide_dashboard'))
+    
+    connection = get_db_connection()
+    if connection:
+        cursor = connection.cursor()
+        try:
+            # Verify this booking belongs to the current guide; the row lock keeps
+            # two concurrent status changes from both updating the summary
+            booking = repo.one(connection, 'guide_booking_for_update', booking_id, guide_id)
+            if not booking:
+                flash('Access denied. This booking does not belong to you.')
+                return redirect(url_for('guide.guide_dashboard'))
+            arrival_date, departure_date = booking.arrival_date, booking.departure_date
+            current_status = booking.booking_status
+            # A resubmitted or double-clicked link changes nothing and notifies nobody
+            if status == current_status:
+                flash(f'This booking is already {status}.')
+                return redirect(url_for('guide.guide_dashboard'))
+            if status not in BOOKING_TRANSITIONS.get(current_status, ()):
+                flash(f'A {current_status} booking cannot be marked {status}.')
+                return redirect(url_for('guide.guide_dashboard'))
+            
+            # A guide cannot confirm two tours on the same days
+            if status == 'confirmed' and arrival_date and departure_date:
+                clashes = availability.conflicts(guide_id, arrival_date, departure_date, exclude_booking=booking_id)
+                if clashes:
+                    flash(f'Cannot confirm: these dates overlap your confirmed booking #{clashes[0]}.')
+                    return redirect(url_for('guide.guide_dashboard'))
+            
+            repo.run(connection, 'update_booking_status', status, booking_id, guide_id)
+            booking_stats.record_booking_change(
+                cursor, guide_id, booking_stats.booking_month(arrival_date, booking.created_at), current_status, status,
+                *booking_stats.booking_value(booking.days_to_stay, booking.group_size, booking.price_per_day))
+            outbox.enqueue_messages(cursor, [outbox.booking_status_message(booking, status, session.get('full_name'))])
+            connection.commit()
+            availability.apply(booking_id, guide_id, arrival_date, departure_date, status)
+            
+            # Custom flash messages for different statuses
+            if status == 'confirmed':
+                flash(f'Jharkhand tour booking confirmed successfully! Tourist will be notified.')
+            elif status == 'completed':
+                flash(f'Jharkhand tour marked as completed successfully!')
+            elif status == 'cancelled':
+                flash(f'Booking cancelled. Tourist will be notified.')
+            else:
+                flash(f'Booking {status} successfully!')
+        except Error as e:
+            connection.rollback()
+            flash(f'Update failed: {e}')
+        finally:
+            cursor.close()
+    
+    return redirect(url_for('guide.guide_dashboard'))
+
+@bp.route('/api/bookings/status', methods=['POST'])
+@require_user_type('guide')
+def bulk_update_booking_status():
+    """Move many of the guide's bookings to one status in a single transaction"""
+    guide_id = session['user_id']
+    payload = request.get_json(silent=True) or {}
+    status = payload.get('status')
+    try:
+        booking_ids = list(dict.fromkeys(int(booking_id) for booking_id in payload.get('booking_ids') or []))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'booking_ids must be a list of integers'}), 400
+    if status not in BOOKING_TRANSITIONS:
+        return jsonify({'success': False, 'message': 'Invalid booking status'}), 400
+    if not booking_ids or len(booking_ids) > BULK_STATUS_MAX_BOOKINGS:
+        return jsonify({'success': False, 
+                        'message': f'Select between 1 and {BULK_STATUS_MAX_BOOKINGS} bookings'}), 400
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
+    cursor = connection.cursor(dictionary=True)
+    try:
+        # Lock the guide's selected bookings; rows owned by anyone else never match
+        placeholders = ', '.join(['%s'] * len(booking_ids))
+        cursor.execute(f"""SELECT id, arrival_date, departure_date, booking_status, created_at,
+                                  days_to_stay, group_size, price_per_day, tourist_name, phone, email
+                          FROM bookings WHERE id IN ({placeholders}) AND guide_id = %s FOR UPDATE""",
+                       (*booking_ids, guide_id))
+        bookings = {row['id']: row for row in cursor.fetchall()}
+
+        # One sync with other workers' bookings covers every conflict check below
+        if status == 'confirmed':
+            availability.refresh(force=True)
+        results = {}
+        eligible = []
+        confirming = []  # (start, end) of bookings confirmed by this request
+        for booking_id in booking_ids:
+            booking = bookings.get(booking_id)
+            if booking is None:
+                results[booking_id] = 'not_found'
+            elif booking['booking_status'] == status:
+                results[booking_id] = 'unchanged'
+            elif status not in BOOKING_TRANSITIONS[booking['booking_status']]:
+                results[booking_id] = 'invalid_transition'
+            elif status == 'confirmed' and booking['arrival_date'] and booking['departure_date'] and (
+                    availability.conflicts(guide_id, booking['arrival_date'], booking['departure_date'],
+                                           exclude_booking=booking_id, sync=False)
+                    or any(booking['arrival_date'] < end and start < booking['departure_date']
+                           for start, end in confirming)):
+                results[booking_id] = 'conflict'
+            else:
+                eligible.append(booking_id)
+                if status == 'confirmed' and booking['arrival_date'] and booking['departure_date']:
+                    confirming.append((booking['arrival_date'], booking['departure_date']))
+
+        if eligible:
+            placeholders = ', '.join(['%s'] * len(eligible))
+            cursor.execute(f"""UPDATE bookings SET booking_status = %s 
+                              WHERE id IN ({placeholders}) AND guide_id = %s""",
+                           (status, *eligible, guide_id))
+            # The rows are locked, so every eligible booking was updated
+            if cursor.rowcount != len(eligible):
+                raise Error(f'Expected to update {len(eligible)} bookings, updated {cursor.rowcount}')
+            changes = []
+            for booking_id in eligible:
+                booking = bookings[booking_id]
+                month = booking_stats.booking_month(booking['arrival_date'], booking['created_at'])
+                guest_days, revenue = booking_stats.booking_value(
+                    booking['days_to_stay'], booking['group_size'], booking['price_per_day'])
+                changes.append((month, booking['booking_status'], status, guest_days, revenue))
+            booking_stats.record_booking_changes(cursor, guide_id, changes)
+            outbox.enqueue_messages(cursor, [outbox.booking_status_message(bookings[booking_id], status,
+                                                                           session.get('full_name'))
+                                             for booking_id in eligible])
+        connection.commit()
+    except Error as e:
+        connection.rollback()
+        print(f"Error updating booking statuses: {e}")
+        return jsonify({'success': False, 'message': 'Could not update bookings'}), 500
+    finally:
+        cursor.close()
+
+    for booking_id in eligible:
+        booking = bookings[booking_id]
+        availability.apply(booking_id, guide_id, booking['arrival_date'], booking['departure_date'], status)
+        results[booking_id] = 'updated'
+
+    return jsonify({'success': True, 'status': status, 'updated': len(eligible),
+                    'results': {str(booking_id): results[booking_id] for booking_id in booking_ids}})
+
+@bp.route('/upload_content', methods=['POST'])
+@require_user_type('guide')
+def upload_content():
+    """Upload Jharkhand tourism content by guides"""
+    guide_id = session['user_id']
+    upload_type = request.form['upload_type']
+    title = request.form['title']
+    description = request.form['description']
+    location = request.form.get('location', '')
+    
+    image_path = ''
+    if 'image' in request.files:
+        file = request.files['image']
+        if file and allowed_file(file.filename):
+            filename = secure_filename(file.filename)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
+            filename = timestamp + filename
+            file_path = upload_path(filename)
+            file.save(file_path)
+            image_path = f'uploads/{filename}'
+    
+    connection = get_db_connection()
+    if connection:
+        try:
+            upload_id = repo.run(connection, 'insert_upload',
+                                 guide_id, upload_type, title, description, image_path, location).lastrowid
+            connection.commit()
+            invalidate_content_cache()
+            image_pipeline.submit(upload_id, image_path)
+            flash('Jharkhand content uploaded successfully! It will appear on the homepage.')
+        except Error as e:
+            connection.rollback()
+            flash(f'Upload failed: {e}')
+    
+    return redirect(url_for('guide.guide_dashboard'))
+
+# Route to get guide's own content for editing
+@bp.route('/guide/my_content')
+@require_user_type('guide')
+def guide_my_content():
+    """Get guide's own Jharkhand content for editing"""
+    guide_id = session['user_id']
+    connection = get_db_connection()
+    my_content = []
+    
+    if connection:
+        try:
+            my_content = parse_image_variants(repo.all(connection, 'guide_uploads', guide_id))
+        except Exception as e:
+            print(f"Error fetching content: {e}")
+    
+    return jsonify({'success': True, 'content': my_content})
+
+# Route to edit content
+@bp.route('/guide/edit_content/<int:content_id>', methods=['GET', 'POST'])
+@require_user_type('guide')
+def edit_content(content_id):
+    """Edit Jharkhand tourism content (only by content owner)"""
+    guide_id = session['user_id']
+    connection = get_db_connection()
+    
+    if not connection:
+        if request.method == 'GET':
+            return jsonify({'success': False, 'message': 'Database connection failed'})
+        flash('Database connection failed!')
+        return redirect(url_for('guide.guide_dashboard'))
+    
+    try:
+        # Verify ownership
+        content = repo.one(connection, 'guide_upload', content_id, guide_id)
+        
+        if not content:
+            if request.method == 'GET':
+                return jsonify({'success': False, 'message': 'Content not found or access denied'})
+            flash('Content not found or you do not have permission to edit it!')
+            return redirect(url_for('guide.guide_dashboard'))
+        
+        if request.method == 'POST':
+            # Update content
+            upload_type = request.form.get('upload_type')
+            title = request.form.get('title')
+            description = request.form.get('description')
+            location = request.form.get('location', '')
+            
+            # Validate required fields
+            if not upload_type or not title or not description:
+                if request.is_json or 'application/json' in request.headers.get('Accept', ''):
+                    return jsonify({'success': False, 'message': 'Missing required fields'})
+                flash('Please fill in all required fields!')
+                return redirect(url_for('guide.guide_dashboard') + '#content-panel')
+            
+            # Handle image update
+            image_path = content['image_path']  # Keep existing image by default
+            image_replaced = False
+            if 'image' in request.files:
+                file = request.files['image']
+                if file and file.filename and allowed_file(file.filename):
+                    # Delete old image if exists
+                    if image_path and os.path.exists(os.path.join(current_app.config['UPLOAD_FOLDER'], os.path.basename(image_path))):
+                        try:
+                            os.remove(os.path.join(current_app.config['UPLOAD_FOLDER'], os.path.basename(image_path)))
+                        except Exception as e:
+                            print(f"Warning: Could not delete old image: {e}")
+                    image_pipeline.remove_variants(image_path)
+                    
+                    # Save new image
+                    filename = secure_filename(file.filename)
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
+                    filename = timestamp + filename
+                    file_path = upload_path(filename)
+                    
+                    try:
+                        file.save(file_path)
+                        image_path = f'uploads/{filename}'
+                        image_replaced = True
+                    except Exception as e:
+                        print(f"Error saving new image: {e}")
+                        if request.is_json or 'application/json' in request.headers.get('Accept', ''):
+                            return jsonify({'success': False, 'message': 'Failed to save image'})
+                        flash('Failed to save image!')
+                        return redirect(url_for('guide.guide_dashboard') + '#content-panel')
+            
+            # Update database
+            repo.run(connection, 'update_upload',
+                     upload_type, title, description, location, image_path, content_id, guide_id)
+            if image_replaced:
+                # Variants of the old image are gone; the pipeline rebuilds them
+                repo.run(connection, 'clear_image_variants', content_id)
+            
+            connection.commit()
+            invalidate_content_cache()
+            if image_replaced:
+                image_pipeline.submit(content_id, image_path)
+            
+            # Return appropriate response based on request type
+            if request.is_json or 'application/json' in request.headers.get('Accept', ''):
+                return jsonify({'success': True, 'message': 'Jharkhand content updated successfully!'})
+            else:
+                flash('Jharkhand content updated successfully!')
+                return redirect(url_for('guide.guide_dashboard') + '#content-panel')
+        
+        # GET request - return content data for editing (for AJAX)
+        # Convert datetime to string for JSON serialization
+        if content.get('upload_date'):
+            content['upload_date'] = content['upload_date'].isoformat()
+        parse_image_variants([content])
+        
+        return jsonify({'success': True, 'content': content})
+        
+    except Exception as e:
+        print(f"Error in edit_content: {e}")  # Server-side logging
+        if request.method == 'GET':
+            return jsonify({'success': False, 'message': f'Error loading content: {str(e)}'})
+        else:
+            if request.is_json or 'application/json' in request.headers.get('Accept', ''):
+                return jsonify({'success': False, 'message': f'Error updating content: {str(e)}'})
+            flash(f'Error updating content: {str(e)}')
+            return redirect(url_for('guide.guide_dashboard'))
+
+
+# Route to delete content
+@bp.route('/guide/delete_content/<int:content_id>', methods=['DELETE'])
+@require_user_type('guide')
+def delete_content(content_id):
+    """Delete Jharkhand tourism content (only by content owner)"""
+    guide_id = session['user_id']
+    connection = get_db_connection()
+    
+    if not connection:
+        return jsonify({'success': False, 'message': 'Database connection failed'})
+    
+    try:
+        # Verify ownership
+        content = repo.one(connection, 'guide_upload', content_id, guide_id)
+        
+        if not content:
+            return jsonify({'success': False, 'message': 'Content not found or access denied'})
+        
+        # Delete image file if exists
+        if content.get('image_path'):
+            image_file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], os.path.basename(content['image_path']))
+            if os.path.exists(image_file_path):
+                try:
+                    os.remove(image_file_path)
+                    print(f"Deleted image file: {image_file_path}")
+                except Exception as e:
+                    print(f"Warning: Could not delete image file: {e}")
+                    # Continue even if file deletion fails
+            image_pipeline.remove_variants(content['image_path'])
+        
+        # Delete from database
+        repo.run(connection, 'delete_upload', content_id, guide_id)
+        connection.commit()
+        invalidate_content_cache()
+        
+        print(f"Deleted content ID {content_id} for guide {guide_id}")  # Server-side logging
+        return jsonify({'success': True, 'message': 'Jharkhand content deleted successfully'})
+        
+    except Exception as e:
+        print(f"Error in delete_content: {e}")  # Server-side logging
+        return jsonify({'success': False, 'message': f'Error deleting content: {str(e)}'})
+
+@bp.route('/debug_guide_profile')
+@require_user_type('guide')
+def debug_guide_profile():
+    """Debug guide profile information for Jharkhand Tourism"""
+    user_id = session['user_id']
+    connection = get_db_connection()
+    
+    if connection:
+        guide_data = repo.one(connection, 'guide_profile', user_id)
+        
+        return f"User ID: {user_id}<br>Guide Data: {guide_data}"
+    
+    return "Database connection failed"
@@ -0,0 +1,375 @@
+"""Tourist pages and APIs: guide search, recommendations, bookings and reviews"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify
+from mysql.connector import Error
+
+import booking_stats
+import outbox
+from extensions import (get_db_connection, repo, availability, recommender, proximity, require_user_type,
+                        rate_limited, refresh_guide_recommendation, encode_cursor, decode_cursor, parse_date_arg,
+                        bookings_page_position, split_bookings_page, BOOKINGS_PAGE_SIZE, NEWEST_FIRST)
+from recommend import Criteria
+from repository import GUIDE_SORTS, guide_search
+
+bp = Blueprint('tourist', __name__)
+
+@bp.route('/tourist_dashboard')
+@require_user_type('tourist')
+def tourist_dashboard():
+    """Tourist dashboard - Browse Jharkhand guides and manage bookings"""
+    # Guide cards are paged in from /api/guides; only the headline count is rendered here
+    connection = get_db_connection()
+    available_guides = 0
+    booking_count = 0
+    bookings, next_cursor = [], None
+    
+    if connection:
+        available_guides = repo.one(connection, 'available_guide_count').total
+        booking_count = repo.one(connection, 'tourist_booking_count', session['user_id']).total
+        
+        # One page of the tourist's Jharkhand tour bookings, newest first
+        after_date, after_id = bookings_page_position()
+        bookings, next_cursor = split_bookings_page(
+            repo.all(connection, 'tourist_bookings', session['user_id'], after_date, after_date, after_id,
+                     BOOKINGS_PAGE_SIZE + 1), BOOKINGS_PAGE_SIZE)
+    
+    return render_template('tourist_dashboard.html', available_guides=available_guides, bookings=bookings,
+                           booking_count=booking_count, next_bookings_cursor=next_cursor)
+
+GUIDE_PAGE_SIZE = 12
+GUIDE_MAX_PAGE_SIZE = 50
+
+@bp.route('/api/guides')
+@require_user_type('tourist')
+def api_guides():
+    """Search available Jharkhand guides with filters, sorting and keyset pagination"""
+    sort = request.args.get('sort', 'rating')
+    if sort not in GUIDE_SORTS:
+        return jsonify({'success': False, 'message': f'Unknown sort order: {sort}'}), 400
+    limit = min(max(request.args.get('limit', GUIDE_PAGE_SIZE, type=int), 1), GUIDE_MAX_PAGE_SIZE)
+
+    # Only guides with no confirmed booking in [start, end)
+    busy = set()
+    start, end = parse_date_arg('start'), parse_date_arg('end')
+    if start and end:
+        if end <= start:
+            return jsonify({'success': False, 'message': 'end must be after start'}), 400
+        try:
+            busy = availability.busy_guides(start, end)
+        except Error as e:
+            print(f"Error loading guide availability: {e}")
+            return jsonify({'success': False, 'message': 'Availability lookup failed'}), 500
+
+    after = None
+    cursor_values = decode_cursor(request.args.get('cursor'))
+    if cursor_values:
+        try:
+            after = Decimal(str(cursor_values[0])), int(cursor_values[1])
+        except (ValueError, IndexError, TypeError, ArithmeticError):
+            return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'success': False, 'message': 'Database connection failed'}), 503
+
+    try:
+        # Fetch one extra row to learn whether another page exists
+        guides = repo.query(connection, *guide_search(
+            sort, limit + 1,
+            location=request.args.get('location', '').strip(),
+            specialization=request.args.get('specialization', '').strip(),
+            language=request.args.get('language', '').strip(),
+            min_price=request.args.get('min_price', type=float),
+            max_price=request.args.get('max_price', type=float),
+            min_rating=request.args.get('min_rating', type=float),
+            exclude=busy, after=after))
+    except Error as e:
+        print(f"Error searching guides: {e}")
+        return jsonify({'success': False, 'message': 'Guide search failed'}), 500
+
+    has_more = len(guides) > limit
+    guides = guides[:limit]
+    next_cursor = None
+    if has_more:
+        last = guides[-1]
+        next_cursor = encode_cursor([last['sort_value'], last['user_id']])
+    for guide in guides:
+        del guide['sort_value']
+
+    return jsonify({'success': True, 'guides': guides, 'has_more': has_more, 'next_cursor': next_cursor})
+
+RECOMMEND_COUNT = 10
+RECOMMEND_MAX_COUNT = 50
+
+@bp.route('/api/guides/recommend')
+@require_user_type('tourist')
+def recommend_guides():
+    """Available guides ranked against a tourist's booking criteria"""
+    count = min(max(request.args.get('count', RECOMMEND_COUNT, type=int), 1), RECOMMEND_MAX_COUNT)
+
+    # Guides with a confirmed booking in [start, end) are left out
+    start, end = parse_date_arg('start'), parse_date_arg('end')
+    try:
+        # Districts named by the tourist's places and location, resolved against the districts and places tables
+        districts = proximity.districts_in(request.args.get('specific_places', ''))
+        districts.add(proximity.district_of(request.args.get('location', '')))
+        criteria = Criteria(tour_type=request.args.get('tour_type', ''),
+                            districts=districts,
+                            languages=request.args.get('languages', ''),
+                            group_size=request.args.get('group_size', 1, type=int),
+                            fitness_level=request.args.get('fitness_level', ''),
+                            budget=request.args.get('budget', type=float))
+        busy = set()
+        if start and end:
+            if end <= start:
+                return jsonify({'success': False, 'message': 'end must be after start'}), 400
+            busy = availability.busy_guides(start, end)
+        guides = recommender.recommend(criteria, exclude=busy, k=count)
+    except Error as e:
+        print(f"Error recommending guides: {e}")
+        return jsonify({'success': False, 'message': 'Guide recommendations failed'}), 500
+
+    return jsonify({'success': True, 'guides': guides})
+
+NEARBY_DEFAULT_KM = 50
+NEARBY_MAX_KM = 300
+
+@bp.route('/api/places')
+def api_places():
+    """Names of the places and districts "guides near" queries know about"""
+    try:
+        places = proximity.places()
+    except Error as e:
+        print(f"Error loading places: {e}")
+        return jsonify({'success': False, 'message': 'Could not load places'}), 500
+    return jsonify({'success': True, 'places': places})
+
+@bp.route('/api/guides/near')
+@require_user_type('tourist')
+def guides_near():
+    """Available guides based within N km of a place, nearest district first"""
+    name = request.args.get('place', '').strip()
+    km = min(max(request.args.get('km', NEARBY_DEFAULT_KM, type=float), 0), NEARBY_MAX_KM)
+    start, end = parse_date_arg('start'), parse_date_arg('end')
+    if start and end and end <= start:
+        return jsonify({'success': False, 'message': 'end must be after start'}), 400
+
+    try:
+        place = proximity.place(name)
+        if not place:
+            return jsonify({'success': False, 'message': f'Unknown place: {name}'}), 404
+        districts = proximity.within(name, km)
+        busy = availability.busy_guides(start, end) if start and end else ()
+        # Guides covering all of Jharkhand come after the local ones
+        ranked = recommender.in_districts([district for district, _ in districts] + [None], exclude=busy)
+    except Error as e:
+        print(f"Error finding guides near {name}: {e}")
+        return jsonify({'success': False, 'message': 'Guide search failed'}), 500
+
+    distances = dict(districts)
+    guides = [dict(guide, district=district, distance_km=distances.get(district))
+              for district, district_guides in ranked for guide in district_guides]
+    return jsonify({'success': True, 'place': place, 'km': km,
+                    'districts': [{'name': district, 'distance_km': distance} for district, distance in districts],
+                    'guides': guides})
+
+CALENDAR_MAX_DAYS = 366
+
+@bp.route('/api/guides/<int:guide_id>/calendar')
+def guide_calendar(guide_id):
+    """Day-by-day booked/pending/free calendar for one guide"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Please login to view guide availability'}), 401
+
+    start = parse_date_arg('start') or date.today()
+    days = min(max(request.args.get('days', 42, type=int), 1), CALENDAR_MAX_DAYS)
+    try:
+        calendar = availability.calendar(guide_id, start, start + timedelta(days=days))
+    except Error as e:
+        print(f"Error loading guide availability: {e}")
+        return jsonify({'success': False, 'message': 'Availability lookup failed'}), 500
+
+    return jsonify({'success': True, 'guide_id': guide_id,
+                    'days': [{'date': day.isoformat(), 'status': state} for day, state in calendar]})
+
+# NEW ROUTE: Show booking form for selected guide
+@bp.route('/book_guide/<int:guide_id>')
+@require_user_type('tourist')
+def book_guide_form(guide_id):
+    """Display booking form for selected Jharkhand guide"""
+    connection = get_db_connection()
+    guide = None
+    
+    if connection:
+        try:
+            # Get guide details with user information
+            guide = repo.one(connection, 'guide_for_booking', guide_id)
+            
+            if not guide:
+                flash('Guide not found!')
+                return redirect(url_for('tourist.tourist_dashboard'))
+                
+        except Exception as e:
+            print(f"Error fetching guide: {e}")
+            flash('Error loading guide information!')
+            return redirect(url_for('tourist.tourist_dashboard'))
+    
+    return render_template('tourist_booking.html', guide=guide)
+
+# UPDATED ROUTE: Process booking with enhanced details
+# TO THIS:
+@bp.route('/book_guide', methods=['POST'])
+@require_user_type('tourist')
+@rate_limited('booking')
+def book_guide(): 
+
+    """Process Jharkhand tour booking request with enhanced details"""
+    tourist_id = session['user_id']
+    
+    # Get form data
+    guide_id = request.form.get('guide_id', type=int)
+    tourist_name = request.form['tourist_name']
+    phone = request.form['phone']
+    email = request.form.get('email', '')
+    native_place = request.form['native_place']
+    arrival_date = request.form['arrival_date']
+    days_to_stay = request.form['days_to_stay']
+    group_size = request.form.get('group_size', 1)
+    tour_type = request.form.get('tour_type', '')
+    specific_places = request.form.get('specific_places', '')
+    accommodation = request.form.get('accommodation', '')
+    transport = request.form.get('transport', '')
+    dietary_preference = request.form.get('dietary_preference', '')
+    fitness_level = request.form.get('fitness_level', '')
+    additional_requirements = request.form.get('additional_requirements', '')
+    
+    # Calculate departure date
+    arrival = datetime.strptime(arrival_date, '%Y-%m-%d')
+    departure = arrival + timedelta(days=int(days_to_stay))
+    
+    connection = get_db_connection()
+    if connection:
+        cursor = connection.cursor()
+        try:
+            # Verify the guide exists and is actually a guide
+            guide = repo.one(connection, 'bookable_guide', guide_id)
+            if not guide:
+                flash('Invalid guide selection!')
+                return redirect(url_for('tourist.tourist_dashboard'))
+            price_per_day = guide.price_per_day
+            
+            # Refuse dates the guide has already confirmed for someone else
+            if availability.conflicts(guide_id, arrival.date(), departure.date()):
+                flash('This guide is already booked on some of those dates. Please choose different dates or another guide.')
+                return redirect(url_for('tourist.book_guide_form', guide_id=guide_id))
+            
+            # Insert comprehensive booking details
+            booking_id = repo.run(
+                connection, 'insert_booking',
+                tourist_id, guide_id, tourist_name, phone, email, native_place, 
+                arrival.date(), departure.date(), days_to_stay, group_size, price_per_day, tour_type,
+                specific_places, accommodation, transport, dietary_preference, 
+                fitness_level, additional_requirements
+            ).lastrowid
+            booking_stats.record_booking_change(
+                cursor, guide_id, booking_stats.booking_month(arrival.date()), None, 'pending',
+                *booking_stats.booking_value(days_to_stay, group_size, price_per_day))
+            # Queued in the booking's transaction and sent by the outbox worker (outbox.py)
+            outbox.enqueue_messages(cursor, outbox.booking_requested_messages(booking_id, {
+                'tourist_name': tourist_name, 'phone': phone, 'email': email, 'native_place': native_place,
+                'arrival_date': arrival.date(), 'departure_date': departure.date(),
+                'days_to_stay': days_to_stay, 'group_size': group_size}, guide))
+            
+            connection.commit()
+            availability.apply(booking_id, guide_id, arrival.date(), departure.date(), 'pending')
+            flash('Jharkhand tour booking request sent successfully! Your guide will contact you within 24 hours.')
+            
+        except Error as e:
+            connection.rollback()
+            flash(f'Booking failed: {e}')
+            return redirect(url_for('tourist.tourist_dashboard'))
+        finally:
+            cursor.close()
+    
+    return redirect(url_for('tourist.tourist_dashboard'))
+
+REVIEW_RATINGS = range(1, 6)
+REVIEW_COMMENT_MAX_LENGTH = 2000
+REVIEW_PAGE_SIZE = 10
+REVIEW_MAX_PAGE_SIZE = 50
+
+@bp.route('/review_booking/<int:booking_id>', methods=['POST'])
+@require_user_type('tourist')
+def review_booking(booking_id):
+    """Rate and review the guide of a completed Jharkhand tour"""
+    rating = request.form.get('rating', type=int)
+    comment = request.form.get('comment', '').strip()
+    if rating not in REVIEW_RATINGS:
+        flash('Please choose a rating from 1 to 5 stars.')
+        return redirect(url_for('tourist.tourist_dashboard'))
+    if len(comment) > REVIEW_COMMENT_MAX_LENGTH:
+        flash(f'Reviews are limited to {REVIEW_COMMENT_MAX_LENGTH} characters.')
+        return redirect(url_for('tourist.tourist_dashboard'))
+
+    connection = get_db_connection()
+    if connection:
+        try:
+            # The booking row lock keeps a double submit from counting twice
+            booking = repo.one(connection, 'tourist_booking_for_review', booking_id, session['user_id'])
+            if not booking:
+                flash('Access denied. This booking does not belong to you.')
+                return redirect(url_for('tourist.tourist_dashboard'))
+            if booking.booking_status != 'completed':
+                flash('You can review your guide once the tour is completed.')
+                return redirect(url_for('tourist.tourist_dashboard'))
+            if booking.review_id:
+                flash('You have already reviewed this tour.')
+                return redirect(url_for('tourist.tourist_dashboard'))
+
+            repo.run(connection, 'insert_review', booking_id, booking.guide_id, session['user_id'],
+                     rating, comment or None)
+            repo.run(connection, 'add_guide_rating', rating, booking.guide_id)
+            connection.commit()
+            refresh_guide_recommendation(connection, booking.guide_id)
+            flash('Thank you for reviewing your Jharkhand guide!')
+        except Error as e:
+            connection.rollback()
+            flash(f'Review failed: {e}')
+
+    return redirect(url_for('tourist.tourist_dashboard'))
+
+@bp.route('/api/guides/<int:guide_id>/reviews')
+def guide_reviews(guide_id):
+    """A guide's reviews, newest first, with keyset pagination"""
+    limit = min(max(request.args.get('limit', REVIEW_PAGE_SIZE, type=int), 1), REVIEW_MAX_PAGE_SIZE)
+    after_date, after_id = NEWEST_FIRST
+    if request.args.get('cursor'):
+        cursor_values = decode_cursor(request.args['cursor'])
+        try:
+            after_date, after_id = datetime.fromisoformat(cursor_values[0]), int(cursor_values[1])
+        except (ValueError, IndexError, TypeError):
+            return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
+
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'success': False, 'message': 'Database connection failed'}), 503
+
+    try:
+        guide = repo.one(connection, 'guide_rating', guide_id)
+        if not guide:
+            return jsonify({'success': False, 'message': 'Guide not found'}), 404
+        # Fetch one extra row to learn whether another page exists
+        reviews = repo.all(connection, 'guide_reviews_page', guide_id, after_date, after_date, after_id, limit + 1)
+    except Error as e:
+        print(f"Error fetching reviews: {e}")
+        return jsonify({'success': False, 'message': 'Could not load reviews'}), 500
+
+    has_more = len(reviews) > limit
+    reviews = reviews[:limit]
+    next_cursor = encode_cursor([reviews[-1].created_at, reviews[-1].id]) if has_more else None
+
+    return jsonify({'success': True, 'guide_name': guide.guide_name, 'rating': guide.rating,
+                    'review_count': guide.review_count, 'reviews': reviews,
+                    'has_more': has_more, 'next_cursor': next_cursor})
@@ -0,0 +1,12 @@
+"""WSGI entry point
+
+    gunicorn wsgi:application
+
+On PythonAnywhere the WSGI configuration file imports `application` from
+here. Behind a reverse proxy (PythonAnywhere has one) set PROXY_COUNT so rate
+limits see client addresses. Building the app opens no database connections,
+so worker boots and recycles stay cheap.
+"""
+from app import create_app
+
+application = app = create_app()